@@ -15,7 +15,7 @@ class StudentAttendanceAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
             return qs
-        return qs.filter(student__user__school=request.user.school)
+        return qs.filter(school=request.user.school)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == 'student' and not request.user.is_superuser:
@@ -37,7 +37,7 @@ class TeacherAttendanceAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
             return qs
-        return qs.filter(teacher__user__school=request.user.school)
+        return qs.filter(school=request.user.school)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if db_field.name == 'teacher' and not request.user.is_superuser:
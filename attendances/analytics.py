@@ -0,0 +1,351 @@
+import datetime
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import groupby, islice
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, NullIf, TruncMonth
+from django.db.models.signals import post_delete, post_save
+from utils.tenant_cache import invalidate_tenant_cache
+from .bitmaps import archived_counts, attendance_records, live_day_masks
+from .models import (
+    ClassAttendanceMonthly, StudentAttendance, StudentAttendanceArchive,
+    StudentAttendanceMonthly
+)
+
+ROLLUP_BATCH_SIZE = 2000
+STREAK_WINDOW_DAYS = 180
+
+_refresh_suspended = ContextVar('attendance_rollups_suspended', default=False)
+
+
+@contextmanager
+def rollups_suspended():
+    """
+    Skips the per-row rollup refresh of StudentAttendance signals, for bulk
+    jobs that keep the counts unchanged (archiving) or rebuild them after.
+    """
+    token = _refresh_suspended.set(True)
+    try:
+        yield
+    finally:
+        _refresh_suspended.reset(token)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(month):
+    return (month + datetime.timedelta(days=32)).replace(day=1)
+
+
+def percentage(present, absent):
+    total = present + absent
+    return round(present * 100 / total, 2) if total else None
+
+
+def _percentage_expression(present, absent):
+    return Cast(F(present), FloatField()) * 100 / NullIf(F(present) + F(absent), 0)
+
+
+def _month_counts(queryset):
+    return queryset.order_by().values(
+        'student_id', 'classroom_id', period=TruncMonth('date')
+    ).annotate(
+        present=Count('id', filter=Q(status='P')),
+        absent=Count('id', filter=Q(status='A')),
+    )
+
+
+def _combined_counts(live_counts, archives):
+    """
+    Adds the archived bitmap counts to the live monthly counts. A day that
+    was re-marked after its month was archived is counted from its live
+    row only, as in attendance_records.
+    """
+    combined = {}
+    for row in list(live_counts) + archived_counts(archives, live_day_masks(archives)):
+        key = (row['student_id'], row['classroom_id'], row['period'])
+        if key in combined:
+            combined[key]['present'] += row['present']
+            combined[key]['absent'] += row['absent']
+        else:
+            combined[key] = dict(row)
+    return list(combined.values())
+
+
+def _save_student_rollups(counts):
+    rows = (
+        StudentAttendanceMonthly(
+            student_id=row['student_id'], classroom_id=row['classroom_id'],
+            month=row['period'], present=row['present'], absent=row['absent'])
+        for row in counts
+    )
+    while True:
+        batch = list(islice(rows, ROLLUP_BATCH_SIZE))
+        if not batch:
+            break
+        StudentAttendanceMonthly.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['student', 'classroom', 'month'],
+            update_fields=['present', 'absent'],
+        )
+
+
+def _save_class_rollups(student_rollups):
+    counts = student_rollups.order_by().values('classroom_id', 'month').annotate(
+        present_total=Sum('present'), absent_total=Sum('absent'),
+        students=Count('student_id'))
+    ClassAttendanceMonthly.objects.bulk_create(
+        [
+            ClassAttendanceMonthly(
+                classroom_id=row['classroom_id'], month=row['month'],
+                present=row['present_total'], absent=row['absent_total'],
+                student_count=row['students'])
+            for row in counts
+        ],
+        batch_size=ROLLUP_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['classroom', 'month'],
+        update_fields=['present', 'absent', 'student_count'],
+    )
+
+
+def refresh_attendance_rollups(keys):
+    """
+    Recomputes the monthly rollups touched by attendance writes.
+    Only the affected students' rows for the affected months are read, so
+    the cost is bounded by one month of a class, not the whole history.
+    Arguments:
+    keys: Iterable of (student_id, classroom_id, date).
+    """
+    buckets = set()
+    for student_id, classroom_id, day in keys:
+        if not (student_id and classroom_id and day):
+            continue
+        if isinstance(day, str):
+            day = datetime.date.fromisoformat(day)
+        buckets.add((student_id, classroom_id, month_start(day)))
+    if not buckets:
+        return
+
+    months = {month for _, _, month in buckets}
+    student_ids = {student_id for student_id, _, _ in buckets}
+    classroom_ids = {classroom_id for _, classroom_id, _ in buckets}
+    in_months = Q()
+    for month in months:
+        in_months |= Q(date__gte=month, date__lt=next_month(month))
+
+    with transaction.atomic():
+        counts = _combined_counts(
+            _month_counts(StudentAttendance.objects.filter(
+                in_months, student_id__in=student_ids)),
+            StudentAttendanceArchive.objects.filter(
+                month__in=months, student_id__in=student_ids))
+        _save_student_rollups(counts)
+
+        # Buckets whose last row was deleted have no counts left.
+        emptied = buckets - {(row['student_id'], row['classroom_id'], row['period'])
+                             for row in counts}
+        if emptied:
+            gone = Q()
+            for student_id, classroom_id, month in emptied:
+                gone |= Q(student_id=student_id, classroom_id=classroom_id,
+                          month=month)
+            StudentAttendanceMonthly.objects.filter(gone).delete()
+
+        ClassAttendanceMonthly.objects.filter(
+            classroom_id__in=classroom_ids, month__in=months).delete()
+        _save_class_rollups(StudentAttendanceMonthly.objects.filter(
+            classroom_id__in=classroom_ids, month__in=months))
+
+
+def rebuild_attendance_rollups(school_id=None, since=None):
+    """
+    Rebuilds the monthly rollups from StudentAttendance, optionally for one
+    school and/or from a date on. Used to backfill and to repair drift.
+    Returns:
+    A dict with the number of student and class rollup rows written.
+    """
+    attendance = StudentAttendance.objects.all()
+    archives = StudentAttendanceArchive.objects.all()
+    student_rollups = StudentAttendanceMonthly.objects.all()
+    class_rollups = ClassAttendanceMonthly.objects.all()
+    if school_id is not None:
+        attendance = attendance.filter(school_id=school_id)
+        archives = archives.filter(classroom__school_id=school_id)
+        student_rollups = student_rollups.filter(classroom__school_id=school_id)
+        class_rollups = class_rollups.filter(classroom__school_id=school_id)
+    if since is not None:
+        since = month_start(since)
+        attendance = attendance.filter(date__gte=since)
+        archives = archives.filter(month__gte=since)
+        student_rollups = student_rollups.filter(month__gte=since)
+        class_rollups = class_rollups.filter(month__gte=since)
+
+    with transaction.atomic():
+        student_rollups.delete()
+        class_rollups.delete()
+        _save_student_rollups(_combined_counts(
+            _month_counts(attendance).iterator(chunk_size=ROLLUP_BATCH_SIZE),
+            archives))
+        _save_class_rollups(student_rollups)
+
+    return {"students": student_rollups.count(), "classes": class_rollups.count()}
+
+
+def _in_months(queryset, date_from=None, date_to=None):
+    if date_from:
+        queryset = queryset.filter(month__gte=month_start(date_from))
+    if date_to:
+        queryset = queryset.filter(month__lte=date_to)
+    return queryset
+
+
+def _monthly_rows(rollups):
+    return [
+        {
+            "month": row.month,
+            "present": row.present,
+            "absent": row.absent,
+            "percentage": percentage(row.present, row.absent),
+        }
+        for row in rollups.order_by('month')
+    ]
+
+
+def student_attendance_summary(student_id, date_from=None, date_to=None):
+    """Attendance percentage of a student, overall and per month."""
+    months = _monthly_rows(_in_months(
+        StudentAttendanceMonthly.objects.filter(student_id=student_id),
+        date_from, date_to))
+    present = sum(row['present'] for row in months)
+    absent = sum(row['absent'] for row in months)
+    return {
+        "student_id": student_id,
+        "present": present,
+        "absent": absent,
+        "percentage": percentage(present, absent),
+        "months": months,
+    }
+
+
+def student_percentages(rollups):
+    """Per-student totals and percentage over a StudentAttendanceMonthly queryset."""
+    return rollups.order_by().values(
+        'student_id', student_name=F('student__user__name'),
+        roll_no=F('student__roll_no'),
+    ).annotate(
+        present_total=Sum('present'), absent_total=Sum('absent'),
+    ).annotate(
+        percentage=_percentage_expression('present_total', 'absent_total'),
+    )
+
+
+def classroom_attendance_summary(classroom_id, date_from=None, date_to=None):
+    """Attendance percentage of a classroom per month and per student."""
+    months = _monthly_rows(_in_months(
+        ClassAttendanceMonthly.objects.filter(classroom_id=classroom_id),
+        date_from, date_to))
+    present = sum(row['present'] for row in months)
+    absent = sum(row['absent'] for row in months)
+    students = student_percentages(_in_months(
+        StudentAttendanceMonthly.objects.filter(classroom_id=classroom_id),
+        date_from, date_to)).order_by('roll_no')
+    return {
+        "classroom_id": classroom_id,
+        "present": present,
+        "absent": absent,
+        "percentage": percentage(present, absent),
+        "months": months,
+        "students": [_student_row(row) for row in students],
+    }
+
+
+def _student_row(row):
+    return {
+        "student_id": row['student_id'],
+        "student_name": row['student_name'],
+        "roll_no": row['roll_no'],
+        "present": row['present_total'],
+        "absent": row['absent_total'],
+        "percentage": None if row['percentage'] is None else round(row['percentage'], 2),
+    }
+
+
+def low_attendance(school_id, threshold, classroom_id=None,
+                   date_from=None, date_to=None):
+    """Students whose attendance percentage is below `threshold`, lowest first."""
+    rollups = StudentAttendanceMonthly.objects.all()
+    if school_id is not None:
+        rollups = rollups.filter(classroom__school_id=school_id)
+    if classroom_id is not None:
+        rollups = rollups.filter(classroom_id=classroom_id)
+    rows = student_percentages(_in_months(rollups, date_from, date_to)).filter(
+        percentage__lt=threshold).order_by('percentage', 'student_id')
+    return [_student_row(row) for row in rows]
+
+
+def attendance_streaks(student_ids=None, classroom_id=None, since=None):
+    """
+    Current and longest present streaks, and the current absent streak, of
+    the selected students, counted over marked school days (live and
+    archived) since `since` (default: last 180 days).
+    """
+    if since is None:
+        since = datetime.date.today() - datetime.timedelta(days=STREAK_WINDOW_DAYS)
+    records = attendance_records(
+        student_ids=student_ids, classroom_id=classroom_id, date_from=since)
+
+    streaks = []
+    for student_id, rows in groupby(records, key=lambda row: row['student_id']):
+        current = longest = absent_run = 0
+        for row in rows:
+            if row['status'] == 'P':
+                current += 1
+                absent_run = 0
+                longest = max(longest, current)
+            else:
+                current = 0
+                absent_run += 1
+        streaks.append({
+            "student_id": student_id,
+            "current_present_streak": current,
+            "longest_present_streak": longest,
+            "current_absent_streak": absent_run,
+        })
+    return streaks
+
+
+def _attendance_saved(sender, instance, **kwargs):
+    if _refresh_suspended.get():
+        return
+    keys = {(instance.student_id, instance.classroom_id, instance.date)}
+    loaded = getattr(instance, '_loaded_rollup_key', None)
+    if loaded:
+        keys.add(loaded)
+    refresh_attendance_rollups(keys)
+    invalidate_tenant_cache(instance.classroom.school_id, StudentAttendance)
+    instance._loaded_rollup_key = (
+        instance.student_id, instance.classroom_id, instance.date)
+
+
+def _attendance_deleted(sender, instance, **kwargs):
+    if _refresh_suspended.get():
+        return
+    refresh_attendance_rollups(
+        {(instance.student_id, instance.classroom_id, instance.date)})
+    invalidate_tenant_cache(instance.classroom.school_id, StudentAttendance)
+
+
+def register_attendance_rollups():
+    """
+    Keeps the monthly rollups and the school's attendance version stamp
+    (used for register ETags) in step with single-row writes.
+    """
+    post_save.connect(_attendance_saved, sender=StudentAttendance,
+                      dispatch_uid='attendance-rollups-saved')
+    post_delete.connect(_attendance_deleted, sender=StudentAttendance,
+                        dispatch_uid='attendance-rollups-deleted')
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AttendancesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'attendances'
+
+    def ready(self):
+        from .analytics import register_attendance_rollups
+
+        register_attendance_rollups()
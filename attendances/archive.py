@@ -0,0 +1,100 @@
+from itertools import groupby
+from django.db import transaction
+from .analytics import month_start, next_month, rollups_suspended
+from .bitmaps import merge_bitmaps, pack_month, unpack_month
+from .models import StudentAttendance, StudentAttendanceArchive
+
+ARCHIVE_BATCH_SIZE = 2000
+
+
+def _months(queryset, field):
+    return sorted({month_start(day) for day in queryset.order_by().values_list(
+        field, flat=True).distinct()})
+
+
+def archive_attendance(before, school_id=None):
+    """
+    Moves StudentAttendance rows of every full month before `before` into
+    StudentAttendanceArchive bitmaps, one month per transaction. Rows
+    marked after a month was archived are merged into its bitmaps.
+    The monthly rollups count archived bitmaps too, so they do not change.
+    Returns:
+    A dict with the number of archived months, bitmap rows and days.
+    """
+    live = StudentAttendance.objects.filter(date__lt=month_start(before))
+    if school_id is not None:
+        live = live.filter(school_id=school_id)
+
+    result = {"months": 0, "bitmaps": 0, "days": 0}
+    for month in _months(live, 'date'):
+        month_rows = live.filter(date__gte=month, date__lt=next_month(month))
+        rows = month_rows.order_by('student_id', 'classroom_id', 'date').values_list(
+            'student_id', 'classroom_id', 'date', 'status')
+
+        with transaction.atomic():
+            existing = {
+                (archive.student_id, archive.classroom_id): archive
+                for archive in StudentAttendanceArchive.objects.select_for_update().filter(
+                    month=month, student_id__in=month_rows.values('student_id'))
+            }
+            bitmaps = []
+            days = 0
+            for (student_id, classroom_id), records in groupby(
+                    rows.iterator(), key=lambda row: row[:2]):
+                records = [(day, status) for _, _, day, status in records]
+                days += len(records)
+                marked, present = pack_month(records)
+                archive = existing.get((student_id, classroom_id))
+                if archive is not None:
+                    marked, present = merge_bitmaps(
+                        archive.marked, archive.present, marked, present)
+                bitmaps.append(StudentAttendanceArchive(
+                    student_id=student_id, classroom_id=classroom_id,
+                    month=month, marked=marked, present=present))
+
+            StudentAttendanceArchive.objects.bulk_create(
+                bitmaps,
+                batch_size=ARCHIVE_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['student', 'classroom', 'month'],
+                update_fields=['marked', 'present'],
+            )
+            with rollups_suspended():
+                month_rows.delete()
+
+        result["months"] += 1
+        result["bitmaps"] += len(bitmaps)
+        result["days"] += days
+    return result
+
+
+def restore_attendance(since, school_id=None):
+    """
+    Expands archived months from `since` on back into StudentAttendance
+    rows and drops their bitmaps. Days that already have a live row keep it.
+    Returns:
+    A dict with the number of restored months and rows.
+    """
+    archives = StudentAttendanceArchive.objects.filter(month__gte=month_start(since))
+    if school_id is not None:
+        archives = archives.filter(classroom__school_id=school_id)
+
+    result = {"months": 0, "rows": 0}
+    for month in _months(archives, 'month'):
+        month_archives = archives.filter(month=month)
+        rows = [
+            StudentAttendance(student_id=archive.student_id,
+                              classroom_id=archive.classroom_id,
+                              date=day, status=status)
+            for archive in month_archives.iterator()
+            for day, status in unpack_month(
+                archive.month, archive.marked, archive.present)
+        ]
+        with transaction.atomic():
+            StudentAttendance.objects.bulk_create(
+                rows, batch_size=ARCHIVE_BATCH_SIZE, ignore_conflicts=True)
+            month_archives.delete()
+
+        result["months"] += 1
+        result["rows"] += len(rows)
+    return result
@@ -0,0 +1,146 @@
+import calendar
+import datetime
+import numpy as np
+from django.db.models import Exists, Max, Min, OuterRef
+from django.db.models.functions import TruncMonth
+from .models import StudentAttendance, StudentAttendanceArchive
+
+
+def day_bit(day):
+    return 1 << (day.day - 1)
+
+
+def pack_month(records):
+    """
+    Packs (date, status) pairs of one month into (marked, present) bitmaps.
+    """
+    marked = present = 0
+    for day, status in records:
+        bit = day_bit(day)
+        marked |= bit
+        if status == 'P':
+            present |= bit
+        else:
+            present &= ~bit
+    return marked, present
+
+
+def merge_bitmaps(old_marked, old_present, new_marked, new_present):
+    """Overlays newly packed days on an existing archive row."""
+    return (old_marked | new_marked,
+            (old_present & ~new_marked) | new_present)
+
+
+def unpack_month(month, marked, present, date_from=None, date_to=None):
+    """Yields (date, status) for every marked day of an archived month."""
+    days = calendar.monthrange(month.year, month.month)[1]
+    for offset in range(days):
+        bit = 1 << offset
+        if not marked & bit:
+            continue
+        day = month + datetime.timedelta(days=offset)
+        if (date_from and day < date_from) or (date_to and day > date_to):
+            continue
+        yield day, 'P' if present & bit else 'A'
+
+
+def popcount(values):
+    """Vectorised number of set bits of an array of 32-bit values."""
+    v = np.asarray(values, dtype=np.uint32)
+    v = v - ((v >> 1) & 0x55555555)
+    v = (v & 0x33333333) + ((v >> 2) & 0x33333333)
+    v = (v + (v >> 4)) & 0x0F0F0F0F
+    return ((v * np.uint32(0x01010101)) >> 24).astype(np.int64)
+
+
+def live_day_masks(archives):
+    """
+    Bitmaps of the days of archived months that also have a live row (days
+    re-marked after their month was archived), per (student, classroom,
+    month) of a StudentAttendanceArchive queryset.
+    """
+    bounds = archives.aggregate(first=Min('month'), last=Max('month'))
+    if bounds['first'] is None:
+        return {}
+    archived = archives.order_by().filter(
+        student_id=OuterRef('student_id'), classroom_id=OuterRef('classroom_id'),
+        month=OuterRef('month'))
+    live = StudentAttendance.objects.annotate(month=TruncMonth('date')).filter(
+        Exists(archived), date__gte=bounds['first'],
+        date__lt=(bounds['last'] + datetime.timedelta(days=32)).replace(day=1))
+
+    masks = {}
+    for student_id, classroom_id, day in live.values_list(
+            'student_id', 'classroom_id', 'date'):
+        key = (student_id, classroom_id, day.replace(day=1))
+        masks[key] = masks.get(key, 0) | day_bit(day)
+    return masks
+
+
+def archived_counts(archives, live_days=None):
+    """
+    Present/absent counts per (student, classroom, month) of a
+    StudentAttendanceArchive queryset, computed over whole columns at once.
+    Rows have the same shape as the live monthly counts.
+    Arguments:
+    live_days: {(student_id, classroom_id, month): bitmap} of days counted
+        from live rows instead (see live_day_masks), as live rows win.
+    """
+    rows = list(archives.order_by().values_list(
+        'student_id', 'classroom_id', 'month', 'marked', 'present'))
+    if not rows:
+        return []
+
+    marked = np.fromiter((row[3] for row in rows), dtype=np.uint32, count=len(rows))
+    if live_days:
+        overridden = np.fromiter(
+            (live_days.get(row[:3], 0) for row in rows), dtype=np.uint32, count=len(rows))
+        marked &= ~overridden
+    present_bits = np.fromiter((row[4] for row in rows), dtype=np.uint32, count=len(rows))
+    present = popcount(present_bits & marked)
+    absent = popcount(marked & ~present_bits)
+    return [
+        {"student_id": row[0], "classroom_id": row[1], "period": row[2],
+         "present": int(present[index]), "absent": int(absent[index])}
+        for index, row in enumerate(rows)
+    ]
+
+
+def attendance_records(student_ids=None, classroom_id=None,
+                       date_from=None, date_to=None):
+    """
+    Attendance rows from the live table and the monthly archive, merged and
+    ordered by (student_id, date). Live rows win if a day exists in both.
+    Returns:
+    A list of {"id", "student_id", "classroom_id", "date", "status"}; "id" is
+    the live row's id, or None for a day read from the archive.
+    """
+    live = StudentAttendance.objects.all()
+    archives = StudentAttendanceArchive.objects.all()
+    if student_ids is not None:
+        live = live.filter(student_id__in=student_ids)
+        archives = archives.filter(student_id__in=student_ids)
+    if classroom_id is not None:
+        live = live.filter(classroom_id=classroom_id)
+        archives = archives.filter(classroom_id=classroom_id)
+    if date_from:
+        live = live.filter(date__gte=date_from)
+        archives = archives.filter(month__gte=date_from.replace(day=1))
+    if date_to:
+        live = live.filter(date__lte=date_to)
+        archives = archives.filter(month__lte=date_to)
+
+    records = {}
+    for student_id, classroom_id_, month, marked, present in archives.values_list(
+            'student_id', 'classroom_id', 'month', 'marked', 'present'):
+        for day, status in unpack_month(month, marked, present, date_from, date_to):
+            records[(student_id, day)] = (None, classroom_id_, status)
+    for id_, student_id, classroom_id_, day, status in live.values_list(
+            'id', 'student_id', 'classroom_id', 'date', 'status'):
+        records[(student_id, day)] = (id_, classroom_id_, status)
+
+    return [
+        {"id": id_, "student_id": student_id, "classroom_id": classroom_id_,
+         "date": day, "status": status}
+        for (student_id, day), (id_, classroom_id_, status) in sorted(records.items())
+    ]
@@ -0,0 +1,19 @@
+import datetime
+from django.core.management.base import BaseCommand
+from attendances.archive import archive_attendance
+
+
+class Command(BaseCommand):
+    help = ("Pack StudentAttendance rows of full months before --before into "
+            "monthly bitmaps (StudentAttendanceArchive).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', type=datetime.date.fromisoformat,
+                            required=True, help="YYYY-MM-DD")
+        parser.add_argument('--school', type=int)
+
+    def handle(self, *args, **options):
+        result = archive_attendance(options['before'], school_id=options['school'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {result['days']} attendance rows of {result['months']} "
+            f"months into {result['bitmaps']} bitmaps."))
@@ -0,0 +1,20 @@
+import datetime
+from django.core.management.base import BaseCommand
+from attendances.analytics import rebuild_attendance_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly attendance rollups from StudentAttendance."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school', type=int)
+        parser.add_argument(
+            '--since', type=datetime.date.fromisoformat,
+            help="Only rebuild months from this date on (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        result = rebuild_attendance_rollups(
+            school_id=options['school'], since=options['since'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {result['students']} student and {result['classes']} "
+            f"class monthly rollups."))
@@ -0,0 +1,17 @@
+import datetime
+from django.core.management.base import BaseCommand
+from attendances.archive import restore_attendance
+
+
+class Command(BaseCommand):
+    help = "Expand archived attendance bitmaps from --since back into rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=datetime.date.fromisoformat,
+                            required=True, help="YYYY-MM-DD")
+        parser.add_argument('--school', type=int)
+
+    def handle(self, *args, **options):
+        result = restore_attendance(options['since'], school_id=options['school'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Restored {result['rows']} attendance rows of {result['months']} months."))
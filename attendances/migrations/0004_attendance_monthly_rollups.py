@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendances', '0003_rename_class_name_studentattendance_classroom_and_more'),
+        ('classrooms', '0006_alter_classroom_unique_together_and_more'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassAttendanceMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='classrooms.classroom')),
+            ],
+            options={
+                'unique_together': {('classroom', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentAttendanceMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='classrooms.classroom')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='students.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['classroom', 'month'], name='att_student_monthly_class_idx')],
+                'unique_together': {('student', 'classroom', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendances', '0004_attendance_monthly_rollups'),
+        ('classrooms', '0006_alter_classroom_unique_together_and_more'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentAttendanceArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('marked', models.PositiveIntegerField(default=0)),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='classrooms.classroom')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='students.student')),
+            ],
+            options={
+                'unique_together': {('student', 'classroom', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendances', '0005_studentattendancearchive'),
+        ('classrooms', '0006_alter_classroom_unique_together_and_more'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentattendance',
+            index=models.Index(fields=['classroom', 'date'], name='att_class_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentattendance',
+            index=models.Index(fields=['student', 'date'], name='att_student_date_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+from schools.tenancy import backfill_school
+
+
+def backfill(apps, schema_editor):
+    backfill_school(apps.get_model('attendances', 'StudentAttendance'), 'classroom__school')
+    backfill_school(apps.get_model('attendances', 'TeacherAttendance'), 'teacher__user__school')
+
+
+class Migration(migrations.Migration):
+    # Every backfill batch commits on its own, so rows are not locked for
+    # the length of the whole backfill.
+    atomic = False
+
+    dependencies = [
+        ('attendances', '0006_tenant_list_indexes'),
+        ('classrooms', '0006_alter_classroom_unique_together_and_more'),
+        ('schools', '0004_alter_school_options_alter_school_unique_together'),
+        ('students', '0001_initial'),
+        ('teachers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentattendance',
+            name='school',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='schools.school'),
+        ),
+        migrations.AddField(
+            model_name='teacherattendance',
+            name='school',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='schools.school'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='studentattendance',
+            index=models.Index(fields=['school', 'date', 'id'], name='att_school_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacherattendance',
+            index=models.Index(fields=['school', 'date'], name='att_teacher_school_date_idx'),
+        ),
+    ]
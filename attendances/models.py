@@ -1,13 +1,16 @@
-from django.db import models
+from django.db import models, transaction
 from students.models import Student
 from classrooms.models import Classroom
 from teachers.models import Teacher
+from schools.tenancy import SchoolScopedModel
 from django.core.exceptions import ValidationError
 
 # Create your models here.
 
 
-class StudentAttendance(models.Model):
+class StudentAttendance(SchoolScopedModel):
+    school_path = 'classroom__school'
+
     classroom = models.ForeignKey(Classroom, on_delete=models.CASCADE)
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     date = models.DateField()
@@ -16,6 +19,11 @@ class StudentAttendance(models.Model):
 
     class Meta:
         unique_together = ('student', 'classroom', 'date')
+        indexes = [
+            models.Index(fields=['classroom', 'date'], name='att_class_date_idx'),
+            models.Index(fields=['student', 'date'], name='att_student_date_idx'),
+            models.Index(fields=['school', 'date', 'id'], name='att_school_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.user.name} - {self.status}"
@@ -25,12 +33,91 @@ class StudentAttendance(models.Model):
             raise ValidationError(
                 "Selected student is not part of the selected classroom.")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so an edit that moves the row refreshes the old rollup.
+        instance._loaded_rollup_key = (
+            instance.__dict__.get('student_id'),
+            instance.__dict__.get('classroom_id'),
+            instance.__dict__.get('date'),
+        )
+        return instance
+
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        # Rollups are refreshed by a post_save handler in the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
+
+class StudentAttendanceMonthly(models.Model):
+    """
+    Present/absent counts of one student in one classroom for a month
+    (`month` is the first day). Maintained by attendances.analytics.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    classroom = models.ForeignKey(Classroom, on_delete=models.CASCADE)
+    month = models.DateField()
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('student', 'classroom', 'month')
+        indexes = [
+            models.Index(fields=['classroom', 'month'],
+                         name='att_student_monthly_class_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student} - {self.month:%b %Y}: {self.present}P/{self.absent}A"
+
+
+class ClassAttendanceMonthly(models.Model):
+    """
+    Present/absent counts of a whole classroom for a month, summed from
+    StudentAttendanceMonthly.
+    """
+    classroom = models.ForeignKey(Classroom, on_delete=models.CASCADE)
+    month = models.DateField()
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    student_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('classroom', 'month')
+
+    def __str__(self):
+        return f"{self.classroom} - {self.month:%b %Y}: {self.present}P/{self.absent}A"
+
+
+class StudentAttendanceArchive(models.Model):
+    """
+    A month of one student's attendance packed into two bitmaps, used for
+    history moved out of StudentAttendance. Bit n (0-based) stands for day
+    n + 1 of `month`: `marked` says the day was recorded, `present` that
+    the student was present. See attendances.bitmaps.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    classroom = models.ForeignKey(Classroom, on_delete=models.CASCADE)
+    month = models.DateField()
+    marked = models.PositiveIntegerField(default=0)
+    present = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('student', 'classroom', 'month')
+
+    def __str__(self):
+        return f"{self.student} - {self.month:%b %Y} (archived)"
+
 
+class TeacherAttendance(SchoolScopedModel):
+    school_path = 'teacher__user__school'
 
-class TeacherAttendance(models.Model):
     teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE)
     date = models.DateField()
     status = models.CharField(max_length=10, choices=[
@@ -38,3 +125,6 @@ class TeacherAttendance(models.Model):
 
     class Meta:
         unique_together = ('teacher', 'date')
+        indexes = [
+            models.Index(fields=['school', 'date'], name='att_teacher_school_date_idx'),
+        ]
@@ -3,12 +3,13 @@ from .models import StudentAttendance, TeacherAttendance
 from students.models import Student
 from classrooms.models import Classroom
 from teachers.models import Teacher
+from utils.serializers import ValuesSerializer
 
 
 class StudentAttendanceSerializer(serializers.ModelSerializer):
     class Meta:
         model = StudentAttendance
-        fields = '__all__'
+        exclude = ('school',)
 
     def validate(self, data):
         student = data['student']
@@ -19,9 +20,13 @@ class StudentAttendanceSerializer(serializers.ModelSerializer):
                 "Selected student is not part of the selected classroom."
             )
         return data
-    
+
+
+class StudentAttendanceReadSerializer(ValuesSerializer):
+    model_serializer = StudentAttendanceSerializer
+
 
 class TeacherAttendanceSerializer(serializers.ModelSerializer):
     class Meta:
         model = TeacherAttendance
-        fields = '__all__'
\ No newline at end of file
+        exclude = ('school',)
\ No newline at end of file
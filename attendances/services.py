@@ -0,0 +1,285 @@
+import calendar
+from datetime import date, timedelta
+from django.db import transaction
+from django.db.models import FilteredRelation, Q
+from django.utils.dateparse import parse_date
+from utils.tenant_cache import invalidate_tenant_cache
+from .analytics import refresh_attendance_rollups
+from .bitmaps import unpack_month
+from students.models import Student
+from teachers.models import Teacher
+from .models import StudentAttendance, StudentAttendanceArchive, TeacherAttendance
+
+ATTENDANCE_STATUSES = {'P', 'A'}
+UNMARKED = '-'
+
+
+def parse_register_payload(data):
+    """
+    Reads a daily register payload: either a bare list of records (marks
+    today) or {"date": "YYYY-MM-DD", "records": [...]}.
+    Returns:
+    (entries, on_date); raises ValueError for a bad or future date and
+    TypeError when the records are not a list.
+    """
+    if isinstance(data, list):
+        return data, date.today()
+
+    entries = data.get('records')
+    raw_date = data.get('date')
+    try:
+        on_date = parse_date(raw_date) if raw_date else date.today()
+    except (TypeError, ValueError):
+        on_date = None
+    if on_date is None or on_date > date.today():
+        raise ValueError("Invalid date. Use YYYY-MM-DD, not in the future.")
+    if not isinstance(entries, list):
+        raise TypeError("records must be a list.")
+    return entries, on_date
+
+
+def _is_id(value):
+    # Anything else, including unhashable lists and dicts, is a bad row.
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_status(value):
+    return isinstance(value, str) and value in ATTENDANCE_STATUSES
+
+
+def mark_class_attendance(classroom, entries, on_date):
+    """
+    Upserts a day's attendance for a whole classroom in one statement.
+    All student ids are checked against the classroom with a single query;
+    invalid rows are reported back instead of aborting the whole register.
+    Arguments:
+    classroom: Classroom the register belongs to.
+    entries: List of {"student_id": int, "status": "P" | "A"}.
+    on_date: Date the attendance is recorded for.
+    Returns:
+    A dict with accepted/rejected counts and per-row rejection reasons.
+    """
+    requested_ids = {
+        entry.get('student_id') for entry in entries
+        if isinstance(entry, dict) and _is_id(entry.get('student_id'))
+    }
+    valid_ids = set(
+        Student.objects.filter(
+            classroom=classroom, id__in=requested_ids
+        ).values_list('id', flat=True)
+    )
+
+    records = {}
+    errors = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            errors.append({"row": index, "error": "Invalid entry."})
+            continue
+        student_id = entry.get('student_id')
+        status_val = entry.get('status')
+        if not _is_id(student_id):
+            errors.append({"row": index, "student_id": student_id,
+                           "error": "student_id must be a whole number."})
+        elif student_id not in valid_ids:
+            errors.append({"row": index, "student_id": student_id,
+                           "error": "Student not in this classroom."})
+        elif not _is_status(status_val):
+            errors.append({"row": index, "student_id": student_id,
+                           "error": "Status must be 'P' or 'A'."})
+        elif student_id in records:
+            errors.append({"row": index, "student_id": student_id,
+                           "error": "Duplicate entry for student."})
+        else:
+            records[student_id] = StudentAttendance(
+                school_id=classroom.school_id,
+                student_id=student_id,
+                classroom=classroom,
+                date=on_date,
+                status=status_val,
+            )
+
+    if records:
+        with transaction.atomic():
+            StudentAttendance.objects.bulk_create(
+                records.values(),
+                update_conflicts=True,
+                unique_fields=['student', 'classroom', 'date'],
+                update_fields=['status'],
+            )
+            # bulk_create sends no signals, so refresh the rollups here.
+            refresh_attendance_rollups(
+                (student_id, classroom.id, on_date) for student_id in records)
+        invalidate_tenant_cache(classroom.school_id, StudentAttendance)
+
+    return {
+        "date": on_date,
+        "accepted": len(records),
+        "rejected": len(errors),
+        "errors": errors,
+    }
+
+
+def mark_teacher_attendance(school, entries, on_date):
+    """
+    Upserts a day's attendance for the school's teachers in one statement
+    on (teacher, date). Works like mark_class_attendance.
+    Arguments:
+    school: School whose teachers may be marked.
+    entries: List of {"teacher_id": int, "status": "P" | "A"}.
+    on_date: Date the attendance is recorded for.
+    """
+    requested_ids = {
+        entry.get('teacher_id') for entry in entries
+        if isinstance(entry, dict) and _is_id(entry.get('teacher_id'))
+    }
+    valid_ids = set(
+        Teacher.objects.filter(
+            user__school=school, id__in=requested_ids
+        ).values_list('id', flat=True)
+    )
+
+    records = {}
+    errors = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            errors.append({"row": index, "error": "Invalid entry."})
+            continue
+        teacher_id = entry.get('teacher_id')
+        status_val = entry.get('status')
+        if not _is_id(teacher_id):
+            errors.append({"row": index, "teacher_id": teacher_id,
+                           "error": "teacher_id must be a whole number."})
+        elif teacher_id not in valid_ids:
+            errors.append({"row": index, "teacher_id": teacher_id,
+                           "error": "Teacher not in this school."})
+        elif not _is_status(status_val):
+            errors.append({"row": index, "teacher_id": teacher_id,
+                           "error": "Status must be 'P' or 'A'."})
+        elif teacher_id in records:
+            errors.append({"row": index, "teacher_id": teacher_id,
+                           "error": "Duplicate entry for teacher."})
+        else:
+            records[teacher_id] = TeacherAttendance(
+                school=school, teacher_id=teacher_id, date=on_date, status=status_val)
+
+    if records:
+        with transaction.atomic():
+            TeacherAttendance.objects.bulk_create(
+                records.values(),
+                update_conflicts=True,
+                unique_fields=['teacher', 'date'],
+                update_fields=['status'],
+            )
+
+    return {
+        "date": on_date,
+        "accepted": len(records),
+        "rejected": len(errors),
+        "errors": errors,
+    }
+
+
+def teacher_monthly_register(school, year, month):
+    """
+    Teacher x day register of a month from a single query: every teacher of
+    the school LEFT JOINed to that month's attendance.
+    Each teacher's month is encoded as one string with a character per day
+    ('P', 'A' or '-' when unmarked), next to the present/absent counts
+    payroll needs.
+    """
+    days = calendar.monthrange(year, month)[1]
+    start = date(year, month, 1)
+    end = start + timedelta(days=days)
+
+    rows = Teacher.objects.filter(user__school=school).annotate(
+        month_attendance=FilteredRelation(
+            'teacherattendance',
+            condition=Q(teacherattendance__date__gte=start,
+                        teacherattendance__date__lt=end),
+        )
+    ).order_by('user__name', 'id').values_list(
+        'id', 'user__name', 'month_attendance__date', 'month_attendance__status')
+
+    register = {}
+    for teacher_id, name, day, status_val in rows:
+        entry = register.get(teacher_id)
+        if entry is None:
+            entry = register[teacher_id] = {
+                "teacher_id": teacher_id, "name": name, "days": [UNMARKED] * days}
+        if day is not None:
+            entry["days"][day.day - 1] = status_val
+
+    teachers = []
+    for entry in register.values():
+        marks = ''.join(entry.pop("days"))
+        entry["register"] = marks
+        entry["present_days"] = marks.count('P')
+        entry["absent_days"] = marks.count('A')
+        entry["unmarked_days"] = marks.count(UNMARKED)
+        teachers.append(entry)
+
+    return {
+        "month": f"{year:04d}-{month:02d}",
+        "days": days,
+        "teachers": teachers,
+    }
+
+
+def class_attendance_register(classroom, date_from, date_to):
+    """
+    Student x day register of a classroom between two dates (inclusive).
+    The live rows come from one query, the classroom's students LEFT JOINed
+    to the range, ordered by roll number and pivoted in one pass; archived
+    months are overlaid from their bitmaps.
+    Each student's range is encoded as one string with a character per
+    calendar day ('P', 'A' or '-' when unmarked).
+    """
+    days = (date_to - date_from).days + 1
+
+    rows = Student.objects.filter(classroom=classroom).annotate(
+        range_attendance=FilteredRelation(
+            'studentattendance',
+            condition=Q(studentattendance__classroom=classroom,
+                        studentattendance__date__gte=date_from,
+                        studentattendance__date__lte=date_to),
+        )
+    ).order_by('roll_no', 'id').values_list(
+        'id', 'roll_no', 'user__name',
+        'range_attendance__date', 'range_attendance__status')
+
+    register = {}
+    for student_id, roll_no, name, day, status_val in rows:
+        entry = register.get(student_id)
+        if entry is None:
+            entry = register[student_id] = {
+                "student_id": student_id, "roll_no": roll_no, "name": name,
+                "days": [UNMARKED] * days}
+        if day is not None:
+            entry["days"][(day - date_from).days] = status_val
+
+    archives = StudentAttendanceArchive.objects.filter(
+        classroom=classroom, student_id__in=register,
+        month__gte=date_from.replace(day=1), month__lte=date_to,
+    ).values_list('student_id', 'month', 'marked', 'present')
+    for student_id, month, marked, present in archives:
+        marks = register[student_id]["days"]
+        for day, status_val in unpack_month(month, marked, present, date_from, date_to):
+            index = (day - date_from).days
+            if marks[index] == UNMARKED:
+                marks[index] = status_val
+
+    students = []
+    for entry in register.values():
+        marks = ''.join(entry.pop("days"))
+        entry["register"] = marks
+        entry["present"] = marks.count('P')
+        entry["absent"] = marks.count('A')
+        students.append(entry)
+
+    return {
+        "classroom_id": classroom.id,
+        "from": date_from,
+        "to": date_to,
+        "days": days,
+        "students": students,
+    }
@@ -1,3 +1,204 @@
+import base64
+import datetime
+import json
 from django.test import TestCase
+from attendances.analytics import (
+    classroom_attendance_summary, rebuild_attendance_rollups, student_attendance_summary
+)
+from attendances.archive import archive_attendance, restore_attendance
+from attendances.bitmaps import (
+    attendance_records, merge_bitmaps, pack_month, popcount, unpack_month
+)
+from attendances.models import StudentAttendance, StudentAttendanceArchive
+from attendances.services import class_attendance_register
+from utils.testing import (client_for, create_admin, create_classroom, create_school,
+                           create_student, url)
 
-# Create your tests here.
+
+def encode(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+class KeysetPaginationTests(TestCase):
+    """The (date, id) keyset pages of the student attendance list."""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = create_school()
+        cls.admin = create_admin(school)
+        classroom = create_classroom(school)
+        students = [create_student(classroom, roll_no) for roll_no in range(1, 4)]
+        # Three rows share each date, so pages have to break ties on id.
+        for day in (2, 1):
+            for student in students:
+                StudentAttendance.objects.create(student=student, classroom=classroom,
+                                                 date=datetime.date(2025, 7, day), status='P')
+        cls.expected = list(StudentAttendance.objects.order_by('date', 'id')
+                            .values_list('id', flat=True))
+
+    def setUp(self):
+        self.client = client_for(self.admin)
+
+    def test_cursor_round_trip_walks_every_row_once(self):
+        ids = []
+        path = url('student-attendance', '?page_size=2')
+        while path:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            page = response.json()['data']
+            ids += [row['id'] for row in page['results']]
+            path = page['next']
+        self.assertEqual(ids, self.expected)
+
+    def test_tampered_cursor_is_not_found(self):
+        for position in ([{"a": 1}, 1], ["abc", 1], [None, 1], ["2025-07-01", "x"],
+                         ["2025-07-01", True], ["2025-07-01"], {"date": "2025-07-01"}):
+            with self.subTest(position=position):
+                response = self.client.get(
+                    url('student-attendance', f'?cursor={encode(position)}'))
+                self.assertEqual(response.status_code, 404)
+        response = self.client.get(url('student-attendance', '?cursor=not-base64!'))
+        self.assertEqual(response.status_code, 404)
+
+
+class BitmapTests(TestCase):
+
+    def test_pack_and_unpack_round_trip_day_31(self):
+        month = datetime.date(2025, 1, 1)
+        records = [(datetime.date(2025, 1, 1), 'P'), (datetime.date(2025, 1, 2), 'A'),
+                   (datetime.date(2025, 1, 31), 'P')]
+        marked, present = pack_month(records)
+        self.assertEqual(marked, 1 | 2 | 1 << 30)
+        self.assertEqual(present, 1 | 1 << 30)
+        self.assertEqual(list(unpack_month(month, marked, present)), records)
+
+    def test_merge_overlays_new_days(self):
+        old = pack_month([(datetime.date(2025, 1, 1), 'P'), (datetime.date(2025, 1, 2), 'P')])
+        new = pack_month([(datetime.date(2025, 1, 2), 'A'), (datetime.date(2025, 1, 3), 'P')])
+        self.assertEqual(merge_bitmaps(*old, *new), pack_month([
+            (datetime.date(2025, 1, 1), 'P'), (datetime.date(2025, 1, 2), 'A'),
+            (datetime.date(2025, 1, 3), 'P')]))
+
+    def test_popcount(self):
+        values = [0, 1, 0b1011, 1 << 30, (1 << 31) - 1, 0xFFFFFFFF]
+        self.assertEqual(list(popcount(values)), [bin(value).count('1') for value in values])
+
+
+class AttendanceArchiveTests(TestCase):
+    """Archiving a month must not change anything read from it."""
+
+    january = datetime.date(2025, 1, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        school = create_school()
+        cls.classroom = create_classroom(school)
+        cls.students = [create_student(cls.classroom, roll_no) for roll_no in (1, 2)]
+        first, second = cls.students
+        # Sundays are left unmarked; day 31 is marked for both students.
+        for day in range(1, 32):
+            date_ = datetime.date(2025, 1, day)
+            if date_.weekday() == 6:
+                continue
+            StudentAttendance.objects.create(student=first, classroom=cls.classroom,
+                                             date=date_, status='A' if day % 3 else 'P')
+            if day % 2 or day == 31:
+                StudentAttendance.objects.create(student=second, classroom=cls.classroom,
+                                                 date=date_, status='P')
+        StudentAttendance.objects.create(student=first, classroom=cls.classroom,
+                                         date=datetime.date(2025, 2, 3), status='P')
+
+    def snapshot(self):
+        records = [{key: row[key] for key in ('student_id', 'classroom_id', 'date', 'status')}
+                   for row in attendance_records(classroom_id=self.classroom.id)]
+        register = class_attendance_register(
+            self.classroom, self.january, datetime.date(2025, 2, 28))
+        return {
+            "records": records,
+            "students": [student_attendance_summary(student.id) for student in self.students],
+            "classroom": classroom_attendance_summary(self.classroom.id),
+            "register": register["students"],
+        }
+
+    def archive(self):
+        return archive_attendance(datetime.date(2025, 2, 1))
+
+    def test_archive_keeps_records_percentages_and_register(self):
+        before = self.snapshot()
+        result = self.archive()
+
+        self.assertEqual(result["months"], 1)
+        self.assertEqual(result["bitmaps"], 2)
+        self.assertFalse(StudentAttendance.objects.filter(date__lt=datetime.date(2025, 2, 1)))
+        self.assertEqual(self.snapshot(), before)
+        register = before["register"][1]["register"]
+        self.assertEqual(register[30], 'P')
+        self.assertEqual(register[4], '-')  # Sunday 5 January
+        archived = [row for row in attendance_records(student_ids=[self.students[0].id])
+                    if row["date"] < datetime.date(2025, 2, 1)]
+        self.assertEqual({row["id"] for row in archived}, {None})
+
+        rebuild_attendance_rollups()
+        self.assertEqual(self.snapshot(), before)
+
+    def test_remarking_and_rearchiving_a_month(self):
+        self.archive()
+        first = self.students[0]
+        # Re-mark an archived absent day and mark a Sunday that was left empty.
+        StudentAttendance.objects.create(student=first, classroom=self.classroom,
+                                         date=datetime.date(2025, 1, 31), status='P')
+        StudentAttendance.objects.create(student=first, classroom=self.classroom,
+                                         date=datetime.date(2025, 1, 5), status='A')
+        remarked = self.snapshot()
+        days = {row["date"]: row["status"] for row in remarked["records"]
+                if row["student_id"] == first.id}
+        self.assertEqual(days[datetime.date(2025, 1, 31)], 'P')
+        self.assertEqual(days[datetime.date(2025, 1, 5)], 'A')
+        self.assertEqual(remarked["register"][0]["register"][30], 'P')
+        january = remarked["students"][0]["months"][0]
+        # 27 weekdays plus the Sunday; the re-marked day 31 is counted once.
+        self.assertEqual(january["present"] + january["absent"], 28)
+
+        rebuild_attendance_rollups()
+        self.assertEqual(self.snapshot(), remarked)
+
+        result = self.archive()
+        self.assertEqual(result["bitmaps"], 1)
+        self.assertEqual(StudentAttendanceArchive.objects.count(), 2)
+        self.assertEqual(self.snapshot(), remarked)
+
+    def test_restore_brings_back_the_live_rows(self):
+        live = sorted(StudentAttendance.objects.values_list('student_id', 'date', 'status'))
+        self.archive()
+        restore_attendance(self.january)
+
+        self.assertFalse(StudentAttendanceArchive.objects.exists())
+        self.assertEqual(
+            sorted(StudentAttendance.objects.values_list('student_id', 'date', 'status')), live)
+
+
+class AttendanceHistoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        school = create_school()
+        cls.admin = create_admin(school)
+        cls.classroom = create_classroom(school)
+        student = create_student(cls.classroom, 1)
+        today = datetime.date.today()
+        for date_ in (today, today - datetime.timedelta(days=400)):
+            StudentAttendance.objects.create(student=student, classroom=cls.classroom,
+                                             date=date_, status='P')
+
+    def test_defaults_to_the_last_366_days(self):
+        response = client_for(self.admin).get(
+            url('student-attendance-history', f'?classroom={self.classroom.id}'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['date'] for row in response.json()['data']],
+                         [datetime.date.today().isoformat()])
+
+    def test_rejects_longer_ranges(self):
+        response = client_for(self.admin).get(url(
+            'student-attendance-history',
+            f'?classroom={self.classroom.id}&from=2024-01-01&to=2025-06-30'))
+        self.assertEqual(response.status_code, 400)
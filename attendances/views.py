@@ -1,33 +1,53 @@
+from datetime import date
 from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework import status, permissions
 from .models import StudentAttendance, TeacherAttendance
-from .serializers import StudentAttendanceSerializer, TeacherAttendanceSerializer
+from .serializers import (
+    StudentAttendanceSerializer, StudentAttendanceReadSerializer, TeacherAttendanceSerializer
+)
 from students.models import Student
 from teachers.models import Teacher
 from classrooms.models import Classroom
 from utils.restful_response import send_response
 from utils.data_constants import ResponseMessages
 from school_erp_backend.permissions import IsSchoolAdmin
+from utils.pagination import paginate_or_stream
+from utils.query_params import (
+    bounded_date_range, date_range_parameters, get_date_range, get_int_param
+)
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from .bitmaps import attendance_records
+from .services import (
+    mark_teacher_attendance, parse_register_payload, teacher_monthly_register
+)
+from .analytics import (
+    attendance_streaks, classroom_attendance_summary, low_attendance,
+    student_attendance_summary
+)
 # Create your views here.
 
+LOW_ATTENDANCE_THRESHOLD = 75
+
+
+def scoped_students(user):
+    return Student.objects.for_user(user)
+
+
+def scoped_classrooms(user):
+    return Classroom.objects.for_user(user)
+
 
 class StudentAttendanceListCreateAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get(self, request):
-        user = request.user
-        if user.is_superuser:
-            attendance = StudentAttendance.objects.all()
-        else:
-            attendance = StudentAttendance.objects.filter(
-                student__user__school=user.school)
+        attendance = StudentAttendance.objects.for_user(request.user)
 
-        serializer = StudentAttendanceSerializer(attendance, many=True)
-        return send_response(
-            data=serializer.data,
-            message=ResponseMessages.DATA_FETCH_SUCCESS,
-            status_code=status.HTTP_200_OK
+        return paginate_or_stream(
+            request, attendance, StudentAttendanceReadSerializer,
+            ordering=('date', 'id')
         )
 
     def post(self, request):
@@ -37,8 +57,8 @@ class StudentAttendanceListCreateAPIView(APIView):
             classroom = serializer.validated_data['classroom']
 
             if not request.user.is_superuser and (
-                student.user.school != request.user.school or
-                classroom.school != request.user.school
+                student.user.school_id != request.user.school_id or
+                classroom.school_id != request.user.school_id
             ):
                 return send_response(
                     message='You are not authorized to add attendance for this student/classroom.',
@@ -63,13 +83,7 @@ class StudentAttendanceRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get_object(self, pk, user):
-        try:
-            attendance = StudentAttendance.objects.get(pk=pk)
-            if user.is_superuser or attendance.student.user.school == user.school:
-                return attendance
-            return None
-        except StudentAttendance.DoesNotExist:
-            return None
+        return StudentAttendance.objects.get_for_user(user, pk)
 
     def get(self, request, pk):
         attendance = self.get_object(pk, request.user)
@@ -100,7 +114,8 @@ class StudentAttendanceRetrieveUpdateDeleteAPIView(APIView):
             classroom = serializer.validated_data['classroom']
 
             if not request.user.is_superuser and (
-                student.user.school != request.user.school or classroom.school != request.user.school
+                student.user.school_id != request.user.school_id or
+                classroom.school_id != request.user.school_id
             ):
                 return send_response(
                     message="Unauthorized update.",
@@ -139,26 +154,43 @@ class TeacherAttendanceListCreateAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get(self, request):
-        user = request.user
-        if user.is_superuser:
-            attendance = TeacherAttendance.objects.all()
-        else:
-            attendance = TeacherAttendance.objects.filter(
-                teacher__user__school=user.school)
+        attendance = TeacherAttendance.objects.for_user(request.user)
 
-        serializer = TeacherAttendanceSerializer(attendance, many=True)
-        return send_response(
-            data=serializer.data,
-            message=ResponseMessages.DATA_FETCH_SUCCESS,
-            status_code=status.HTTP_200_OK
+        return paginate_or_stream(
+            request, attendance, TeacherAttendanceSerializer,
+            ordering=('date', 'id')
         )
 
+    register_schema = openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        description="Either a single {teacher, date, status} record, a bare list "
+        "of records for today, or {date, records} to mark the whole staff at once.",
+        properties={
+            'date': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+            'records': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Items(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'teacher_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'status': openapi.Schema(type=openapi.TYPE_STRING, enum=['P', 'A']),
+                    },
+                    required=['teacher_id', 'status']
+                )
+            ),
+        },
+    )
+
+    @swagger_auto_schema(request_body=register_schema)
     def post(self, request):
+        if isinstance(request.data, list) or 'records' in request.data:
+            return self.post_register(request)
+
         serializer = TeacherAttendanceSerializer(data=request.data)
         if serializer.is_valid():
             teacher = serializer.validated_data['teacher']
 
-            if not request.user.is_superuser and teacher.user.school != request.user.school:
+            if not request.user.is_superuser and teacher.user.school_id != request.user.school_id:
                 return send_response(
                     message='You are not authorized to add attendance for this teacher.',
                     status_code=status.HTTP_403_FORBIDDEN
@@ -178,17 +210,78 @@ class TeacherAttendanceListCreateAPIView(APIView):
         )
 
 
+    def post_register(self, request):
+        if request.user.is_superuser:
+            return send_response(
+                message="Bulk marking is done per school by its admin.",
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+        try:
+            entries, on_date = parse_register_payload(request.data)
+        except ValueError as e:
+            return send_response(
+                message=str(e),
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except TypeError:
+            return send_response(
+                message=ResponseMessages.INVALID_PAYLOAD,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = mark_teacher_attendance(request.user.school, entries, on_date)
+        return send_response(
+            data=result,
+            message="Attendance marked successfully.",
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
+
+class TeacherAttendanceRegisterAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Monthly teacher x day register. Each teacher's month "
+        "is one string with a character per day (P, A, or - when unmarked), "
+        "with present/absent day counts for payroll.",
+        manual_parameters=[
+            openapi.Parameter('month', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="YYYY-MM, defaults to the current month"),
+        ]
+    )
+    def get(self, request):
+        if request.user.is_superuser:
+            return send_response(
+                message="The register is per school; sign in as its admin.",
+                status_code=status.HTTP_403_FORBIDDEN
+            )
+        raw_month = request.query_params.get('month')
+        try:
+            if raw_month:
+                year, month = (int(part) for part in raw_month.split('-'))
+                date(year, month, 1)
+            else:
+                today = date.today()
+                year, month = today.year, today.month
+        except ValueError:
+            return send_response(
+                message="month must be in YYYY-MM format.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = teacher_monthly_register(request.user.school, year, month)
+        return send_response(
+            data=data,
+            message=ResponseMessages.DATA_FETCH_SUCCESS,
+            status_code=status.HTTP_200_OK
+        )
+
+
 class TeacherAttendanceRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get_object(self, pk, user):
-        try:
-            attendance = TeacherAttendance.objects.get(pk=pk)
-            if user.is_superuser or attendance.teacher.user.school == user.school:
-                return attendance
-            return None
-        except TeacherAttendance.DoesNotExist:
-            return None
+        return TeacherAttendance.objects.get_for_user(user, pk)
 
     def get(self, request, pk):
         attendance = self.get_object(pk, request.user)
@@ -217,7 +310,7 @@ class TeacherAttendanceRetrieveUpdateDeleteAPIView(APIView):
         if serializer.is_valid():
             teacher = serializer.validated_data['teacher']
 
-            if not request.user.is_superuser and teacher.user.school != request.user.school:
+            if not request.user.is_superuser and teacher.user.school_id != request.user.school_id:
                 return send_response(
                     message="Unauthorized update.",
                     status_code=status.HTTP_403_FORBIDDEN
@@ -249,3 +342,198 @@ class TeacherAttendanceRetrieveUpdateDeleteAPIView(APIView):
             message=ResponseMessages.RECORD_DELETED,
             status_code=status.HTTP_204_NO_CONTENT
         )
+
+
+class AttendancePercentageAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Attendance percentage of a student or a classroom, "
+        "overall and per month, read from the monthly rollups.",
+        manual_parameters=[
+            openapi.Parameter('student', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('classroom', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ] + date_range_parameters
+    )
+    def get(self, request):
+        try:
+            student_id = get_int_param(request, 'student')
+            classroom_id = get_int_param(request, 'classroom')
+            date_from, date_to = get_date_range(request)
+        except ValueError:
+            return send_response(
+                message=ResponseMessages.INVALID_PAYLOAD,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        if student_id is not None:
+            if not scoped_students(request.user).filter(id=student_id).exists():
+                return send_response(
+                    message="Student not found.",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            data = student_attendance_summary(student_id, date_from, date_to)
+        elif classroom_id is not None:
+            if not scoped_classrooms(request.user).filter(id=classroom_id).exists():
+                return send_response(
+                    message="Classroom not found.",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            data = classroom_attendance_summary(classroom_id, date_from, date_to)
+        else:
+            return send_response(
+                message="student or classroom is required.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        return send_response(
+            data=data,
+            message=ResponseMessages.DATA_FETCH_SUCCESS,
+            status_code=status.HTTP_200_OK
+        )
+
+
+class AttendanceHistoryAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+    max_history_days = 366
+
+    @swagger_auto_schema(
+        operation_description="Attendance of a student or classroom, merging live "
+        "rows with months moved to the bitmap archive. Rows carry the live row's "
+        "id, or null for archived days. Defaults to the last 366 days; a range "
+        "covers at most 366 days.",
+        manual_parameters=[
+            openapi.Parameter('student', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('classroom', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ] + date_range_parameters
+    )
+    def get(self, request):
+        try:
+            student_id = get_int_param(request, 'student')
+            classroom_id = get_int_param(request, 'classroom')
+            date_from, date_to = get_date_range(request)
+        except ValueError:
+            return send_response(
+                message=ResponseMessages.INVALID_PAYLOAD,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        date_from, date_to = bounded_date_range(date_from, date_to, self.max_history_days)
+        if date_from is None:
+            return send_response(
+                message=f"from must be on or before to, at most {self.max_history_days} days apart.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        if student_id is not None:
+            if not scoped_students(request.user).filter(id=student_id).exists():
+                return send_response(
+                    message="Student not found.",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            data = attendance_records(
+                student_ids=[student_id], date_from=date_from, date_to=date_to)
+        elif classroom_id is not None:
+            if not scoped_classrooms(request.user).filter(id=classroom_id).exists():
+                return send_response(
+                    message="Classroom not found.",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            data = attendance_records(
+                classroom_id=classroom_id, date_from=date_from, date_to=date_to)
+        else:
+            return send_response(
+                message="student or classroom is required.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        return send_response(
+            data=data,
+            message=ResponseMessages.DATA_FETCH_SUCCESS,
+            status_code=status.HTTP_200_OK
+        )
+
+
+class LowAttendanceAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Students whose attendance percentage is below the "
+        "threshold, lowest first.",
+        manual_parameters=[
+            openapi.Parameter('threshold', openapi.IN_QUERY, type=openapi.TYPE_NUMBER,
+                              default=LOW_ATTENDANCE_THRESHOLD),
+            openapi.Parameter('classroom', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ] + date_range_parameters
+    )
+    def get(self, request):
+        try:
+            threshold = float(request.query_params.get(
+                'threshold', LOW_ATTENDANCE_THRESHOLD))
+            classroom_id = get_int_param(request, 'classroom')
+            date_from, date_to = get_date_range(request)
+        except ValueError:
+            return send_response(
+                message=ResponseMessages.INVALID_PAYLOAD,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        school = None if request.user.is_superuser else request.user.school
+        data = low_attendance(
+            school.id if school else None, threshold, classroom_id,
+            date_from, date_to)
+        return send_response(
+            data=data,
+            message=ResponseMessages.DATA_FETCH_SUCCESS,
+            status_code=status.HTTP_200_OK
+        )
+
+
+class AttendanceStreakAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Present/absent streaks over marked school days "
+        "(default: last 180 days) for a student or every student of a classroom.",
+        manual_parameters=[
+            openapi.Parameter('student', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('classroom', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('from', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              format=openapi.FORMAT_DATE),
+        ]
+    )
+    def get(self, request):
+        try:
+            student_id = get_int_param(request, 'student')
+            classroom_id = get_int_param(request, 'classroom')
+            date_from, _ = get_date_range(request)
+        except ValueError:
+            return send_response(
+                message=ResponseMessages.INVALID_PAYLOAD,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        if student_id is not None:
+            if not scoped_students(request.user).filter(id=student_id).exists():
+                return send_response(
+                    message="Student not found.",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            data = attendance_streaks(student_ids=[student_id], since=date_from)
+        elif classroom_id is not None:
+            if not scoped_classrooms(request.user).filter(id=classroom_id).exists():
+                return send_response(
+                    message="Classroom not found.",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            data = attendance_streaks(classroom_id=classroom_id, since=date_from)
+        else:
+            return send_response(
+                message="student or classroom is required.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        return send_response(
+            data=data,
+            message=ResponseMessages.DATA_FETCH_SUCCESS,
+            status_code=status.HTTP_200_OK
+        )
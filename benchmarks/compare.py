@@ -0,0 +1,66 @@
+"""
+Compares two benchmarks.load result files, e.g. of two commits:
+
+    python -m benchmarks.compare base.json head.json --threshold 20
+
+Exits with status 1 when an endpoint's p95 latency grew by more than
+`threshold` percent (and by at least --min-ms), or its query count grew.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as result_file:
+        report = json.load(result_file)
+    return report, {
+        (scenario, endpoint): stats
+        for scenario, endpoints in report["scenarios"].items()
+        for endpoint, stats in endpoints.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=20,
+                        help='Allowed p95 growth in percent.')
+    parser.add_argument('--min-ms', type=float, default=2,
+                        help='Ignore p95 changes smaller than this.')
+    args = parser.parse_args()
+
+    base_report, base = load(args.base)
+    head_report, head = load(args.head)
+    print(f"base {base_report.get('commit')} ({base_report.get('database')})  "
+          f"head {head_report.get('commit')} ({head_report.get('database')})")
+    print(f"{'endpoint':<52}{'p95 base':>10}{'p95 head':>10}{'change':>9}"
+          f"{'queries':>10}")
+
+    regressions = []
+    for key in sorted(set(base) | set(head)):
+        label = f"{key[0]}: {key[1]}"
+        if key not in base or key not in head:
+            print(f"{label:<52}{'only in ' + ('head' if key in head else 'base'):>20}")
+            continue
+        old, new = base[key], head[key]
+        change = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0
+        queries = f"{old['queries_max']}->{new['queries_max']}"
+        flag = ''
+        if change > args.threshold and new["p95_ms"] - old["p95_ms"] >= args.min_ms:
+            flag = '  SLOWER'
+            regressions.append(label)
+        if new["queries_max"] > old["queries_max"]:
+            flag += '  MORE QUERIES'
+            regressions.append(label)
+        print(f"{label:<52}{old['p95_ms']:>10.1f}{new['p95_ms']:>10.1f}{change:>8.0f}%"
+              f"{queries:>10}{flag}")
+
+    if regressions:
+        print(f"\n{len(set(regressions))} endpoint(s) regressed.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
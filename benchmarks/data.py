@@ -0,0 +1,314 @@
+"""
+Deterministic synthetic tenants for benchmarks and index tuning.
+
+Every school is generated from its own random stream, derived from the
+seed and the school's number, so a school always gets the same data
+whatever else is generated with it. Rows are written with bulk_create in
+batches, or with COPY on Postgres for the large tables, so model signals
+do not run; the derived tables (fee ledger columns, attendance and fee
+rollups) are filled in directly instead.
+"""
+import datetime
+import io
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import islice
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from attendances.analytics import rebuild_attendance_rollups
+from attendances.models import StudentAttendance
+from classrooms.models import Classroom
+from exams.models import Exam, ExamResult, ExamSubject
+from fees.analytics import refresh_fee_collection_rollups
+from fees.models import FeeCategory, FeeStructure, Payment, StudentFee
+from schools.models import School
+from students.models import Student
+from subjects.models import ClassroomSubject, Subject
+from teachers.models import Teacher
+from users.models import User
+
+BATCH_SIZE = 5000
+COPY_BATCH_SIZE = 100000
+PASSWORD = 'bench-password'
+EMAIL_DOMAIN = 'bench.test'
+SUBJECT_NAMES = ['Mathematics', 'Science', 'English', 'Hindi', 'Social Studies',
+                 'Computer Science', 'Sanskrit', 'Art', 'Music', 'Physical Education']
+SECTIONS = 'ABCDEFGH'
+MONTHS = [month for month, _ in StudentFee.MONTH_CHOICES]
+
+
+@dataclass
+class ScaleConfig:
+    """Size of one generated school."""
+    classrooms: int = 10
+    students_per_classroom: int = 40
+    subjects: int = 6
+    extra_teachers: int = 4
+    exams: int = 3
+    attendance_days: int = 180
+    fee_months: int = 12
+    monthly_fee: int = 1500
+    paid_ratio: float = 0.7
+    end_date: datetime.date = None
+
+    def __post_init__(self):
+        self.subjects = min(self.subjects, len(SUBJECT_NAMES))
+        self.end_date = self.end_date or datetime.date.today()
+
+
+def school_days(end_date, count):
+    """The last `count` days up to `end_date`, Sundays excluded, oldest first."""
+    days = []
+    day = end_date
+    while len(days) < count:
+        if day.weekday() != 6:
+            days.append(day)
+        day -= datetime.timedelta(days=1)
+    return days[::-1]
+
+
+def batched(rows, size=BATCH_SIZE):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_insert(model, fields, rows, batch_size=BATCH_SIZE):
+    """
+    bulk_create of an iterable of value tuples, in `fields` order, in
+    batches; returns the number of rows.
+    """
+    count = 0
+    for batch in batched(rows, batch_size):
+        model.objects.bulk_create([model(**dict(zip(fields, row))) for row in batch],
+                                  batch_size=batch_size)
+        count += len(batch)
+    return count
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, str):
+        return (value.replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r'))
+    return str(value)
+
+
+def copy_insert(model, fields, rows, batch_size=COPY_BATCH_SIZE):
+    """
+    Same as bulk_insert, with Postgres COPY FROM STDIN: no model instances
+    and no INSERT statements, several times faster for millions of rows.
+    Columns left out of `fields` get their database default, so `fields`
+    has to cover every column without one.
+    """
+    opts = model._meta
+    columns = ', '.join(connection.ops.quote_name(opts.get_field(name).column)
+                        for name in fields)
+    sql = f"COPY {connection.ops.quote_name(opts.db_table)} ({columns}) FROM STDIN"
+    count = 0
+    with connection.cursor() as cursor:
+        for batch in batched(rows, batch_size):
+            buffer = io.StringIO()
+            buffer.writelines(
+                '\t'.join(map(_copy_value, row)) + '\n' for row in batch)
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            count += len(batch)
+    return count
+
+
+def _users(prefix, role, school, count, password):
+    return User.objects.bulk_create([
+        User(email=f"{prefix}{number}@{EMAIL_DOMAIN}", username=f"{prefix}{number}",
+             name=f"{role.title()} {prefix}{number}", role=role, school=school,
+             password=password)
+        for number in range(1, count + 1)
+    ], batch_size=BATCH_SIZE)
+
+
+ATTENDANCE_FIELDS = ('school_id', 'student_id', 'classroom_id', 'date', 'status')
+EXAM_RESULT_FIELDS = ('school_id', 'exam_subject_id', 'student_id', 'marks_obtained',
+                      'remarks')
+PAYMENT_FIELDS = ('school_id', 'fee_id', 'amount_paid', 'payment_mode', 'transaction_id',
+                  'transaction_date')
+
+
+def attendance_rows(school, students, days, rng):
+    """
+    One ATTENDANCE_FIELDS tuple per student and school day. Each student
+    has a steady attendance rate between 60% and 99%, so low-attendance
+    reports and streaks have something to find.
+    """
+    rates = [(student.id, student.classroom_id, rng.uniform(0.6, 0.99))
+             for student in students]
+    draw = rng.random
+    for day in days:
+        for student_id, classroom_id, rate in rates:
+            yield school.id, student_id, classroom_id, day, 'P' if draw() < rate else 'A'
+
+
+def generate_school(number, config, seed=0, password=None, rollups=True, copy=False):
+    """
+    Generates school `number` with the shape of `config`.
+    Arguments:
+    number: 1-based school number; names and emails are derived from it
+        (admin: s<number>-admin1@bench.test).
+    seed: Base seed; the school's data depends only on (seed, number).
+    password: Password hash shared by every user (hashing once per user
+        would dominate the run).
+    rollups: Also build the attendance rollups of the school.
+    copy: Write attendance, exam results and payments with Postgres COPY
+        instead of bulk_create; the data is the same either way.
+    Returns:
+    A dict with the school and the number of rows per model.
+    """
+    rng = random.Random(f"{seed}:{number}")
+    insert = copy_insert if copy else bulk_insert
+    password = password or make_password(PASSWORD)
+    prefix = f"s{number}-"
+    counts = {}
+
+    with transaction.atomic():
+        school = School.objects.create(
+            name=f"Bench School {number}", address=f"{number} Bench Road",
+            contact_email=f"{prefix}office@{EMAIL_DOMAIN}",
+            contact_number=f"9{number:09d}", established_year=1950 + number % 70)
+        _users(f"{prefix}admin", 'SCHOOL_ADMIN', school, 1, password)
+
+        teacher_users = _users(f"{prefix}teacher", 'TEACHER', school,
+                               config.classrooms + config.extra_teachers, password)
+        teachers = Teacher.objects.bulk_create([
+            Teacher(user=user, qualification='M.Ed', experience=rng.randint(1, 30),
+                    gender=rng.choice('MF'), subject_spec=rng.choice(SUBJECT_NAMES),
+                    dob=datetime.date(1970 + rng.randint(0, 25), rng.randint(1, 12), 1),
+                    join_date=datetime.date(2010 + rng.randint(0, 14), rng.randint(1, 12), 1))
+            for user in teacher_users
+        ])
+        counts['teachers'] = len(teachers)
+
+        classrooms = Classroom.objects.bulk_create([
+            Classroom(school=school, class_name=str(index // len(SECTIONS) + 1),
+                      section=SECTIONS[index % len(SECTIONS)], class_teacher=teachers[index])
+            for index in range(config.classrooms)
+        ])
+        counts['classrooms'] = len(classrooms)
+
+        subjects = Subject.objects.bulk_create([
+            Subject(school=school, name=name) for name in SUBJECT_NAMES[:config.subjects]
+        ])
+        ClassroomSubject.objects.bulk_create([
+            ClassroomSubject(classroom=classroom, subject=subject,
+                             teacher=rng.choice(teachers))
+            for classroom in classrooms for subject in subjects
+        ])
+
+        student_users = iter(_users(f"{prefix}student", 'STUDENT', school,
+                                    config.classrooms * config.students_per_classroom,
+                                    password))
+        students = Student.objects.bulk_create([
+            Student(user=next(student_users), classroom=classroom, roll_no=roll_no,
+                    gender=rng.choice('MF'),
+                    dob=datetime.date(2008 + rng.randint(0, 8), rng.randint(1, 12), 1))
+            for classroom in classrooms
+            for roll_no in range(1, config.students_per_classroom + 1)
+        ], batch_size=BATCH_SIZE)
+        counts['students'] = len(students)
+
+    days = school_days(config.end_date, config.attendance_days)
+    with transaction.atomic():
+        counts['attendance'] = insert(
+            StudentAttendance, ATTENDANCE_FIELDS, attendance_rows(school, students, days, rng))
+
+    with transaction.atomic():
+        counts['exam_results'] = _generate_exams(
+            number, config, school, classrooms, subjects, students, days, rng, insert)
+
+    with transaction.atomic():
+        counts['student_fees'], counts['payments'] = _generate_fees(
+            number, config, school, classrooms, students, days, rng, insert)
+
+    if rollups:
+        rebuild_attendance_rollups(school_id=school.id)
+    return {"school": school, "counts": counts}
+
+
+def _generate_exams(number, config, school, classrooms, subjects, students, days, rng,
+                    insert):
+    exam_subjects = []
+    for index in range(config.exams):
+        exam = Exam.objects.create(title=f"S{number} Term {index + 1}")
+        exam.classrooms.add(*classrooms)
+        # Spread the exams over the attendance window.
+        exam_date = days[(index + 1) * len(days) // (config.exams + 1)] if days else None
+        exam_subjects += ExamSubject.objects.bulk_create([
+            ExamSubject(exam=exam, classroom=classroom, subject=subject,
+                        total_marks=100, exam_date=exam_date)
+            for classroom in classrooms for subject in subjects
+        ])
+
+    by_classroom = {}
+    for exam_subject in exam_subjects:
+        by_classroom.setdefault(exam_subject.classroom_id, []).append(exam_subject.id)
+    ability = {student.id: rng.uniform(35, 90) for student in students}
+    rows = (
+        (school.id, exam_subject_id, student.id,
+         round(min(100, max(0, rng.gauss(ability[student.id], 10))), 1), None)
+        for student in students
+        for exam_subject_id in by_classroom.get(student.classroom_id, [])
+    )
+    return insert(ExamResult, EXAM_RESULT_FIELDS, rows)
+
+
+def _generate_fees(number, config, school, classrooms, students, days, rng, insert):
+    category = FeeCategory.objects.create(school=school, name='Tuition')
+    first_day = days[0] if days else config.end_date
+    structures = {
+        classroom.id: FeeStructure.objects.create(
+            classroom=classroom, category=category,
+            academic_year=f"{first_day.year}-{(first_day.year + 1) % 100:02d}",
+            amount=config.monthly_fee, fee_type='monthly',
+            due_date=first_day.replace(day=10))
+        for classroom in classrooms
+    }
+
+    amount = Decimal(config.monthly_fee)
+    paid = []
+    fees = []
+    for student in students:
+        for month in MONTHS[:config.fee_months]:
+            fee = StudentFee(school=school, student_id=student.id,
+                             fee_structure=structures[student.classroom_id],
+                             month=month, amount=amount, final_amount=amount)
+            if rng.random() < config.paid_ratio:
+                fee.paid_total = amount
+                paid.append(fee)
+            fee.apply_balance()
+            fees.append(fee)
+    StudentFee.objects.bulk_create(fees, batch_size=BATCH_SIZE)
+
+    payments = (
+        (school.id, fee.id, fee.final_amount, rng.choice(['cash', 'upi', 'card', 'bank']),
+         f"S{number}-{fee.id}", rng.choice(days))
+        for fee in paid
+    ) if days else ()
+    return len(fees), insert(Payment, PAYMENT_FIELDS, payments)
+
+
+def generate(schools, config, seed=0, rollups=True):
+    """
+    Generates schools 1..`schools` in this process and refreshes the fee
+    collection rollups once at the end.
+    Returns:
+    The list of generate_school results.
+    """
+    password = make_password(PASSWORD)
+    results = [generate_school(number, config, seed=seed, password=password, rollups=rollups)
+               for number in range(1, schools + 1)]
+    if rollups:
+        refresh_fee_collection_rollups()
+    return results
@@ -0,0 +1,156 @@
+"""
+Prints the query plans behind the tenant-filtered list views, to check
+that they use the indexes instead of scanning the large tables.
+
+    python -m benchmarks.explain --schools 3 --analyze
+
+Every view is requested through the API as its usual caller (school
+admin, class teacher or student) and each SELECT it runs is EXPLAINed.
+Full scans of the large tables are listed at the end; with --strict the
+command then exits with status 1.
+
+By default the data is generated in a throwaway test database like
+benchmarks.load does. Pass --existing to explain against the configured
+database instead, e.g. after `manage.py seed_scale`. Planners prefer
+scans on small tables, so use at least a few schools of default size.
+"""
+import argparse
+import os
+import re
+import sys
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'school_erp_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext, setup_databases, setup_test_environment, teardown_databases
+)
+from benchmarks.data import EMAIL_DOMAIN, ScaleConfig, generate  # noqa: E402
+from benchmarks.scenarios import SchoolContext, Step  # noqa: E402
+from schools.models import School  # noqa: E402
+
+LARGE_TABLES = {
+    'attendances_studentattendance', 'exams_examresult', 'fees_payment',
+    'fees_studentfee', 'students_student', 'users_user',
+}
+# Postgres: "Seq Scan on table"; SQLite: "SCAN table" (without "USING ... INDEX").
+FULL_SCAN = re.compile(r'Seq Scan on (\w+)|^SCAN (\w+)$')
+
+
+def list_views(context):
+    classroom = context.classrooms[0]
+    student = classroom["students"][0]
+    yield Step('student-attendance', context.admin)
+    yield Step('fee-student', context.admin)
+    yield Step('fee-dues', context.admin)
+    yield Step('fee-payment', context.admin)
+    yield Step('exam-result-list-create', context.admin)
+    yield Step('student-list-create', context.admin)
+    yield Step('teacher-list-create', context.admin)
+    yield Step('list-create-user', context.admin)
+    yield Step('mark-attendance', classroom["teacher"], kwargs={"classroom_id": classroom["id"]})
+    yield Step('teacher-students', classroom["teacher"])
+    yield Step('student-attendance-own', student)
+    yield Step('student-fees', student)
+    yield Step('student-exam-results', student)
+
+
+def explain(sql, options):
+    prefix = connection.ops.explain_query_prefix(**options)
+    with connection.cursor() as cursor:
+        cursor.execute(f"{prefix} {sql}")
+        # One text column on Postgres; SQLite's detail is the last column.
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def explain_view(step, options):
+    with CaptureQueriesContext(connection) as captured:
+        response = step.client.get(step.path)
+    plans = []
+    seen = set()
+    for query in captured.captured_queries:
+        sql = query["sql"]
+        if not sql.lstrip().upper().startswith('SELECT') or sql in seen:
+            continue
+        seen.add(sql)
+        plans.append((sql, explain(sql, options)))
+    return response.status_code, plans
+
+
+def full_scans(plan):
+    tables = set()
+    for line in plan:
+        match = FULL_SCAN.search(line.strip())
+        if match:
+            table = match.group(1) or match.group(2)
+            if table in LARGE_TABLES:
+                tables.add(table)
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--schools', type=int, default=3)
+    parser.add_argument('--classrooms', type=int, default=ScaleConfig.classrooms)
+    parser.add_argument('--students', type=int, default=ScaleConfig.students_per_classroom,
+                        help='Students per classroom.')
+    parser.add_argument('--days', type=int, default=ScaleConfig.attendance_days,
+                        help='School days of attendance.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--existing', action='store_true',
+                        help='Use the configured database as it is (seeded by seed_scale).')
+    parser.add_argument('--school', type=int, default=1,
+                        help='Number of the generated school whose users make the requests.')
+    parser.add_argument('--analyze', action='store_true',
+                        help='EXPLAIN ANALYZE (Postgres only): run the queries and show timings.')
+    parser.add_argument('--strict', action='store_true',
+                        help='Exit with status 1 on full scans of the large tables.')
+    args = parser.parse_args()
+
+    options = {"analyze": True} if args.analyze else {}
+    setup_test_environment()
+    old_config = None
+    if not args.existing:
+        old_config = setup_databases(verbosity=0, interactive=False)
+    scans = []
+    try:
+        if not args.existing:
+            generate(args.schools, ScaleConfig(
+                classrooms=args.classrooms, students_per_classroom=args.students,
+                attendance_days=args.days), seed=args.seed)
+        with connection.cursor() as cursor:
+            # Fresh statistics, or the planner guesses the table sizes.
+            cursor.execute('ANALYZE')
+        school = School.objects.get(
+            user__email=f"s{args.school}-admin1@{EMAIL_DOMAIN}")
+        context = SchoolContext.build(school, students_per_classroom=1)
+
+        for step in list_views(context):
+            status, plans = explain_view(step, options)
+            print(f"\n=== GET {step.url_name} ({status}, {len(plans)} queries)")
+            for sql, plan in plans:
+                print(f"\n{sql if len(sql) <= 300 else sql[:300] + ' ...'}")
+                for line in plan:
+                    print(f"    {line}")
+                scans += [(step.url_name, table) for table in sorted(full_scans(plan))]
+    finally:
+        if old_config is not None:
+            teardown_databases(old_config, verbosity=0)
+
+    print()
+    if not scans:
+        print("No full scans of the large tables.")
+        return
+    print("Full scans of large tables:")
+    for url_name, table in scans:
+        print(f"  {url_name}: {table}")
+    if args.strict:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Replays school-day traffic against the API and records latency, query
+counts and memory per endpoint.
+
+Run from the project root with the usual environment (.env) loaded:
+
+    python -m benchmarks.load --schools 1 --classrooms 6 --students 40 \\
+        --days 120 --iterations 5 --output bench-results.json
+
+A throwaway test database is created on the configured DATABASES (a local
+Postgres, or SQLite with DJANGO_SETTINGS_MODULE pointing at SQLite
+settings), filled by benchmarks.data and dropped afterwards. Requests go
+through the full middleware and DRF stack in-process, with real JWTs.
+Compare two result files with `python -m benchmarks.compare`.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'school_erp_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, connections  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_databases, setup_test_environment, teardown_databases
+)
+from benchmarks.data import ScaleConfig, generate  # noqa: E402
+from benchmarks.scenarios import SCENARIOS, SchoolContext  # noqa: E402
+from utils.query_budget import QueryRecorder  # noqa: E402
+
+
+def rss_mb():
+    """Current resident set size of this process."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        # Peak instead of current where /proc is missing (macOS: bytes).
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_step(step):
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for db in connections.all():
+            stack.enter_context(db.execute_wrapper(recorder))
+        start = time.perf_counter()
+        if step.method == 'GET':
+            response = step.client.get(step.path)
+        else:
+            response = step.client.generic(
+                step.method, step.path, json.dumps(step.data), 'application/json')
+        elapsed = time.perf_counter() - start
+    return {
+        "status": response.status_code,
+        "ms": elapsed * 1000,
+        "queries": recorder.count,
+        "db_ms": recorder.duration * 1000,
+        "rss_mb": rss_mb(),
+    }
+
+
+def summarize(samples):
+    latencies = [sample["ms"] for sample in samples]
+    queries = [sample["queries"] for sample in samples]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if sample["status"] >= 400),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "max_ms": round(max(latencies), 2),
+        "queries_mean": round(sum(queries) / len(queries), 2),
+        "queries_max": max(queries),
+        "db_ms_mean": round(sum(sample["db_ms"] for sample in samples) / len(samples), 2),
+        "rss_mb_max": round(max(sample["rss_mb"] for sample in samples), 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--schools', type=int, default=1)
+    parser.add_argument('--classrooms', type=int, default=6)
+    parser.add_argument('--students', type=int, default=40, help='Students per classroom.')
+    parser.add_argument('--days', type=int, default=120, help='School days of attendance.')
+    parser.add_argument('--exams', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1,
+                        help='Untimed iterations run first.')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help='Comma separated, from: ' + ', '.join(SCENARIOS))
+    parser.add_argument('--output', default='bench-results.json')
+    parser.add_argument('--keepdb', action='store_true',
+                        help='Keep (and reuse) the test database.')
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False, keepdb=args.keepdb)
+    try:
+        # Attendance ends yesterday so that the roll call registers today.
+        config = ScaleConfig(
+            classrooms=args.classrooms, students_per_classroom=args.students,
+            attendance_days=args.days, exams=args.exams,
+            end_date=datetime.date.today() - datetime.timedelta(days=1))
+        started = time.perf_counter()
+        generated = generate(args.schools, config, seed=args.seed)
+        seed_seconds = time.perf_counter() - started
+        contexts = [SchoolContext.build(result["school"]) for result in generated]
+
+        samples = {}
+        rng = random.Random(args.seed)
+        for iteration in range(args.warmup + args.iterations):
+            for name in scenarios:
+                for context in contexts:
+                    for step in SCENARIOS[name](context, rng, iteration):
+                        sample = run_step(step)
+                        if iteration >= args.warmup:
+                            key = f"{step.method} {step.url_name}"
+                            samples.setdefault(name, {}).setdefault(key, []).append(sample)
+
+        totals = {}
+        for result in generated:
+            for model, count in result["counts"].items():
+                totals[model] = totals.get(model, 0) + count
+        report = {
+            "commit": git_commit(),
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "config": vars(args),
+            "data": {"rows": totals, "seed_seconds": round(seed_seconds, 1)},
+            "peak_rss_mb": round(max(
+                sample["rss_mb"] for endpoints in samples.values()
+                for runs in endpoints.values() for sample in runs), 1) if samples else None,
+            "scenarios": {
+                name: {key: summarize(runs) for key, runs in sorted(endpoints.items())}
+                for name, endpoints in samples.items()
+            },
+        }
+    finally:
+        teardown_databases(old_config, verbosity=0, keepdb=args.keepdb)
+
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+    print(f"{'endpoint':<42}{'n':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'err':>5}")
+    for name, endpoints in report["scenarios"].items():
+        print(f"[{name}]")
+        for key, stats in endpoints.items():
+            print(f"  {key:<40}{stats['requests']:>5}{stats['p50_ms']:>9.1f}"
+                  f"{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+                  f"{stats['queries_max']:>9}{stats['errors']:>5}")
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
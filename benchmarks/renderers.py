@@ -0,0 +1,120 @@
+"""
+Compares the response rendering paths on representative list payloads:
+the previous one (DisplayMessage rebuilt per call + DRF's JSONRenderer) and
+the current one (shared display_message + ORJSONRenderer).
+
+Run from the project root with the usual environment (.env) loaded:
+
+    python -m benchmarks.renderers --rows 5000 --repeat 20
+
+Payloads are built in memory with the real serializers, so no database is
+needed. Only envelope building and rendering are timed.
+"""
+import argparse
+import datetime
+import os
+import timeit
+from decimal import Decimal
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'school_erp_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from attendances.models import StudentAttendance  # noqa: E402
+from attendances.serializers import StudentAttendanceSerializer  # noqa: E402
+from exams.models import ExamResult  # noqa: E402
+from exams.serializers import ExamResultSerializer  # noqa: E402
+from fees.models import Payment  # noqa: E402
+from fees.serializers import PaymentSerializer  # noqa: E402
+from utils.data_constants import ResponseMessages  # noqa: E402
+from utils.db_choices import ErrorMessageInfoLevels  # noqa: E402
+from utils.renderers import ORJSONRenderer  # noqa: E402
+from utils.restful_response import DisplayMessage, display_message  # noqa: E402
+
+
+def attendance_rows(count):
+    start = datetime.date(2025, 4, 1)
+    return StudentAttendanceSerializer([
+        StudentAttendance(id=index, student_id=index % 40 + 1, classroom_id=1,
+                          date=start + datetime.timedelta(days=index // 40),
+                          status='P' if index % 7 else 'A')
+        for index in range(count)
+    ], many=True).data
+
+
+def result_rows(count):
+    return ExamResultSerializer([
+        ExamResult(id=index, exam_subject_id=index % 6 + 1, student_id=index % 40 + 1,
+                   marks_obtained=35 + index % 65, remarks=None if index % 3 else 'Good')
+        for index in range(count)
+    ], many=True).data
+
+
+def payment_rows(count):
+    start = datetime.date(2025, 4, 1)
+    return PaymentSerializer([
+        Payment(id=index, fee_id=index + 1, amount_paid=Decimal('1250.50'),
+                payment_mode='UPI', transaction_id=f'TXN{index:08d}',
+                transaction_date=start + datetime.timedelta(days=index % 30))
+        for index in range(count)
+    ], many=True).data
+
+
+def raw_fee_rows(count):
+    # Shape of .values() rows: Decimal and date objects, not strings.
+    start = datetime.date(2025, 4, 1)
+    return [
+        {"id": index, "student_id": index % 40 + 1, "month": 'April',
+         "amount": Decimal('1500.00'), "discount": Decimal('0.00'),
+         "balance_due": Decimal('1500.00'), "due_date": start, "is_paid": False}
+        for index in range(count)
+    ]
+
+
+def previous_envelope(data):
+    display = DisplayMessage(
+        show_to_user=False,
+        level=ErrorMessageInfoLevels.info.value,
+        message=ResponseMessages.DATA_FETCH_SUCCESS,
+    )
+    return {"error": None, "data": {"results": data, "next": None},
+            "display_message": display.__dict__, "error_code": None}
+
+
+def current_envelope(data):
+    display = display_message(
+        False, ErrorMessageInfoLevels.info.value, ResponseMessages.DATA_FETCH_SUCCESS)
+    return {"error": None, "data": {"results": data, "next": None},
+            "display_message": display, "error_code": None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        'attendance': attendance_rows(args.rows),
+        'exam results': result_rows(args.rows),
+        'payments': payment_rows(args.rows),
+        'fee values()': raw_fee_rows(args.rows),
+    }
+    previous, current = JSONRenderer(), ORJSONRenderer()
+
+    print(f"{'payload':<14}{'bytes':>10}{'drf ms':>10}{'orjson ms':>11}{'speedup':>9}")
+    for name, data in payloads.items():
+        before = timeit.timeit(
+            lambda: previous.render(previous_envelope(data)), number=args.repeat)
+        after = timeit.timeit(
+            lambda: current.render(current_envelope(data)), number=args.repeat)
+        size = len(current.render(current_envelope(data)))
+        print(f"{name:<14}{size:>10}{before * 1000 / args.repeat:>10.2f}"
+              f"{after * 1000 / args.repeat:>11.2f}{before / after:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Scripted school-day traffic. A scenario is a function of (context, rng,
+iteration) yielding Steps; the runner (benchmarks.load) times each step.
+"""
+import datetime
+from dataclasses import dataclass, field
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from classrooms.models import Classroom
+from exams.models import Exam
+from fees.models import StudentFee
+from students.models import Student
+from users.models import User
+
+
+@dataclass
+class Step:
+    url_name: str
+    client: APIClient
+    method: str = 'GET'
+    kwargs: dict = None
+    query: str = ''
+    data: object = None
+
+    @property
+    def path(self):
+        return reverse(self.url_name, kwargs=self.kwargs) + self.query
+
+
+def client_for(user):
+    """An API client authenticated with a real JWT, as the apps send it."""
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client
+
+
+@dataclass
+class SchoolContext:
+    admin: APIClient
+    classrooms: list = field(default_factory=list)
+
+    @classmethod
+    def build(cls, school, students_per_classroom=5, unpaid_fees=50):
+        """
+        Clients and ids one scenario run needs for a school: its admin,
+        every class teacher and a few students of every classroom.
+        """
+        context = cls(admin=client_for(User.objects.get(school=school, role='SCHOOL_ADMIN')))
+        for classroom in Classroom.objects.filter(school=school).select_related(
+                'class_teacher__user').order_by('id'):
+            students = list(Student.objects.filter(classroom=classroom).select_related(
+                'user').order_by('roll_no'))
+            context.classrooms.append({
+                "id": classroom.id,
+                "teacher": client_for(classroom.class_teacher.user),
+                "student_ids": [student.id for student in students],
+                "students": [client_for(student.user)
+                             for student in students[:students_per_classroom]],
+                "exam_ids": list(Exam.objects.filter(classrooms=classroom).values_list(
+                    'id', flat=True)),
+                "unpaid_fee_ids": list(StudentFee.objects.filter(
+                    fee_structure__classroom=classroom, is_paid=False).order_by(
+                    'id').values_list('id', flat=True)[:unpaid_fees]),
+            })
+        return context
+
+
+def morning_roll_call(context, rng, iteration):
+    """Every class teacher opens today's register and submits it."""
+    today = datetime.date.today().isoformat()
+    for classroom in context.classrooms:
+        kwargs = {"classroom_id": classroom["id"]}
+        yield Step('mark-attendance', classroom["teacher"], kwargs=kwargs)
+        yield Step('mark-attendance', classroom["teacher"], 'POST', kwargs=kwargs, data={
+            "date": today,
+            "records": [{"student_id": student_id, "status": 'P' if rng.random() < 0.9 else 'A'}
+                        for student_id in classroom["student_ids"]],
+        })
+
+
+def result_day(context, rng, iteration):
+    """Students read their report cards; teachers and the admin read results."""
+    yield Step('exam-result-list-create', context.admin)
+    for classroom in context.classrooms:
+        for exam_id in classroom["exam_ids"]:
+            yield Step('class-result-summary', classroom["teacher"],
+                       kwargs={"classroom_id": classroom["id"]}, query=f'?exam_id={exam_id}')
+        for student in classroom["students"]:
+            yield Step('student-report-card', student)
+            yield Step('student-exam-results', student)
+
+
+def fee_counter(context, rng, iteration):
+    """The fee counter looks up dues, takes payments and checks collections."""
+    yield Step('fee-analytics-outstanding', context.admin)
+    for classroom in context.classrooms:
+        yield Step('fee-dues', context.admin, query=f'?classroom={classroom["id"]}')
+        fee_ids = classroom["unpaid_fee_ids"]
+        for fee_id in rng.sample(fee_ids, min(3, len(fee_ids))):
+            yield Step('fee-payment', context.admin, 'POST', data={
+                "fee": fee_id,
+                "amount_paid": '100.00',
+                "payment_mode": rng.choice(['cash', 'upi', 'card']),
+                "transaction_id": f"bench-{iteration}-{fee_id}-{rng.getrandbits(32)}",
+                "transaction_date": datetime.date.today().isoformat(),
+            })
+        for student in classroom["students"][:2]:
+            yield Step('student-fees', student)
+    yield Step('fee-payment', context.admin)
+    yield Step('fee-analytics-collections', context.admin, query='?group=day')
+
+
+SCENARIOS = {
+    'roll_call': morning_roll_call,
+    'result_day': result_day,
+    'fee_counter': fee_counter,
+}
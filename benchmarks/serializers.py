@@ -0,0 +1,107 @@
+"""
+Per-row cost of the read serializers used by the list GETs: the full
+ModelSerializer over model instances against the ValuesSerializer over the
+.values() rows of the same data.
+
+Run from the project root with the usual environment (.env) loaded:
+
+    python -m benchmarks.serializers --rows 10000 --repeat 5
+
+Rows are built in memory, so only serialization is timed, not the query
+or the instantiation of model objects by the ORM (which the values()
+path also avoids).
+"""
+import argparse
+import datetime
+import os
+import timeit
+from decimal import Decimal
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'school_erp_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from attendances.models import StudentAttendance  # noqa: E402
+from attendances.serializers import StudentAttendanceReadSerializer  # noqa: E402
+from exams.models import ExamResult  # noqa: E402
+from exams.serializers import ExamResultReadSerializer  # noqa: E402
+from fees.models import StudentFee  # noqa: E402
+from fees.serializers import StudentFeeReadSerializer  # noqa: E402
+from students.models import Student  # noqa: E402
+from students.serializers import StudentReadSerializer  # noqa: E402
+
+START = datetime.date(2025, 4, 1)
+
+
+def attendance(index):
+    return StudentAttendance(
+        id=index, student_id=index % 40 + 1, classroom_id=1,
+        date=START + datetime.timedelta(days=index // 40),
+        status='P' if index % 7 else 'A')
+
+
+def result(index):
+    return ExamResult(
+        id=index, exam_subject_id=index % 6 + 1, student_id=index % 40 + 1,
+        marks_obtained=float(35 + index % 65), remarks=None)
+
+
+def student_fee(index):
+    return StudentFee(
+        id=index, student_id=index % 40 + 1, fee_structure_id=1, month='April',
+        amount=Decimal('1500.00'), discount=Decimal('0.00'),
+        final_amount=Decimal('1500.00'), paid_total=Decimal('500.00'),
+        balance_due=Decimal('1000.00'), is_paid=False, due_date=START)
+
+
+def student(index):
+    return Student(
+        id=index, user_id=index + 100, classroom_id=1, roll_no=index % 40 + 1,
+        gender='F' if index % 2 else 'M', dob=datetime.date(2012, 1, 1),
+        enrollment_date=START)
+
+
+def as_values(serializer_class, instances):
+    """The rows .values() returns for `instances`."""
+    lookups = [lookup for lookup in serializer_class.values(
+        serializer_class.model_serializer.Meta.model.objects.none()).query.values_select]
+    return [{lookup: getattr(obj, obj._meta.get_field(lookup).attname)
+             for lookup in lookups} for obj in instances]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    cases = {
+        'attendance': (StudentAttendanceReadSerializer, attendance),
+        'exam results': (ExamResultReadSerializer, result),
+        'student fees': (StudentFeeReadSerializer, student_fee),
+        'students': (StudentReadSerializer, student),
+    }
+
+    print(f"{'serializer':<14}{'model ms':>10}{'values ms':>11}"
+          f"{'model us/row':>14}{'values us/row':>15}")
+    for name, (read_serializer, build) in cases.items():
+        instances = [build(index) for index in range(1, args.rows + 1)]
+        rows = as_values(read_serializer, instances)
+        model_serializer = read_serializer.model_serializer
+        assert model_serializer(instances[:50], many=True).data == \
+            read_serializer(rows[:50], many=True).data
+
+        before = timeit.timeit(
+            lambda: model_serializer(instances, many=True).data,
+            number=args.repeat) / args.repeat
+        after = timeit.timeit(
+            lambda: read_serializer(rows, many=True).data,
+            number=args.repeat) / args.repeat
+        print(f"{name:<14}{before * 1000:>10.1f}{after * 1000:>11.1f}"
+              f"{before * 1e6 / args.rows:>14.2f}{after * 1e6 / args.rows:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
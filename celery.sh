@@ -1,5 +1,11 @@
 #!/bin/bash
+# Pool processes write their metrics here; served on CELERY_METRICS_PORT.
+export PROMETHEUS_MULTIPROC_DIR=${CELERY_PROMETHEUS_MULTIPROC_DIR:-/tmp/school_erp_metrics/celery}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+export CELERY_METRICS_PORT=${CELERY_METRICS_PORT:-9808}
+
 celery -A school_erp_backend worker \
+--beat \
 --loglevel=info \
 --logfile=logs/celery_worker.log \
 --detach
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ClassroomsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'classrooms'
+
+    def ready(self):
+        from utils.tenant_cache import register_tenant_cache
+        from .models import Classroom
+
+        register_tenant_cache(Classroom, lambda obj: obj.school_id)
@@ -0,0 +1,88 @@
+import pandas as pd
+from utils.tenant_cache import invalidate_tenant_cache
+from .models import Classroom
+
+CHUNK_SIZE = 500
+MAX_LENGTH = 10
+KEY_COLUMNS = ['class_name', 'section']
+
+
+def _report(df, reason):
+    """Turns rejected rows into JSON-safe report entries."""
+    rows = df.assign(error=reason)[['row'] + KEY_COLUMNS + ['error']]
+    return rows.astype(object).where(rows.notna(), None).to_dict('records')
+
+
+def process_classroom_import(job):
+    """
+    Creates the classrooms listed in an ImportJob's Excel file.
+    Rows are normalised and matched against the school's existing
+    (class_name, section) pairs with a merge instead of per-row Python,
+    then inserted chunk by chunk while job progress is saved.
+    """
+    with job.file.open('rb') as excel_file:
+        df = pd.read_excel(excel_file, dtype=str)
+
+    missing = [col for col in KEY_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required column: {', '.join(missing)}")
+
+    # Spreadsheet row number (header is row 1) for the error report.
+    df = df[KEY_COLUMNS].assign(row=df.index + 2)
+    job.total_rows = len(df)
+
+    incomplete = df[KEY_COLUMNS].isna().any(axis=1)
+    errors = _report(df[incomplete], "class_name and section are required.")
+    df = df[~incomplete].copy()
+
+    df["class_name"] = df["class_name"].astype(str).str.strip().str.lower()
+    df["section"] = df["section"].astype(str).str.strip().str.capitalize()
+
+    too_long = (df[KEY_COLUMNS].apply(lambda col: col.str.len()) > MAX_LENGTH).any(axis=1)
+    errors += _report(df[too_long], f"Values must be at most {MAX_LENGTH} characters.")
+    df = df[~too_long]
+
+    duplicated = df.duplicated(subset=KEY_COLUMNS)
+    skipped = _report(df[duplicated], "Duplicate row in file.")
+    df = df[~duplicated]
+
+    existing = pd.DataFrame(
+        list(Classroom.objects.filter(school_id=job.school_id)
+             .values_list("class_name", "section")),
+        columns=KEY_COLUMNS,
+    )
+    existing["class_name"] = existing["class_name"].str.lower()
+    existing["section"] = existing["section"].fillna('').str.capitalize()
+    existing = existing.drop_duplicates()
+
+    job.processed_rows = job.total_rows - len(df)
+    job.save(update_fields=['total_rows', 'processed_rows', 'modified'])
+
+    created = 0
+    for start in range(0, len(df), CHUNK_SIZE):
+        chunk = df.iloc[start:start + CHUNK_SIZE].merge(
+            existing, on=KEY_COLUMNS, how='left', indicator=True)
+        is_new = chunk["_merge"] == 'left_only'
+
+        skipped += _report(chunk[~is_new], "Classroom already exists.")
+        new_rows = chunk.loc[is_new, KEY_COLUMNS]
+        Classroom.objects.bulk_create(
+            [
+                Classroom(school_id=job.school_id,
+                          class_name=class_name, section=section)
+                for class_name, section in new_rows.itertuples(index=False)
+            ],
+            ignore_conflicts=True,
+        )
+        created += len(new_rows)
+
+        job.processed_rows += len(chunk)
+        job.created_count = created
+        job.save(update_fields=['processed_rows', 'created_count', 'modified'])
+
+    if created:
+        invalidate_tenant_cache(job.school_id, Classroom)
+
+    job.skipped_count = len(skipped)
+    job.error_count = len(errors)
+    job.errors = errors + skipped
@@ -1,6 +1,7 @@
 from django.db import models
 from schools.models import School
 from teachers.models import Teacher
+from schools.tenancy import TenantManager
 
 # Create your models here.
 
@@ -13,6 +14,9 @@ class Classroom(models.Model):
     class_teacher = models.OneToOneField(
         Teacher, on_delete=models.SET_NULL, null=True, blank=True, related_name='classrooms_as_teacher')
 
+    objects = TenantManager()
+    school_lookup = 'school'
+
     class Meta:
         unique_together = ('school', 'class_name', 'section')
 
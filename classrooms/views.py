@@ -2,7 +2,6 @@ from rest_framework import generics, permissions
 from .models import Classroom
 from .serializers import ClassroomSerializer
 from rest_framework.views import APIView
-import pandas as pd
 from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework import status
@@ -13,16 +12,18 @@ from school_erp_backend.permissions import IsSchoolAdmin
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from utils.restful_response import send_response
-from utils.data_constants import ResponseMessages
+from utils.tenant_cache import TenantCachedListMixin
+from imports.views import queue_import_job
 
 
-class ClassroomListCreateView(generics.ListCreateAPIView):
+class ClassroomListCreateView(TenantCachedListMixin, generics.ListCreateAPIView):
     queryset = Classroom.objects.all()
     serializer_class = ClassroomSerializer
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+    cache_model = Classroom
 
     def get_queryset(self):
-        return Classroom.objects.filter(school=self.request.user.school)
+        return Classroom.objects.for_school(self.request.user.school_id)
 
     def perform_create(self, serializer):
         serializer.save(school=self.request.user.school)
@@ -52,7 +53,7 @@ class ClassroomDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get_queryset(self):
-        return Classroom.objects.filter(school=self.request.user.school)
+        return Classroom.objects.for_school(self.request.user.school_id)
 
     def perform_update(self, serializer):
         serializer.save(school=self.request.user.school)
@@ -82,7 +83,7 @@ class ClassroomBulkUploadAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     @swagger_auto_schema(
-        operation_description="Upload Excel file to bulk create classrooms.",
+        operation_description="Upload Excel file to bulk create classrooms in the background.",
         manual_parameters=[
             openapi.Parameter(
                 name='file',
@@ -92,7 +93,7 @@ class ClassroomBulkUploadAPIView(APIView):
                 description="Excel file (.xlsx) with class_name, section, class_teacher",
             )
         ],
-        responses={201: "Successfully created classrooms", 400: "Bad Request"},
+        responses={202: "Upload queued; poll the returned import job", 400: "Bad Request"},
     )
     def post(self, request, *args, **kwargs):
         excel_file = request.FILES.get('file')
@@ -102,21 +103,11 @@ class ClassroomBulkUploadAPIView(APIView):
                 {'error': 'No file uploaded.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        try:
-            df = pd.read_excel(excel_file)
-        except Exception as e:
+        if not excel_file.name.lower().endswith('.xlsx'):
             return Response(
-                {'error': 'Invalid Excel format.', 'details': str(e)},
+                {'error': 'Invalid Excel format; upload a .xlsx file.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-
-        required_cols = ['class_name', 'section']
-        for col in required_cols:
-            if col not in df.columns:
-                return Response(
-                    {'error': f"Missing required column: {col}"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
         school = getattr(request.user, 'school', None)
         if not school:
             return Response(
@@ -124,45 +115,4 @@ class ClassroomBulkUploadAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        df = df.dropna(subset=['class_name', 'section'])
-        df["class_name"] = df["class_name"].astype(str).str.strip().str.lower()
-        df["section"] = df["section"].astype(str).str.strip().str.capitalize()
-
-        df.drop_duplicates(subset=["class_name", "section"], inplace=True)
-
-        class_names = df["class_name"].unique()
-        sections = df["section"].unique()
-
-        existing = Classroom.objects.filter(
-            school=school,
-            class_name__in=class_names,
-            section__in=sections,
-        ).values_list("class_name", "section")
-
-        existing_set = set((class_name.lower(), section.capitalize())
-                           for class_name, section in existing)
-
-        df["exists"] = df.apply(
-            lambda row: (row["class_name"], row["section"]) in existing_set,
-            axis=1
-        )
-        df_new = df[~df["exists"]]
-
-        classroom_objects = [
-            Classroom(
-                school=school,
-                class_name=row["class_name"],
-                section=row["section"],
-            )
-            for _, row in df_new.iterrows()
-        ]
-        if classroom_objects:
-            Classroom.objects.bulk_create(classroom_objects)
-
-        return send_response(
-            data={
-                "created": df_new[["class_name", "section"]].values.tolist(),
-                "skipped": df[df["exists"]][["class_name", "section"]].values.tolist(),
-            },
-            message=ResponseMessages.DATA_FETCH_SUCCESS,
-        )
+        return queue_import_job(request, 'classrooms', excel_file)
@@ -61,7 +61,7 @@ class ExamResultAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
             return qs
-        return qs.filter(student__user__school=request.user.school)
+        return qs.filter(school=request.user.school)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         if not request.user.is_superuser:
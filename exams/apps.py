@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ExamsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'exams'
+
+    def ready(self):
+        from utils.tenant_cache import register_tenant_cache, register_tenant_cache_m2m
+        from .models import Exam, ExamSubject
+
+        register_tenant_cache(
+            Exam, lambda obj: set(obj.classrooms.values_list('school_id', flat=True)))
+        register_tenant_cache_m2m(Exam, 'classrooms')
+        register_tenant_cache(
+            ExamSubject, lambda obj: obj.classroom.school_id)
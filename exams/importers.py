@@ -0,0 +1,50 @@
+from students.models import Student
+from utils.importers import (
+    BaseImporter, Column, ForeignKeyColumn, parse_float
+)
+from .models import ExamResult, ExamSubject
+from .services import save_exam_results
+
+
+class ExamResultImporter(BaseImporter):
+    """Upserts marks per (student, exam_subject); may span many subjects."""
+
+    columns = [
+        ForeignKeyColumn('exam_subject_id', field='exam_subject'),
+        ForeignKeyColumn('student_id', field='student'),
+        Column('marks_obtained', parser=parse_float),
+        Column('remarks', required=False),
+    ]
+
+    def get_exam_subject_queryset(self):
+        return ExamSubject.objects.filter(classroom__school=self.school)
+
+    def get_student_queryset(self):
+        return Student.objects.filter(classroom__school=self.school)
+
+    def validate_batch(self, rows):
+        seen = set()
+        for row in rows:
+            exam_subject = row.data['exam_subject']
+            student = row.data['student']
+            key = (student.id, exam_subject.id)
+            if student.classroom_id != exam_subject.classroom_id:
+                row.reject("Student is not in the exam subject's classroom.")
+            elif not 0 <= row.data['marks_obtained'] <= exam_subject.total_marks:
+                row.reject(
+                    f"Marks must be between 0 and {exam_subject.total_marks}.")
+            elif key in seen:
+                row.reject("Duplicate row for student and exam subject.")
+            seen.add(key)
+
+    def save_batch(self, rows):
+        save_exam_results([
+            ExamResult(
+                exam_subject=row.data['exam_subject'],
+                student=row.data['student'],
+                marks_obtained=row.data['marks_obtained'],
+                remarks=row.data['remarks'],
+            )
+            for row in rows
+        ])
+        self.created += len(rows)
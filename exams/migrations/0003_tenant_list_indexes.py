@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0002_examsubject_exam_date'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='examresult',
+            index=models.Index(fields=['exam_subject', 'student'], name='exams_result_subject_idx'),
+        ),
+    ]
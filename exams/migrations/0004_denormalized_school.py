@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+from schools.tenancy import backfill_school
+
+
+def backfill(apps, schema_editor):
+    backfill_school(apps.get_model('exams', 'ExamResult'), 'exam_subject__classroom__school')
+
+
+class Migration(migrations.Migration):
+    # Every backfill batch commits on its own, so rows are not locked for
+    # the length of the whole backfill.
+    atomic = False
+
+    dependencies = [
+        ('exams', '0003_tenant_list_indexes'),
+        ('schools', '0004_alter_school_options_alter_school_unique_together'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examresult',
+            name='school',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='schools.school'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='examresult',
+            index=models.Index(fields=['school', 'id'], name='exams_result_school_idx'),
+        ),
+    ]
@@ -3,6 +3,7 @@ from classrooms.models import Classroom
 from subjects.models import Subject
 from students.models import Student
 from schools.models import School
+from schools.tenancy import SchoolScopedModel, TenantManager
 
 # Create your models here.
 
@@ -10,6 +11,9 @@ class Exam(models.Model):
     title = models.CharField(max_length=100)
     classrooms = models.ManyToManyField(Classroom, related_name='exams')
 
+    objects = TenantManager()
+    school_lookup = 'classrooms__school'
+
     class Meta:
         unique_together = ['title']
 
@@ -23,6 +27,9 @@ class ExamSubject(models.Model):
     total_marks = models.PositiveIntegerField(default=100)
     exam_date = models.DateField(null=True, blank=True)
 
+    objects = TenantManager()
+    school_lookup = 'classroom__school'
+
     class Meta:
         unique_together = ['exam', 'subject', 'classroom']
 
@@ -32,7 +39,9 @@ class ExamSubject(models.Model):
     def __str__(self):
         return f"{self.subject} - {self.exam} - {self.classroom}"
 
-class ExamResult(models.Model):
+class ExamResult(SchoolScopedModel):
+    school_path = 'exam_subject__classroom__school'
+
     exam_subject = models.ForeignKey(ExamSubject, on_delete=models.CASCADE)
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     marks_obtained = models.FloatField()
@@ -40,6 +49,11 @@ class ExamResult(models.Model):
 
     class Meta:
         unique_together = ('student', 'exam_subject')
+        indexes = [
+            models.Index(fields=['exam_subject', 'student'],
+                         name='exams_result_subject_idx'),
+            models.Index(fields=['school', 'id'], name='exams_result_school_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student} - {self.exam_subject}"
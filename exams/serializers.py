@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Exam, ExamResult, ExamSubject
 from classrooms.models import Classroom
+from utils.serializers import ValuesSerializer
 
 
 class ExamSerializer(serializers.ModelSerializer):
@@ -26,7 +27,7 @@ class ExamSubjectSerializer(serializers.ModelSerializer):
 class ExamResultSerializer(serializers.ModelSerializer):
     class Meta:
         model = ExamResult
-        fields = "__all__"
+        exclude = ("school",)
 
     def validate(self, data):
         data = super().validate(data)
@@ -48,3 +49,7 @@ class ExamResultSerializer(serializers.ModelSerializer):
             )
 
         return data
+
+
+class ExamResultReadSerializer(ValuesSerializer):
+    model_serializer = ExamResultSerializer
@@ -0,0 +1,250 @@
+from django.db import transaction
+from django.db.models import Avg, F, Max, Q, Sum, Window
+from django.db.models.functions import Rank
+from students.models import Student
+from utils.importers import ImportRowError, parse_int
+from .models import ExamResult
+
+
+def class_exam_totals(classroom_id):
+    """
+    Per-exam total marks of every student in a classroom, ranked within
+    each exam (highest total first, ties share a rank).
+    One grouped query; rows are {exam_id, student_id, total, rank}.
+    """
+    return (
+        ExamResult.objects
+        .filter(exam_subject__classroom_id=classroom_id)
+        .values('student_id', exam_id=F('exam_subject__exam_id'))
+        .annotate(total=Sum('marks_obtained'))
+        .annotate(rank=Window(
+            expression=Rank(),
+            partition_by=F('exam_id'),
+            order_by=F('total').desc(),
+        ))
+    )
+
+
+def build_report_card(student):
+    """
+    Builds the full report card of a student: one entry per exam with its
+    subject marks, totals, percentage and rank in class.
+    Uses one query for the subject rows and one for class ranks, no matter
+    how many exams or subjects the student has.
+    """
+    rows = (
+        ExamResult.objects
+        .filter(student=student)
+        .order_by('exam_subject__exam_id', 'exam_subject__exam_date',
+                  'exam_subject__subject__name')
+        .values(
+            'remarks',
+            exam_id=F('exam_subject__exam_id'),
+            exam=F('exam_subject__exam__title'),
+            subject=F('exam_subject__subject__name'),
+            marks=F('marks_obtained'),
+            total=F('exam_subject__total_marks'),
+            exam_date=F('exam_subject__exam_date'),
+        )
+    )
+
+    ranks = {}
+    if student.classroom_id:
+        ranks = {
+            row['exam_id']: row['rank']
+            for row in class_exam_totals(student.classroom_id)
+            if row['student_id'] == student.id
+        }
+
+    report = {}
+    for row in rows:
+        card = report.get(row['exam_id'])
+        if card is None:
+            card = report[row['exam_id']] = {
+                "exam_id": row['exam_id'],
+                "exam": row['exam'],
+                "subjects": [],
+                "marks_obtained": 0,
+                "total_marks": 0,
+                "percentage": None,
+                "rank": ranks.get(row['exam_id']),
+            }
+        card["subjects"].append({
+            "subject": row['subject'],
+            "marks": row['marks'],
+            "total": row['total'],
+            "exam_date": row['exam_date'],
+            "remarks": row['remarks'],
+        })
+        card["marks_obtained"] += row['marks']
+        card["total_marks"] += row['total']
+
+    for card in report.values():
+        if card["total_marks"]:
+            card["percentage"] = round(
+                card["marks_obtained"] * 100 / card["total_marks"], 2)
+
+    return list(report.values())
+
+
+def class_result_summary(classroom_id, exam_id=None):
+    """
+    Result summary of a whole classroom, optionally limited to one exam.
+    Every student gets total/average/highest marks, a per-subject breakdown
+    and a rank in class; the class average of totals is returned alongside.
+    Runs two grouped queries regardless of the class size.
+    """
+    result_filter = Q()
+    if exam_id:
+        result_filter = Q(examresult__exam_subject__exam_id=exam_id)
+
+    students = (
+        Student.objects
+        .filter(classroom_id=classroom_id)
+        .values('id', name=F('user__name'))
+        .annotate(
+            total_marks=Sum('examresult__marks_obtained', filter=result_filter),
+            average_marks=Avg('examresult__marks_obtained', filter=result_filter),
+            highest_marks=Max('examresult__marks_obtained', filter=result_filter),
+        )
+        .annotate(rank=Window(
+            expression=Rank(),
+            order_by=F('total_marks').desc(nulls_last=True),
+        ))
+        .order_by('rank', 'id')
+    )
+
+    subject_rows = ExamResult.objects.filter(
+        student__classroom_id=classroom_id)
+    if exam_id:
+        subject_rows = subject_rows.filter(exam_subject__exam_id=exam_id)
+    subject_rows = (
+        subject_rows
+        .values('student', 'exam_subject__subject__name')
+        .annotate(marks=Sum('marks_obtained'))
+        .order_by('student', 'exam_subject__subject__name')
+    )
+
+    subjects_by_student = {}
+    for row in subject_rows:
+        subjects_by_student.setdefault(row['student'], []).append({
+            "subject": row['exam_subject__subject__name'],
+            "marks": row['marks'],
+        })
+
+    data = []
+    totals = []
+    for row in students:
+        if row['total_marks'] is not None:
+            totals.append(row['total_marks'])
+        data.append({
+            "student_id": row['id'],
+            "student_name": row['name'],
+            "total_marks": row['total_marks'] or 0,
+            "average_marks": row['average_marks'],
+            "highest_marks": row['highest_marks'],
+            "rank": row['rank'] if row['total_marks'] is not None else None,
+            "subjects": subjects_by_student.get(row['id'], []),
+        })
+
+    return {
+        "class_average": round(sum(totals) / len(totals), 2) if totals else None,
+        "students": data,
+    }
+
+
+def save_exam_results(results):
+    """
+    Upserts ExamResult instances on (student, exam_subject) with at most two
+    bulk statements. Rows without remarks keep the remarks already stored.
+    """
+    with_remarks = [result for result in results if result.remarks is not None]
+    marks_only = [result for result in results if result.remarks is None]
+    with transaction.atomic():
+        for batch, update_fields in (
+            (with_remarks, ['marks_obtained', 'remarks']),
+            (marks_only, ['marks_obtained']),
+        ):
+            if batch:
+                ExamResult.objects.bulk_create(
+                    batch,
+                    update_conflicts=True,
+                    unique_fields=['student', 'exam_subject'],
+                    update_fields=update_fields,
+                )
+
+
+def _student_id(entry, from_file):
+    """
+    The entry's student id, or None unless it is a whole number. JSON ids
+    must be ints (not bools or floats); file cells go through parse_int.
+    """
+    if not isinstance(entry, dict):
+        return None
+    value = entry.get('student_id')
+    if from_file:
+        try:
+            return parse_int(value)
+        except ImportRowError:
+            return None
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def upsert_exam_marks(exam_subject, entries, from_file=False):
+    """
+    Validates and stores the marks of many students for one exam subject.
+    Students are checked against the exam subject's classroom in one query,
+    marks are checked against `total_marks`, and all valid rows are written
+    with a bulk upsert on (student, exam_subject) inside one transaction.
+    Arguments:
+    exam_subject: ExamSubject the marks belong to.
+    entries: Iterable of {"student_id", "marks_obtained", "remarks"(optional)}.
+    from_file: Entries are rows of an uploaded file, whose cells are text
+        (csv) or numbers (xlsx), rather than a JSON body.
+    Returns:
+    A dict with accepted/rejected counts and per-row rejection reasons.
+    """
+    entries = list(entries)
+    student_ids = [_student_id(entry, from_file) for entry in entries]
+    requested_ids = {student_id for student_id in student_ids if student_id is not None}
+    valid_ids = set(
+        Student.objects.filter(
+            classroom_id=exam_subject.classroom_id, id__in=requested_ids
+        ).values_list('id', flat=True)
+    )
+
+    results = {}
+    errors = []
+    for index, (entry, student_id) in enumerate(zip(entries, student_ids)):
+        try:
+            if student_id is None:
+                raise ValueError(entry)
+            marks = float(entry.get('marks_obtained'))
+        except (TypeError, ValueError):
+            errors.append({"row": index, "error": "Invalid student_id or marks_obtained."})
+            continue
+
+        if student_id not in valid_ids:
+            errors.append({"row": index, "student_id": student_id,
+                           "error": "Student not in this exam subject's classroom."})
+        elif not 0 <= marks <= exam_subject.total_marks:
+            errors.append({"row": index, "student_id": student_id,
+                           "error": f"Marks must be between 0 and {exam_subject.total_marks}."})
+        elif student_id in results:
+            errors.append({"row": index, "student_id": student_id,
+                           "error": "Duplicate entry for student."})
+        else:
+            results[student_id] = ExamResult(
+                exam_subject=exam_subject,
+                student_id=student_id,
+                marks_obtained=marks,
+                remarks=entry.get('remarks') or None,
+            )
+
+    save_exam_results(list(results.values()))
+
+    return {
+        "accepted": len(results),
+        "rejected": len(errors),
+        "errors": errors,
+    }
@@ -1,3 +1,43 @@
 from django.test import TestCase
+from exams.models import ExamResult
+from exams.services import upsert_exam_marks
+from utils.testing import (create_classroom, create_exam, create_school, create_student,
+                           create_subject)
 
-# Create your tests here.
+
+class UpsertExamMarksTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        school = create_school()
+        classroom = create_classroom(school)
+        cls.students = [create_student(classroom, roll_no) for roll_no in (1, 2)]
+        subject, _ = create_subject(classroom)
+        cls.exam_subject = create_exam(classroom, subject)[1]
+
+    def marks(self):
+        return dict(ExamResult.objects.values_list('student_id', 'marks_obtained'))
+
+    def test_json_ids_must_be_integers(self):
+        first, second = (student.id for student in self.students)
+        result = upsert_exam_marks(self.exam_subject, [
+            {"student_id": first, "marks_obtained": 70},
+            {"student_id": second + 0.7, "marks_obtained": 80},
+            {"student_id": True, "marks_obtained": 80},
+            {"student_id": str(second), "marks_obtained": 80},
+            {"student_id": [second], "marks_obtained": 80},
+            "not a row",
+        ])
+        self.assertEqual((result["accepted"], result["rejected"]), (1, 5))
+        self.assertEqual(self.marks(), {first: 70})
+
+    def test_file_cells_go_through_parse_int(self):
+        first, second = (str(student.id) for student in self.students)
+        result = upsert_exam_marks(self.exam_subject, [
+            {"student_id": first, "marks_obtained": "55"},
+            {"student_id": f"{second}.0", "marks_obtained": "65"},
+            {"student_id": f"{second}.7", "marks_obtained": "75"},
+            {"student_id": None, "marks_obtained": "75"},
+        ], from_file=True)
+        self.assertEqual((result["accepted"], result["rejected"]), (2, 2))
+        self.assertEqual(self.marks(), {int(first): 55, int(second): 65})
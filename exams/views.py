@@ -1,16 +1,18 @@
-from django.forms import ValidationError
 from django.shortcuts import render
 from rest_framework.views import APIView
 from utils.restful_response import send_response
 from rest_framework import status
 from .models import Exam, ExamResult, ExamSubject
-from .serializers import ExamSerializer, ExamSubjectSerializer, ExamResultSerializer
+from .serializers import (
+    ExamSerializer, ExamSubjectSerializer, ExamResultSerializer, ExamResultReadSerializer
+)
 from drf_yasg.utils import swagger_auto_schema
 from utils.data_constants import ResponseMessages
 from rest_framework.exceptions import NotFound
 from classrooms.models import Classroom
 from rest_framework.permissions import IsAuthenticated
 from school_erp_backend.permissions import IsSchoolAdmin
+from utils.pagination import paginate_or_stream
 # Create your views here.
 
 
@@ -18,12 +20,11 @@ class ExamListCreateAPIView(APIView):
     permission_classes = [IsAuthenticated, IsSchoolAdmin]
 
     def get(self, request):
-        school = request.user.school
         title = request.query_params.get('title')
 
-        exams = Exam.objects.filter(classrooms__school=school).distinct()
+        exams = Exam.objects.for_school(request.user.school_id)
         if title:
-            exams = exams.filter(title__icontains=title).distinct()
+            exams = exams.filter(title__icontains=title)
 
         serializer = ExamSerializer(exams, many=True)
         return send_response(
@@ -62,18 +63,14 @@ class ExamListCreateAPIView(APIView):
 class ExamRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [IsAuthenticated, IsSchoolAdmin]
 
-    def get_object(self, pk, school):
-        try:
-            return Exam.objects.filter(pk=pk, classrooms__school=school).distinct().get()
-        except Exam.DoesNotExist:
+    def get_object(self, pk, school_id):
+        exam = Exam.objects.for_school(school_id).filter(pk=pk).first()
+        if exam is None:
             raise NotFound("Exam not found.")
-        except Exam.MultipleObjectsReturned:
-            raise ValidationError(
-                "Multiple exam entries found. Data integrity issue.")
+        return exam
 
     def get(self, request, pk):
-        school = request.user.school
-        exam = self.get_object(pk, school)
+        exam = self.get_object(pk, request.user.school_id)
         serializer = ExamSerializer(exam)
         return send_response(
             data=serializer.data,
@@ -82,7 +79,7 @@ class ExamRetrieveUpdateDeleteAPIView(APIView):
         )
 
     def put(self, request, pk):
-        exam = self.get_object(pk, request.user.school)
+        exam = self.get_object(pk, request.user.school_id)
         classroom_ids = request.data.get("classrooms", [])
 
         if classroom_ids:
@@ -110,7 +107,7 @@ class ExamRetrieveUpdateDeleteAPIView(APIView):
         )
 
     def delete(self, request, pk):
-        exam = self.get_object(pk, request.user.school)
+        exam = self.get_object(pk, request.user.school_id)
         exam.delete()
         return send_response(
             message=ResponseMessages.DATA_DELETED_SUCCESS,
@@ -122,22 +119,16 @@ class ExamSubjectListCreateAPIView(APIView):
     permission_classes = [IsAuthenticated, IsSchoolAdmin]
 
     def get(self, request):
-        school = request.user.school
         exam_id = request.query_params.get('exam_id')
         classroom_id = request.query_params.get('classroom_id')
 
-        filters = {
-            'exam__classrooms__school': school,
-        }
-
+        exam_subjects = ExamSubject.objects.for_school(request.user.school_id)
         if exam_id:
-            filters['exam_id'] = exam_id
+            exam_subjects = exam_subjects.filter(exam_id=exam_id)
 
         if classroom_id:
-            filters['classroom_id'] = classroom_id
-            filters['exam__classrooms__id'] = classroom_id
-
-        exam_subjects = ExamSubject.objects.filter(**filters).distinct()
+            exam_subjects = exam_subjects.filter(
+                classroom_id=classroom_id, exam__classrooms__id=classroom_id)
 
         serializer = ExamSubjectSerializer(exam_subjects, many=True)
         return send_response(
@@ -197,18 +188,16 @@ class ExamSubjectListCreateAPIView(APIView):
 class ExamSubjectRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [IsAuthenticated, IsSchoolAdmin]
 
-    def get_object(self, pk, school):
-        try:
-            exam_subject = ExamSubject.objects.get(pk=pk)
-            if not exam_subject.exam.classrooms.filter(school=school).exists():
-                raise ValidationError(
-                    "You do not have permission to access this exam subject.")
-            return exam_subject
-        except ExamSubject.DoesNotExist:
+    def get_object(self, pk, school_id):
+        # The cache invalidation on save and delete reads classroom.school_id.
+        exam_subject = ExamSubject.objects.select_related('classroom').for_school(
+            school_id).filter(pk=pk).first()
+        if exam_subject is None:
             raise NotFound("Exam Subject not found.")
+        return exam_subject
 
     def get(self, request, pk):
-        exam_subject = self.get_object(pk, request.user.school)
+        exam_subject = self.get_object(pk, request.user.school_id)
         serializer = ExamSubjectSerializer(exam_subject)
         return send_response(
             data=serializer.data,
@@ -217,7 +206,7 @@ class ExamSubjectRetrieveUpdateDeleteAPIView(APIView):
         )
 
     def put(self, request, pk):
-        exam_subject = self.get_object(pk, request.user.school)
+        exam_subject = self.get_object(pk, request.user.school_id)
         exam_id = request.data.get("exam")
 
         if exam_id:
@@ -251,7 +240,7 @@ class ExamSubjectRetrieveUpdateDeleteAPIView(APIView):
         )
 
     def delete(self, request, pk):
-        exam_subject = self.get_object(pk, request.user.school)
+        exam_subject = self.get_object(pk, request.user.school_id)
         exam_subject.delete()
         return send_response(
             message=ResponseMessages.DATA_DELETED_SUCCESS,
@@ -263,15 +252,8 @@ class ExamResultListCreateAPIView(APIView):
     permission_classes = [IsAuthenticated, IsSchoolAdmin]
 
     def get(self, request):
-        school = request.user.school
-        exam_results = ExamResult.objects.filter(
-            exam_subject__exam__classrooms__school=school).distinct()
-        serializer = ExamResultSerializer(exam_results, many=True)
-        return send_response(
-            data=serializer.data,
-            message=ResponseMessages.DATA_FETCH_SUCCESS,
-            status_code=status.HTTP_200_OK
-        )
+        exam_results = ExamResult.objects.for_school(request.user.school_id)
+        return paginate_or_stream(request, exam_results, ExamResultReadSerializer)
 
     @swagger_auto_schema(
         request_body=ExamResultSerializer,
@@ -314,11 +296,8 @@ class ExamResultListCreateAPIView(APIView):
 class ExamResultRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [IsAuthenticated, IsSchoolAdmin]
 
-    def get_object(self, pk, school):
-        result = ExamResult.objects.filter(
-            id=pk,
-            exam_subject__exam__classrooms__school=school
-        ).first()
+    def get_object(self, pk, school_id):
+        result = ExamResult.objects.for_school(school_id).filter(pk=pk).first()
 
         if not result:
             raise NotFound(detail="Exam Result not found.")
@@ -326,8 +305,7 @@ class ExamResultRetrieveUpdateDeleteAPIView(APIView):
         return result
 
     def get(self, request, pk):
-        school = request.user.school
-        result = self.get_object(pk, school)
+        result = self.get_object(pk, request.user.school_id)
         if not result:
             raise NotFound("Exam Result not found.")
         serializer = ExamResultSerializer(result)
@@ -338,7 +316,7 @@ class ExamResultRetrieveUpdateDeleteAPIView(APIView):
         )
 
     def put(self, request, pk):
-        result = self.get_object(pk, request.user.school)
+        result = self.get_object(pk, request.user.school_id)
         exam_subject_id = request.data.get("exam_subject")
         student_id = request.data.get("student")
 
@@ -388,7 +366,7 @@ class ExamResultRetrieveUpdateDeleteAPIView(APIView):
         )
 
     def delete(self, request, pk):
-        result = self.get_object(pk, request.user.school)
+        result = self.get_object(pk, request.user.school_id)
         result.delete()
         return send_response(
             message=ResponseMessages.DATA_DELETED_SUCCESS,
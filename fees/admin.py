@@ -48,9 +48,10 @@ class FeeStructureAdmin(admin.ModelAdmin):
 
 @admin.register(StudentFee)
 class StudentFeeAdmin(admin.ModelAdmin):
-    list_display = ('student', 'fee_structure', 'month',
-                    'final_amount', 'is_paid', 'paid_date')
+    list_display = ('student', 'fee_structure', 'month', 'final_amount',
+                    'paid_total', 'balance_due', 'is_paid', 'paid_date')
     list_filter = ('is_paid', 'month')
+    readonly_fields = ('paid_total', 'balance_due', 'is_paid', 'due_date')
     search_fields = ('student__user__first_name',
                      'fee_structure__category__name')
 
@@ -58,7 +59,7 @@ class StudentFeeAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
             return qs
-        return qs.filter(student__classroom__school=request.user.school)
+        return qs.filter(school=request.user.school)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         school = request.user.school
@@ -83,7 +84,7 @@ class PaymentAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
             return qs
-        return qs.filter(fee__student__classroom__school=request.user.school)
+        return qs.filter(school=request.user.school)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         school = request.user.school
@@ -0,0 +1,170 @@
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncMonth
+from .models import FeeCollectionDaily, FeeCollectionDirtyDay, Payment, StudentFee
+
+COLLECTION_GROUPS = ('day', 'month', 'payment_mode')
+OUTSTANDING_GROUPS = ('classroom', 'category')
+
+
+def mark_collection_days_dirty(days):
+    """Queues days for the next rollup refresh (see FeeCollectionDirtyDay)."""
+    FeeCollectionDirtyDay.objects.bulk_create(
+        [FeeCollectionDirtyDay(date=day) for day in days if day is not None])
+
+
+def refresh_fee_collection_rollups(since=None):
+    """
+    Folds payments into FeeCollectionDaily, recomputing each affected day
+    in full. Affected are the days marked dirty by payment writes, plus:
+    by default the days that received a payment with an id above the
+    watermark (highest last_payment_id in the table), which covers bulk
+    inserts that send no signals; with `since`, every day from that date
+    on, which also catches payments that committed after a higher id had
+    been folded in.
+    Payments without a transaction_date are not part of the rollups.
+    Returns:
+    A dict with the number of days recomputed and rollup rows written.
+    """
+    payments = Payment.objects.filter(transaction_date__isnull=False)
+    stale = FeeCollectionDaily.objects.all()
+    dirty = list(FeeCollectionDirtyDay.objects.values_list('id', 'date'))
+    days = {day for _, day in dirty}
+    if since is None:
+        watermark = FeeCollectionDaily.objects.aggregate(
+            watermark=Max('last_payment_id'))['watermark'] or 0
+        days |= set(payments.filter(id__gt=watermark).order_by().values_list(
+            'transaction_date', flat=True).distinct())
+        if not days:
+            return {"days": 0, "rows": 0}
+        payments = payments.filter(transaction_date__in=days)
+        stale = stale.filter(date__in=days)
+    else:
+        days |= set(payments.filter(transaction_date__gte=since).order_by().values_list(
+            'transaction_date', flat=True).distinct())
+        payments = payments.filter(Q(transaction_date__gte=since) | Q(transaction_date__in=days))
+        stale = stale.filter(Q(date__gte=since) | Q(date__in=days))
+
+    # The school comes from the fee structure's classroom: Payment.school is
+    # NULL when the student has no classroom, FeeCollectionDaily.school is not.
+    buckets = payments.order_by().values(
+        'transaction_date', 'payment_mode',
+        'fee__fee_structure__classroom__school_id',
+        'fee__fee_structure__classroom_id',
+        'fee__fee_structure__category_id',
+    ).annotate(
+        amount=Sum('amount_paid'), payments=Count('id'), last_id=Max('id'))
+
+    rows = [
+        FeeCollectionDaily(
+            school_id=bucket['fee__fee_structure__classroom__school_id'],
+            date=bucket['transaction_date'],
+            classroom_id=bucket['fee__fee_structure__classroom_id'],
+            category_id=bucket['fee__fee_structure__category_id'],
+            payment_mode=bucket['payment_mode'],
+            amount_collected=bucket['amount'],
+            payment_count=bucket['payments'],
+            last_payment_id=bucket['last_id'],
+        )
+        for bucket in buckets
+    ]
+
+    with transaction.atomic():
+        stale.delete()
+        FeeCollectionDaily.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['school', 'date', 'classroom', 'category', 'payment_mode'],
+            update_fields=['amount_collected', 'payment_count', 'last_payment_id'],
+        )
+        # Only the marks read above: later ones wait for the next refresh.
+        FeeCollectionDirtyDay.objects.filter(id__in=[pk for pk, _ in dirty]).delete()
+    return {"days": len(days), "rows": len(rows)}
+
+
+def _for_school(queryset, school_id, lookup):
+    if school_id is None:
+        return queryset
+    return queryset.filter(**{lookup: school_id})
+
+
+def collections_report(school_id, group='day', date_from=None, date_to=None):
+    """Amount collected and number of payments per day, month or payment mode."""
+    rollups = _for_school(FeeCollectionDaily.objects.all(), school_id, 'school_id')
+    if date_from:
+        rollups = rollups.filter(date__gte=date_from)
+    if date_to:
+        rollups = rollups.filter(date__lte=date_to)
+
+    if group == 'month':
+        rollups = rollups.annotate(period=TruncMonth('date')).values('period')
+        key = 'period'
+    elif group == 'payment_mode':
+        rollups = rollups.values('payment_mode')
+        key = 'payment_mode'
+    else:
+        rollups = rollups.values('date')
+        key = 'date'
+
+    return list(rollups.annotate(
+        amount_collected=Sum('amount_collected'),
+        payment_count=Sum('payment_count'),
+    ).order_by(key))
+
+
+def outstanding_report(school_id, group='classroom'):
+    """Outstanding balance per classroom or fee category, from the fee ledger."""
+    fees = _for_school(StudentFee.objects.filter(balance_due__gt=0), school_id, 'school_id')
+
+    if group == 'category':
+        fees = fees.values(
+            category_id=F('fee_structure__category_id'),
+            category=F('fee_structure__category__name'),
+        )
+        ordering = 'category'
+    else:
+        fees = fees.values(
+            classroom_id=F('fee_structure__classroom_id'),
+            class_name=F('fee_structure__classroom__class_name'),
+            section=F('fee_structure__classroom__section'),
+        )
+        ordering = 'class_name'
+
+    return list(fees.annotate(
+        outstanding=Sum('balance_due'),
+        fee_count=Count('id'),
+        student_count=Count('student', distinct=True),
+    ).order_by(ordering))
+
+
+def collection_rate_report(school_id, date_from=None, date_to=None):
+    """
+    Monthly trend of fees falling due against what has been paid on them,
+    next to the cash actually collected in that month.
+    """
+    fees = _for_school(StudentFee.objects.all(), school_id, 'school_id')
+    if date_from:
+        fees = fees.filter(due_date__gte=date_from)
+    if date_to:
+        fees = fees.filter(due_date__lte=date_to)
+
+    billed = fees.annotate(period=TruncMonth('due_date')).values('period').annotate(
+        billed=Sum('final_amount'), paid=Sum('paid_total')).order_by('period')
+    collected = {
+        row['period']: row['amount_collected']
+        for row in collections_report(school_id, 'month', date_from, date_to)
+    }
+
+    trend = []
+    for row in billed:
+        if row['period'] is None:
+            continue
+        rate = round(row['paid'] / row['billed'] * 100, 2) if row['billed'] else None
+        trend.append({
+            "period": row['period'],
+            "billed": row['billed'],
+            "paid": row['paid'],
+            "collection_rate": rate,
+            "collected_in_month": collected.get(row['period'], 0),
+        })
+    return trend
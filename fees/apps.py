@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class FeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'fees'
+
+    def ready(self):
+        from utils.tenant_cache import register_tenant_cache
+        from .ledger import register_ledger
+        from .models import FeeCategory, FeeStructure
+
+        register_tenant_cache(FeeCategory, lambda obj: obj.school_id)
+        register_tenant_cache(
+            FeeStructure, lambda obj: obj.classroom.school_id)
+        register_ledger()
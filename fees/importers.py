@@ -0,0 +1,77 @@
+from decimal import Decimal
+from students.models import Student
+from utils.importers import (
+    BaseImporter, Column, ForeignKeyColumn, choice_parser, parse_decimal
+)
+from .models import FeeStructure, StudentFee
+
+
+class StudentFeeImporter(BaseImporter):
+    """
+    Assigns fees to students. `amount` defaults to the structure amount;
+    rows already assigned for the same (student, fee_structure, month) are
+    skipped.
+    """
+
+    columns = [
+        ForeignKeyColumn('student_id', field='student'),
+        ForeignKeyColumn('fee_structure_id', field='fee_structure'),
+        Column('month', parser=choice_parser(StudentFee.MONTH_CHOICES),
+               required=False),
+        Column('amount', parser=parse_decimal, required=False),
+        Column('discount', parser=parse_decimal, required=False,
+               default=Decimal('0')),
+    ]
+
+    def get_student_queryset(self):
+        return Student.objects.filter(classroom__school=self.school)
+
+    def get_fee_structure_queryset(self):
+        return FeeStructure.objects.filter(classroom__school=self.school)
+
+    def validate_batch(self, rows):
+        for row in rows:
+            fee_structure = row.data['fee_structure']
+            month = row.data['month']
+            amount = row.data['amount']
+            if amount is None:
+                amount = row.data['amount'] = fee_structure.amount
+
+            if fee_structure.fee_type == 'monthly' and not month:
+                row.reject("Month is required for monthly fees.")
+            elif fee_structure.fee_type != 'monthly' and month:
+                row.reject("Month should be empty for non-monthly fees.")
+            elif row.data['student'].classroom_id != fee_structure.classroom_id:
+                row.reject(
+                    "Student is not in the fee structure's classroom.")
+            elif not 0 <= row.data['discount'] <= amount:
+                row.reject("Discount must be between 0 and the amount.")
+
+    def save_batch(self, rows):
+        keys = {(row.data['student'].id, row.data['fee_structure'].id,
+                 row.data['month']) for row in rows}
+        assigned = set(StudentFee.objects.filter(
+            student_id__in={student_id for student_id, _, _ in keys},
+            fee_structure_id__in={fs_id for _, fs_id, _ in keys},
+        ).values_list('student_id', 'fee_structure_id', 'month'))
+
+        fees = []
+        for row in rows:
+            key = (row.data['student'].id, row.data['fee_structure'].id,
+                   row.data['month'])
+            if key in assigned:
+                self.skip(row, "Fee already assigned.")
+                continue
+            assigned.add(key)
+            fee = StudentFee(
+                student=row.data['student'],
+                fee_structure=row.data['fee_structure'],
+                month=row.data['month'],
+                amount=row.data['amount'],
+                discount=row.data['discount'],
+                final_amount=row.data['amount'] - row.data['discount'],
+            )
+            fee.apply_balance()
+            fees.append(fee)
+        StudentFee.objects.bulk_create(fees)
+        self.created += len(fees)
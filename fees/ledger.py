@@ -0,0 +1,56 @@
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import (
+    Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from .analytics import mark_collection_days_dirty
+from .models import Payment, StudentFee
+
+
+def refresh_fee_balances(fee_ids):
+    """
+    Recomputes paid_total, balance_due and is_paid of the given fees from
+    their payments. The fee rows are locked first so that concurrent
+    payments against the same fee are summed one after the other.
+    """
+    fee_ids = {fee_id for fee_id in fee_ids if fee_id is not None}
+    if not fee_ids:
+        return
+
+    paid = Payment.objects.filter(fee=OuterRef('pk')).order_by().values(
+        'fee').annotate(total=Sum('amount_paid')).values('total')
+
+    with transaction.atomic():
+        fees = StudentFee.objects.filter(pk__in=fee_ids)
+        list(fees.select_for_update().values_list('pk', flat=True))
+        fees.update(paid_total=Coalesce(
+            Subquery(paid), Value(Decimal('0')),
+            output_field=DecimalField(max_digits=10, decimal_places=2)))
+        fees.update(
+            balance_due=F('final_amount') - F('paid_total'),
+            is_paid=Case(When(paid_total__gte=F('final_amount'), then=Value(True)),
+                         default=Value(False)),
+        )
+
+
+def _payment_saved(sender, instance, **kwargs):
+    refresh_fee_balances(
+        {instance.fee_id, getattr(instance, '_loaded_fee_id', None)})
+    mark_collection_days_dirty(
+        {instance.transaction_date, getattr(instance, '_loaded_transaction_date', None)})
+    instance._loaded_fee_id = instance.fee_id
+    instance._loaded_transaction_date = instance.transaction_date
+
+
+def _payment_deleted(sender, instance, **kwargs):
+    refresh_fee_balances({instance.fee_id})
+    mark_collection_days_dirty({instance.transaction_date})
+
+
+def register_ledger():
+    post_save.connect(_payment_saved, sender=Payment,
+                      dispatch_uid='fees-ledger-payment-saved')
+    post_delete.connect(_payment_deleted, sender=Payment,
+                        dispatch_uid='fees-ledger-payment-deleted')
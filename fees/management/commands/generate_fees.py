@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from fees.services import fee_structures_for, generate_student_fees
+
+
+class Command(BaseCommand):
+    help = "Generate StudentFee rows for a fee structure or a whole academic year."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school', type=int, required=True)
+        parser.add_argument('--fee-structure', type=int)
+        parser.add_argument('--academic-year')
+
+    def handle(self, *args, **options):
+        if not options['fee_structure'] and not options['academic_year']:
+            raise CommandError(
+                "Pass --fee-structure or --academic-year.")
+
+        structures = fee_structures_for(
+            options['school'],
+            fee_structure_id=options['fee_structure'],
+            academic_year=options['academic_year'],
+        )
+        result = generate_student_fees(structures)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} fees, {result['existing']} already existed."))
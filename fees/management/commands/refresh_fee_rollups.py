@@ -0,0 +1,19 @@
+import datetime
+from django.core.management.base import BaseCommand
+from fees.analytics import refresh_fee_collection_rollups
+
+
+class Command(BaseCommand):
+    help = ("Refresh the daily fee collection rollups from payments: the "
+            "days changed since the last refresh, or every day from --since.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since', type=datetime.date.fromisoformat,
+            help="Recompute every day from this date (YYYY-MM-DD), e.g. after "
+                 "payments were bulk updated without signals.")
+
+    def handle(self, *args, **options):
+        result = refresh_fee_collection_rollups(since=options['since'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Recomputed {result['days']} days, {result['rows']} rollup rows."))
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:56
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Case, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+def backfill_ledger(apps, schema_editor):
+    StudentFee = apps.get_model('fees', 'StudentFee')
+    Payment = apps.get_model('fees', 'Payment')
+    FeeStructure = apps.get_model('fees', 'FeeStructure')
+
+    paid = Payment.objects.filter(fee=OuterRef('pk')).order_by().values(
+        'fee').annotate(total=Sum('amount_paid')).values('total')
+    due_date = FeeStructure.objects.filter(
+        pk=OuterRef('fee_structure_id')).values('due_date')
+    StudentFee.objects.update(
+        paid_total=Coalesce(Subquery(paid), Value(Decimal('0')),
+                            output_field=models.DecimalField(
+                                max_digits=10, decimal_places=2)),
+        due_date=Subquery(due_date),
+    )
+    StudentFee.objects.update(
+        balance_due=F('final_amount') - F('paid_total'),
+        is_paid=Case(When(paid_total__gte=F('final_amount'), then=Value(True)),
+                     default=Value(False)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fees', '0004_remove_payment_payment_date_alter_feecategory_name_and_more'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentfee',
+            name='balance_due',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='studentfee',
+            name='due_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentfee',
+            name='paid_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='studentfee',
+            index=models.Index(condition=models.Q(('balance_due__gt', 0)), fields=['due_date', 'id'], name='fees_sf_dues_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentfee',
+            index=models.Index(condition=models.Q(('balance_due__gt', 0)), fields=['fee_structure', 'month'], name='fees_sf_dues_structure_idx'),
+        ),
+    ]
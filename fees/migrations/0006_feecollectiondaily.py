@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classrooms', '0006_alter_classroom_unique_together_and_more'),
+        ('fees', '0005_studentfee_ledger'),
+        ('schools', '0004_alter_school_options_alter_school_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeeCollectionDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('payment_mode', models.CharField(max_length=50)),
+                ('amount_collected', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('payment_count', models.PositiveIntegerField()),
+                ('last_payment_id', models.BigIntegerField()),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='fees.feecategory')),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='classrooms.classroom')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='schools.school')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_payment_id'], name='fees_fcd_watermark_idx')],
+                'constraints': [models.UniqueConstraint(fields=('school', 'date', 'classroom', 'category', 'payment_mode'), name='unique_fee_collection_daily')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fees', '0006_feecollectiondaily'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['transaction_date'], name='fees_payment_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentfee',
+            index=models.Index(condition=models.Q(('is_paid', False)), fields=['student', 'due_date'], name='fees_sf_student_unpaid_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+from schools.tenancy import backfill_school
+
+
+def backfill(apps, schema_editor):
+    backfill_school(apps.get_model('fees', 'StudentFee'), 'student__classroom__school')
+    backfill_school(apps.get_model('fees', 'Payment'), 'fee__school')
+
+
+class Migration(migrations.Migration):
+    # Every backfill batch commits on its own, so rows are not locked for
+    # the length of the whole backfill.
+    atomic = False
+
+    dependencies = [
+        ('fees', '0007_tenant_list_indexes'),
+        ('schools', '0004_alter_school_options_alter_school_unique_together'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='school',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='schools.school'),
+        ),
+        migrations.AddField(
+            model_name='studentfee',
+            name='school',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='schools.school'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['school', 'id'], name='fees_payment_school_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentfee',
+            index=models.Index(fields=['school', 'id'], name='fees_sf_school_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentfee',
+            index=models.Index(condition=models.Q(('balance_due__gt', 0)), fields=['school', 'due_date', 'id'], name='fees_sf_school_dues_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fees', '0008_denormalized_school'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeeCollectionDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+            ],
+        ),
+    ]
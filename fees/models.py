@@ -1,7 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from classrooms.models import Classroom
 from students.models import Student
 from schools.models import School
+from schools.tenancy import SchoolScopedModel, TenantManager
 from django.core.exceptions import ValidationError
 import calendar
 
@@ -15,6 +17,9 @@ class FeeCategory(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
 
+    objects = TenantManager()
+    school_lookup = 'school'
+
     class Meta:
         unique_together = ('school', 'name')
 
@@ -37,17 +42,27 @@ class FeeStructure(models.Model):
     fee_type = models.CharField(max_length=20, choices=FEE_TYPE_CHOICES)
     due_date = models.DateField()
 
+    objects = TenantManager()
+    school_lookup = 'classroom__school'
+
     class Meta:
         unique_together = ('classroom', 'category', 'academic_year')
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Keep the due date copied onto assigned fees in step.
+        self.studentfee_set.exclude(due_date=self.due_date).update(
+            due_date=self.due_date)
+
     def __str__(self):
         return f"{self.classroom} | {self.category.name} | {self.academic_year}"
 
 
-class StudentFee(models.Model):
+class StudentFee(SchoolScopedModel):
     """Fee assigned to student based on structure. Tracks monthly fees too."""
 
     MONTH_CHOICES = [(month[:3], month) for month in calendar.month_name if month]
+    school_path = 'student__classroom__school'
 
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     fee_structure = models.ForeignKey(FeeStructure, on_delete=models.CASCADE)
@@ -64,9 +79,30 @@ class StudentFee(models.Model):
     final_amount = models.DecimalField(max_digits=10, decimal_places=2)
     is_paid = models.BooleanField(default=False)
     paid_date = models.DateField(null=True, blank=True)
+    # Ledger columns, maintained from payments (see fees.ledger).
+    paid_total = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0)
+    balance_due = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0)
+    due_date = models.DateField(null=True, blank=True)
 
     class Meta:
         unique_together = ('student', 'fee_structure', 'month')
+        indexes = [
+            models.Index(fields=['due_date', 'id'],
+                         condition=Q(balance_due__gt=0),
+                         name='fees_sf_dues_idx'),
+            models.Index(fields=['fee_structure', 'month'],
+                         condition=Q(balance_due__gt=0),
+                         name='fees_sf_dues_structure_idx'),
+            models.Index(fields=['student', 'due_date'],
+                         condition=Q(is_paid=False),
+                         name='fees_sf_student_unpaid_idx'),
+            models.Index(fields=['school', 'id'], name='fees_sf_school_idx'),
+            models.Index(fields=['school', 'due_date', 'id'],
+                         condition=Q(balance_due__gt=0),
+                         name='fees_sf_school_dues_idx'),
+        ]
 
     def clean(self):
         if self.fee_structure.fee_type == 'monthly' and not self.month:
@@ -80,13 +116,25 @@ class StudentFee(models.Model):
                 f"Selected student is not associated with the classroom '{self.fee_structure.classroom}' in the FeeStructure."
             )
 
+    def apply_balance(self):
+        """Derives the ledger columns from final_amount and paid_total."""
+        self.balance_due = self.final_amount - (self.paid_total or 0)
+        self.is_paid = self.balance_due <= 0
+        self.due_date = self.fee_structure.due_date
+
+    def save(self, *args, **kwargs):
+        self.apply_balance()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.student} - {self.fee_structure} - {self.month or 'N/A'}"
 
 
-class Payment(models.Model):
+class Payment(SchoolScopedModel):
     """Payment made for a particular StudentFee assignment."""
 
+    school_path = 'fee__school'
+
     fee = models.ForeignKey(StudentFee, on_delete=models.CASCADE)
     amount_paid = models.DecimalField(max_digits=10, decimal_places=2)
     payment_mode = models.CharField(max_length=50)
@@ -98,11 +146,78 @@ class Payment(models.Model):
             models.UniqueConstraint(
                 fields=['transaction_id'], name='unique_transaction_id')
         ]
+        indexes = [
+            models.Index(fields=['transaction_date'], name='fees_payment_date_idx'),
+            models.Index(fields=['school', 'id'], name='fees_payment_school_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so moving a payment to another fee (or day) updates
+        # both ledgers (and both days of the rollups).
+        instance._loaded_fee_id = instance.__dict__.get('fee_id')
+        instance._loaded_transaction_date = instance.__dict__.get('transaction_date')
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.transaction_date and self.fee.paid_date:
             self.transaction_date = self.fee.paid_date
-        super().save(*args, **kwargs)
+        # The ledger is refreshed by a post_save handler; run both in one
+        # transaction so a payment never lands without its balance.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return f"{self.fee.student} - ₹{self.amount_paid} on {self.transaction_date}"
+
+
+class FeeCollectionDaily(models.Model):
+    """
+    Payments rolled up per school, day, classroom, category and payment
+    mode. Refreshed from payments by fees.analytics; analytics endpoints
+    read this table instead of scanning payments.
+    """
+
+    school = models.ForeignKey(School, on_delete=models.CASCADE)
+    date = models.DateField()
+    classroom = models.ForeignKey(Classroom, on_delete=models.CASCADE)
+    category = models.ForeignKey(FeeCategory, on_delete=models.CASCADE)
+    payment_mode = models.CharField(max_length=50)
+    amount_collected = models.DecimalField(max_digits=14, decimal_places=2)
+    payment_count = models.PositiveIntegerField()
+    # Highest payment id folded into this row; the max over the table is
+    # the watermark for the next incremental refresh.
+    last_payment_id = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['school', 'date', 'classroom', 'category', 'payment_mode'],
+                name='unique_fee_collection_daily')
+        ]
+        indexes = [
+            models.Index(fields=['last_payment_id'],
+                         name='fees_fcd_watermark_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.school} | {self.date} | {self.payment_mode} | ₹{self.amount_collected}"
+
+
+class FeeCollectionDirtyDay(models.Model):
+    """
+    A day whose payments were written, edited or deleted since the last
+    rollup refresh; the next refresh recomputes its FeeCollectionDaily rows.
+    Marked by the payment signals in fees.ledger, one row per write, so
+    marks made while a refresh runs are kept for the next one.
+    """
+
+    date = models.DateField()
+
+    def __str__(self):
+        return f"{self.date} (dirty)"
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from utils.serializers import ValuesSerializer
 from .models import FeeCategory, FeeStructure, StudentFee, Payment
 
 
@@ -17,7 +18,8 @@ class FeeStructureSerializer(serializers.ModelSerializer):
 class StudentFeeSerializer(serializers.ModelSerializer):
     class Meta:
         model = StudentFee
-        fields = '__all__'
+        exclude = ('school',)
+        read_only_fields = ('paid_total', 'balance_due', 'is_paid', 'due_date')
 
     def validate(self, data):
         fee_structure = data.get('fee_structure')
@@ -39,7 +41,49 @@ class StudentFeeSerializer(serializers.ModelSerializer):
         return data
 
 
+class StudentFeeReadSerializer(ValuesSerializer):
+    model_serializer = StudentFeeSerializer
+
+
+class FeeDueSerializer(serializers.ModelSerializer):
+    student_name = serializers.CharField(source='student.user.name')
+    roll_no = serializers.IntegerField(source='student.roll_no')
+    class_name = serializers.CharField(
+        source='fee_structure.classroom.class_name')
+    section = serializers.CharField(source='fee_structure.classroom.section')
+    category = serializers.CharField(source='fee_structure.category.name')
+
+    class Meta:
+        model = StudentFee
+        fields = ['id', 'student', 'student_name', 'roll_no', 'class_name',
+                  'section', 'category', 'month', 'final_amount', 'paid_total',
+                  'balance_due', 'due_date']
+
+
 class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Payment
-        fields = '__all__'
+        exclude = ('school',)
+
+
+class FeeGenerationSerializer(serializers.Serializer):
+    fee_structure = serializers.IntegerField(required=False, allow_null=True)
+    academic_year = serializers.CharField(
+        required=False, allow_blank=True, max_length=20)
+    discounts = serializers.DictField(
+        child=serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0),
+        required=False,
+        help_text="Optional {student_id: discount} applied to each generated row",
+    )
+
+    def validate_discounts(self, value):
+        try:
+            return {int(student_id): amount for student_id, amount in value.items()}
+        except ValueError:
+            raise serializers.ValidationError("Discount keys must be student ids.")
+
+    def validate(self, data):
+        if not data.get('fee_structure') and not data.get('academic_year'):
+            raise serializers.ValidationError(
+                "fee_structure or academic_year is required.")
+        return data
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from django.db import transaction
+from students.models import Student
+from .models import FeeStructure, StudentFee
+
+MONTHS = [code for code, _ in StudentFee.MONTH_CHOICES]
+BULK_BATCH_SIZE = 1000
+
+
+def fee_months(fee_structure):
+    """Months a structure is billed for: all 12 for monthly fees, else none."""
+    return MONTHS if fee_structure.fee_type == 'monthly' else [None]
+
+
+def generate_student_fees(fee_structures, discounts=None):
+    """
+    Materialises StudentFee rows for every student in each structure's
+    classroom: 12 rows per student for monthly fees, one otherwise.
+    Rows that already exist are left untouched, so running it again only
+    fills gaps (for example students who joined later).
+    Arguments:
+    fee_structures: Iterable of FeeStructure.
+    discounts: Optional {student_id: Decimal} applied to every generated row
+        of that student, capped at the row amount.
+    Returns:
+    A dict with the number of created and already existing rows.
+    """
+    discounts = discounts or {}
+    created = 0
+    existing = 0
+
+    for fee_structure in fee_structures:
+        student_ids = list(Student.objects.filter(
+            classroom_id=fee_structure.classroom_id).values_list('id', flat=True))
+        if not student_ids:
+            continue
+
+        with transaction.atomic():
+            # Generations of the same structure queue on its row, so each one
+            # reads the fees the other has inserted.
+            list(FeeStructure.objects.select_for_update().filter(
+                pk=fee_structure.pk).values_list('pk', flat=True))
+            rows = StudentFee.objects.filter(
+                fee_structure=fee_structure, student_id__in=student_ids)
+            # NULL months never conflict on the unique key, so the existing
+            # rows are read first instead of relying on ignore_conflicts alone.
+            assigned = set(rows.values_list('student_id', 'month'))
+            before = rows.count()
+
+            amount = fee_structure.amount
+            fees = []
+            for student_id in student_ids:
+                discount = min(Decimal(str(discounts.get(student_id, 0))), amount)
+                for month in fee_months(fee_structure):
+                    if (student_id, month) in assigned:
+                        existing += 1
+                        continue
+                    fee = StudentFee(
+                        student_id=student_id,
+                        fee_structure=fee_structure,
+                        month=month,
+                        amount=amount,
+                        discount=discount,
+                        final_amount=amount - discount,
+                    )
+                    fee.apply_balance()
+                    fees.append(fee)
+
+            StudentFee.objects.bulk_create(
+                fees, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+            # ignore_conflicts drops rows silently; count what was inserted.
+            created += rows.count() - before
+
+    return {"created": created, "existing": existing}
+
+
+def fee_structures_for(school_id, fee_structure_id=None, academic_year=None):
+    """Tenant-scoped structures selected by id or by academic year."""
+    structures = FeeStructure.objects.filter(classroom__school_id=school_id)
+    if fee_structure_id:
+        structures = structures.filter(id=fee_structure_id)
+    if academic_year:
+        structures = structures.filter(academic_year=academic_year)
+    return structures
@@ -0,0 +1,24 @@
+import datetime
+from celery import shared_task
+from django.utils import timezone
+from .analytics import refresh_fee_collection_rollups
+from .services import fee_structures_for, generate_student_fees
+
+
+@shared_task
+def generate_fees_task(school_id, fee_structure_id=None, academic_year=None, discounts=None):
+    # JSON task arguments turn integer dict keys into strings.
+    discounts = {int(student_id): amount
+                 for student_id, amount in (discounts or {}).items()}
+    structures = fee_structures_for(
+        school_id, fee_structure_id=fee_structure_id, academic_year=academic_year)
+    return generate_student_fees(structures, discounts=discounts)
+
+
+@shared_task
+def refresh_fee_collection_rollups_task(since=None, trailing_days=None):
+    # Re-sweeping the last few days picks up payments that committed after
+    # a payment with a higher id had already been folded in.
+    if since is None and trailing_days:
+        since = timezone.localdate() - datetime.timedelta(days=trailing_days)
+    return refresh_fee_collection_rollups(since=since)
@@ -1,3 +1,195 @@
+import datetime
+from decimal import Decimal
 from django.test import TestCase
+from fees.analytics import refresh_fee_collection_rollups
+from fees.ledger import refresh_fee_balances
+from fees.models import FeeCollectionDaily, FeeCollectionDirtyDay, Payment, StudentFee
+from fees.services import generate_student_fees
+from utils.testing import (client_for, create_admin, create_classroom, create_fee,
+                           create_fee_structure, create_payment, create_school,
+                           create_student, url)
 
-# Create your tests here.
+
+class FeeLedgerTests(TestCase):
+    """paid_total, balance_due and is_paid follow the payments of a fee."""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = create_school()
+        cls.admin = create_admin(school)
+        classroom = create_classroom(school)
+        cls.student = create_student(classroom, 1)
+        cls.structure = create_fee_structure(classroom, amount=1000)
+
+    def setUp(self):
+        self.fee = create_fee(self.student, self.structure, month='Apr', discount=100)
+
+    def assertLedger(self, fee, paid_total, balance_due, is_paid):
+        fee.refresh_from_db()
+        self.assertEqual((fee.paid_total, fee.balance_due, fee.is_paid),
+                         (Decimal(paid_total), Decimal(balance_due), is_paid))
+
+    def test_new_fee_is_due_in_full(self):
+        self.assertLedger(self.fee, 0, 900, False)
+
+    def test_partial_then_full_payment(self):
+        create_payment(self.fee, 400)
+        self.assertLedger(self.fee, 400, 500, False)
+        create_payment(self.fee, 500)
+        self.assertLedger(self.fee, 900, 0, True)
+
+    def test_overpayment_leaves_a_negative_balance(self):
+        create_payment(self.fee, 1000)
+        self.assertLedger(self.fee, 1000, -100, True)
+
+    def test_update_and_delete(self):
+        payment = create_payment(self.fee, 900)
+        self.assertLedger(self.fee, 900, 0, True)
+
+        payment.amount_paid = Decimal('300')
+        payment.save()
+        self.assertLedger(self.fee, 300, 600, False)
+
+        payment.delete()
+        self.assertLedger(self.fee, 0, 900, False)
+
+    def test_moving_a_payment_updates_both_fees(self):
+        other = create_fee(self.student, self.structure, month='May')
+        payment = create_payment(self.fee, 900)
+
+        payment = Payment.objects.get(pk=payment.pk)
+        payment.fee = other
+        payment.save()
+        self.assertLedger(self.fee, 0, 900, False)
+        self.assertLedger(other, 900, 100, False)
+
+    def test_bulk_payments_need_an_explicit_refresh(self):
+        other = create_fee(self.student, self.structure, month='May')
+        Payment.objects.bulk_create([
+            Payment(fee=self.fee, amount_paid=Decimal('900'), payment_mode='cash',
+                    transaction_date=datetime.date(2025, 4, 5)),
+            Payment(fee=other, amount_paid=Decimal('250'), payment_mode='upi',
+                    transaction_date=datetime.date(2025, 4, 5)),
+            Payment(fee=other, amount_paid=Decimal('250'), payment_mode='upi',
+                    transaction_date=datetime.date(2025, 4, 6)),
+        ])
+        self.assertLedger(self.fee, 0, 900, False)
+
+        refresh_fee_balances([self.fee.id, other.id, None])
+        self.assertLedger(self.fee, 900, 0, True)
+        self.assertLedger(other, 500, 500, False)
+
+        Payment.objects.filter(fee=other).delete()
+        self.assertLedger(other, 0, 1000, False)
+
+    def test_payment_api_create_update_delete(self):
+        client = client_for(self.admin)
+        response = client.post(url('fee-payment'), {
+            "fee": self.fee.id, "amount_paid": "400.00", "payment_mode": "cash",
+            "transaction_date": "2025-04-05"}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertLedger(self.fee, 400, 500, False)
+        payment_id = response.json()['data']['id']
+
+        response = client.put(url('fee-payment-update', pk=payment_id), {
+            "fee": self.fee.id, "amount_paid": "900.00", "payment_mode": "cash",
+            "transaction_date": "2025-04-05"}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertLedger(self.fee, 900, 0, True)
+
+        response = client.delete(url('fee-payment-update', pk=payment_id))
+        self.assertEqual(response.status_code, 200)
+        self.assertLedger(self.fee, 0, 900, False)
+
+
+class FeeCollectionRollupTests(TestCase):
+    """FeeCollectionDaily follows payment writes through dirty days and the watermark."""
+
+    day = datetime.date(2025, 4, 5)
+    next_day = datetime.date(2025, 4, 6)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.classroom = create_classroom(cls.school)
+        cls.structure = create_fee_structure(cls.classroom, amount=1000)
+        cls.fee = create_fee(create_student(cls.classroom, 1), cls.structure)
+
+    def collected(self):
+        return {
+            (row.date, row.payment_mode): (row.amount_collected, row.payment_count)
+            for row in FeeCollectionDaily.objects.filter(school=self.school)
+        }
+
+    def test_payment_writes_mark_days_and_refresh_recomputes_them(self):
+        payment = create_payment(self.fee, 400, transaction_date=self.day)
+        create_payment(self.fee, 100, transaction_date=self.day, payment_mode='upi')
+        self.assertTrue(FeeCollectionDirtyDay.objects.exists())
+        refresh_fee_collection_rollups()
+        self.assertEqual(self.collected(), {
+            (self.day, 'cash'): (Decimal('400'), 1), (self.day, 'upi'): (Decimal('100'), 1)})
+        self.assertFalse(FeeCollectionDirtyDay.objects.exists())
+
+        # Moving a payment to another day, below the watermark.
+        payment = Payment.objects.get(pk=payment.pk)
+        payment.transaction_date = self.next_day
+        payment.save()
+        refresh_fee_collection_rollups()
+        self.assertEqual(self.collected(), {
+            (self.day, 'upi'): (Decimal('100'), 1), (self.next_day, 'cash'): (Decimal('400'), 1)})
+
+        payment.delete()
+        refresh_fee_collection_rollups()
+        self.assertEqual(self.collected(), {(self.day, 'upi'): (Decimal('100'), 1)})
+
+    def test_watermark_picks_up_bulk_inserted_payments(self):
+        create_payment(self.fee, 100, transaction_date=self.day)
+        refresh_fee_collection_rollups()
+        Payment.objects.bulk_create([
+            Payment(fee=self.fee, amount_paid=Decimal('200'), payment_mode='cash',
+                    transaction_date=self.next_day)])
+        self.assertFalse(FeeCollectionDirtyDay.objects.exists())
+
+        self.assertEqual(refresh_fee_collection_rollups()["days"], 1)
+        self.assertEqual(self.collected(), {
+            (self.day, 'cash'): (Decimal('100'), 1), (self.next_day, 'cash'): (Decimal('200'), 1)})
+        self.assertEqual(refresh_fee_collection_rollups(), {"days": 0, "rows": 0})
+
+    def test_payment_of_a_student_without_classroom(self):
+        student = create_student(None, 2, school=self.school)
+        fee = create_fee(student, self.structure)
+        payment = create_payment(fee, 300, transaction_date=self.day)
+        self.assertIsNone(payment.school_id)
+
+        refresh_fee_collection_rollups()
+        self.assertEqual(self.collected(), {(self.day, 'cash'): (Decimal('300'), 1)})
+        self.assertFalse(FeeCollectionDirtyDay.objects.exists())
+
+
+class FeeGenerationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        school = create_school()
+        cls.classroom = create_classroom(school)
+        cls.students = [create_student(cls.classroom, roll_no) for roll_no in (1, 2)]
+        cls.monthly = create_fee_structure(cls.classroom, amount=1000)
+        cls.annual = create_fee_structure(cls.classroom, amount=5000, fee_type='annual',
+                                          academic_year='2026-27')
+
+    def test_generation_is_idempotent(self):
+        structures = [self.monthly, self.annual]
+        first = generate_student_fees(structures, discounts={self.students[0].id: Decimal('100')})
+        self.assertEqual(first, {"created": 26, "existing": 0})
+
+        self.assertEqual(generate_student_fees(structures), {"created": 0, "existing": 26})
+        self.assertEqual(StudentFee.objects.count(), 26)
+        self.assertEqual(StudentFee.objects.filter(
+            student=self.students[0], fee_structure=self.monthly,
+            final_amount=Decimal('900')).count(), 12)
+
+    def test_rerun_fills_gaps_for_new_students(self):
+        generate_student_fees([self.monthly, self.annual])
+        create_student(self.classroom, 3)
+        self.assertEqual(generate_student_fees([self.monthly, self.annual]),
+                         {"created": 13, "existing": 26})
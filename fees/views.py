@@ -1,7 +1,9 @@
 from django.forms import ValidationError
+from datetime import timedelta
 from django.shortcuts import render
+from django.utils import timezone
 from .models import FeeCategory, FeeStructure, StudentFee, Payment
-from .serializers import FeeCategorySerializer, FeeStructureSerializer, StudentFeeSerializer, PaymentSerializer
+from .serializers import FeeCategorySerializer, FeeStructureSerializer, StudentFeeSerializer, StudentFeeReadSerializer, PaymentSerializer, FeeDueSerializer, FeeGenerationSerializer
 from rest_framework.views import APIView
 from utils.restful_response import send_response
 from utils.data_constants import ResponseMessages
@@ -10,6 +12,18 @@ from schools.models import School
 from classrooms.models import Classroom
 from students.models import Student
 from school_erp_backend.permissions import IsSchoolAdmin
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from .analytics import (
+    COLLECTION_GROUPS, OUTSTANDING_GROUPS, collection_rate_report,
+    collections_report, outstanding_report
+)
+from .services import fee_structures_for
+from .tasks import generate_fees_task
+from utils.pagination import paginate_or_stream, paginated_data, wants_stream
+from utils.query_params import date_range_parameters, get_date_range
+from utils.tenant_cache import get_or_set_tenant_cache
+from utils.conditional import conditional_get
 # Create your views here.
 
 
@@ -22,13 +36,19 @@ def get_user_school(user):
 class FeeCategoryListCreateAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
+    @conditional_get(FeeCategory)
     def get(self, request):
         school = get_user_school(request.user)
-        qs = FeeCategory.objects.all(
-        ) if request.user.is_superuser else FeeCategory.objects.filter(school=school)
-        serializer = FeeCategorySerializer(qs, many=True)
+        qs = FeeCategory.objects.for_user(request.user)
+        if wants_stream(request):
+            return paginate_or_stream(request, qs, FeeCategorySerializer)
+
+        data = get_or_set_tenant_cache(
+            getattr(school, 'id', None), FeeCategory, request.query_params,
+            lambda: paginated_data(request, qs, FeeCategorySerializer)
+        )
         return send_response(
-            data=serializer.data,
+            data=data,
             message=ResponseMessages.DATA_FETCH_SUCCESS,
             status_code=status.HTTP_200_OK
         )
@@ -59,13 +79,7 @@ class FeeCategoryRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get_object(self, pk, user):
-        school = get_user_school(user)
-        try:
-            obj = FeeCategory.objects.get(pk=pk)
-            if user.is_superuser or obj.school == school:
-                return obj
-        except FeeCategory.DoesNotExist:
-            return None
+        return FeeCategory.objects.get_for_user(user, pk)
 
     def get(self, request, pk):
         obj = self.get_object(pk, request.user)
@@ -122,16 +136,17 @@ class FeeCategoryRetrieveUpdateDeleteAPIView(APIView):
 class FeeStructureListCreateAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
+    @conditional_get(FeeStructure)
     def get(self, request):
         school = get_user_school(request.user)
-        if request.user.is_superuser:
-            qs = FeeStructure.objects.all()
-        else:
-            qs = FeeStructure.objects.filter(classroom__school=school)
+        qs = FeeStructure.objects.for_user(request.user)
 
-        serializer = FeeStructureSerializer(qs, many=True)
+        data = get_or_set_tenant_cache(
+            getattr(school, 'id', None), FeeStructure, request.query_params,
+            lambda: FeeStructureSerializer(qs, many=True).data
+        )
         return send_response(
-            data=serializer.data,
+            data=data,
             message=ResponseMessages.DATA_FETCH_SUCCESS,
             status_code=status.HTTP_200_OK
         )
@@ -141,10 +156,10 @@ class FeeStructureListCreateAPIView(APIView):
         data = request.data.copy()
 
         if not request.user.is_superuser:
-            classroom = Classroom.objects.filter(
-                school=school, id=data.get('classroom')).first()
-            category = FeeCategory.objects.filter(
-                school=school, id=data.get('category')).first()
+            classroom = Classroom.objects.for_school(school).filter(
+                id=data.get('classroom')).first()
+            category = FeeCategory.objects.for_school(school).filter(
+                id=data.get('category')).first()
 
             if not classroom or not category:
                 return send_response(
@@ -171,13 +186,8 @@ class FeeStructureRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get_object(self, pk, user):
-        school = get_user_school(user)
-        try:
-            obj = FeeStructure.objects.get(pk=pk)
-            if user.is_superuser or obj.classroom.school == school:
-                return obj
-        except FeeStructure.DoesNotExist:
-            return None
+        # The cache invalidation on save and delete reads classroom.school_id.
+        return FeeStructure.objects.select_related('classroom').get_for_user(user, pk)
 
     def get(self, request, pk):
         obj = self.get_object(pk, request.user)
@@ -231,28 +241,18 @@ class StudentFeeListCreateAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get(self, request):
-        school = get_user_school(request.user)
-        if request.user.is_superuser:
-            qs = StudentFee.objects.all()
-        else:
-            qs = StudentFee.objects.filter(student__classroom__school=school)
-
-        serializer = StudentFeeSerializer(qs, many=True)
-        return send_response(
-            data=serializer.data,
-            message=ResponseMessages.DATA_FETCH_SUCCESS,
-            status_code=status.HTTP_200_OK
-        )
+        qs = StudentFee.objects.for_user(request.user)
+        return paginate_or_stream(request, qs, StudentFeeReadSerializer)
 
     def post(self, request):
         school = get_user_school(request.user)
         data = request.data.copy()
 
         if not request.user.is_superuser:
-            student = Student.objects.filter(
-                classroom__school=school, id=data.get('student')).first()
-            fee_structure = FeeStructure.objects.filter(
-                classroom__school=school, id=data.get('fee_structure')).first()
+            student = Student.objects.for_school(school).filter(
+                id=data.get('student')).first()
+            fee_structure = FeeStructure.objects.for_school(school).filter(
+                id=data.get('fee_structure')).first()
 
             if not student or not fee_structure:
                 return send_response(
@@ -281,13 +281,7 @@ class StudentFeeRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get_object(self, pk, user):
-        school = get_user_school(user)
-        try:
-            obj = StudentFee.objects.get(pk=pk)
-            if user.is_superuser or obj.student.classroom.school == school:
-                return obj
-        except StudentFee.DoesNotExist:
-            return None
+        return StudentFee.objects.get_for_user(user, pk)
 
     def get(self, request, pk):
         obj = self.get_object(pk, request.user)
@@ -336,30 +330,149 @@ class StudentFeeRetrieveUpdateDeleteAPIView(APIView):
         )
 
 
-class PaymentListCreateAPIView(APIView):
+class FeeDuesAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
+    @swagger_auto_schema(
+        operation_description="Outstanding fees, oldest due date first. Balances are "
+        "kept on each fee as payments are recorded, so nothing is summed here.",
+        manual_parameters=[
+            openapi.Parameter('classroom', openapi.IN_QUERY,
+                              type=openapi.TYPE_INTEGER),
+            openapi.Parameter('month', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Three-letter month, e.g. Apr"),
+            openapi.Parameter('overdue_days', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Only fees at least this many days past due"),
+        ]
+    )
     def get(self, request):
+        qs = StudentFee.objects.for_user(request.user).filter(
+            balance_due__gt=0).select_related(
+            'student__user', 'fee_structure__classroom', 'fee_structure__category')
+
+        params = request.query_params
+        try:
+            classroom_id = int(params['classroom']) if params.get('classroom') else None
+            overdue_days = int(params['overdue_days']) if params.get('overdue_days') else None
+        except ValueError:
+            return send_response(
+                message="classroom and overdue_days must be whole numbers.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        if classroom_id is not None:
+            qs = qs.filter(fee_structure__classroom_id=classroom_id)
+        if params.get('month'):
+            qs = qs.filter(month=params['month'].capitalize())
+        if overdue_days is not None:
+            cutoff = timezone.localdate() - timedelta(days=overdue_days)
+            qs = qs.filter(due_date__lt=cutoff)
+
+        return paginate_or_stream(request, qs, FeeDueSerializer,
+                                  ordering=('due_date', 'id'))
+
+
+class FeeCollectionAnalyticsAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Fees collected per day, month or payment mode, "
+        "read from the daily collection rollups.",
+        manual_parameters=[
+            openapi.Parameter('group', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=list(COLLECTION_GROUPS), default='day'),
+        ] + date_range_parameters
+    )
+    def get(self, request):
+        group = request.query_params.get('group', 'day')
+        if group not in COLLECTION_GROUPS:
+            return send_response(
+                message=f"group must be one of: {', '.join(COLLECTION_GROUPS)}.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            date_from, date_to = get_date_range(request)
+        except ValueError:
+            return send_response(
+                message="Dates must be in YYYY-MM-DD format.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
         school = get_user_school(request.user)
-        if request.user.is_superuser:
-            qs = Payment.objects.all()
-        else:
-            qs = Payment.objects.filter(fee__student__classroom__school=school)
+        data = collections_report(
+            school.id if school else None, group, date_from, date_to)
+        return send_response(
+            data=data,
+            message=ResponseMessages.DATA_FETCH_SUCCESS
+        )
+
 
-        serializer = PaymentSerializer(qs, many=True)
+class FeeOutstandingAnalyticsAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Outstanding fee balance per classroom or category.",
+        manual_parameters=[
+            openapi.Parameter('group', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=list(OUTSTANDING_GROUPS), default='classroom'),
+        ]
+    )
+    def get(self, request):
+        group = request.query_params.get('group', 'classroom')
+        if group not in OUTSTANDING_GROUPS:
+            return send_response(
+                message=f"group must be one of: {', '.join(OUTSTANDING_GROUPS)}.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        school = get_user_school(request.user)
+        data = outstanding_report(school.id if school else None, group)
         return send_response(
-            data=serializer.data,
-            message=ResponseMessages.DATA_FETCH_SUCCESS,
-            status_code=status.HTTP_200_OK
+            data=data,
+            message=ResponseMessages.DATA_FETCH_SUCCESS
+        )
+
+
+class FeeCollectionRateAnalyticsAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Monthly collection rate: fees falling due in each "
+        "month against the amount paid on them, with the cash collected that month.",
+        manual_parameters=date_range_parameters
+    )
+    def get(self, request):
+        try:
+            date_from, date_to = get_date_range(request)
+        except ValueError:
+            return send_response(
+                message="Dates must be in YYYY-MM-DD format.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        school = get_user_school(request.user)
+        data = collection_rate_report(
+            school.id if school else None, date_from, date_to)
+        return send_response(
+            data=data,
+            message=ResponseMessages.DATA_FETCH_SUCCESS
         )
 
+
+class PaymentListCreateAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    def get(self, request):
+        qs = Payment.objects.for_user(request.user)
+        return paginate_or_stream(request, qs, PaymentSerializer)
+
     def post(self, request):
         school = get_user_school(request.user)
         data = request.data.copy()
 
         if not request.user.is_superuser:
-            fee = StudentFee.objects.filter(
-                student__classroom__school=school, id=data.get('fee')).first()
+            fee = StudentFee.objects.for_school(school).filter(
+                id=data.get('fee')).first()
             if not fee:
                 return send_response(
                     message='Invalid student fee for your school',
@@ -385,13 +498,7 @@ class PaymentRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get_object(self, pk, user):
-        school = get_user_school(user)
-        try:
-            obj = Payment.objects.get(pk=pk)
-            if user.is_superuser or obj.fee.student.classroom.school == school:
-                return obj
-        except Payment.DoesNotExist:
-            return None
+        return Payment.objects.get_for_user(user, pk)
 
     def get(self, request, pk):
         obj = self.get_object(pk, request.user)
@@ -435,3 +542,49 @@ class PaymentRetrieveUpdateDeleteAPIView(APIView):
         return send_response(
             message=ResponseMessages.RECORD_DELETED
         )
+
+
+class FeeGenerationAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    @swagger_auto_schema(
+        operation_description="Generate student fees for a fee structure or a whole "
+        "academic year in the background. Safe to repeat: existing fees are kept.",
+        request_body=FeeGenerationSerializer,
+        responses={202: 'Fee generation queued.'}
+    )
+    def post(self, request):
+        # Validated here: the task runs after the 202 has been sent.
+        serializer = FeeGenerationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return send_response(
+                data=serializer.errors,
+                message=ResponseMessages.INVALID_PAYLOAD,
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        fee_structure_id = serializer.validated_data.get('fee_structure')
+        academic_year = serializer.validated_data.get('academic_year')
+        # Decimals as strings, the task arguments are JSON.
+        discounts = {student_id: str(amount) for student_id, amount
+                     in serializer.validated_data.get('discounts', {}).items()}
+
+        school = request.user.school
+        structures = fee_structures_for(
+            school.id, fee_structure_id=fee_structure_id, academic_year=academic_year)
+        if not structures.exists():
+            return send_response(
+                message="No fee structure found for your school.",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+
+        task = generate_fees_task.delay(
+            school.id,
+            fee_structure_id=fee_structure_id,
+            academic_year=academic_year,
+            discounts=discounts,
+        )
+        return send_response(
+            data={"task_id": task.id},
+            message="Fee generation queued.",
+            status_code=status.HTTP_202_ACCEPTED
+        )
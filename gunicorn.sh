@@ -1,5 +1,10 @@
 #!/bin/bash
+# Workers write their metrics here; /metrics aggregates them.
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/school_erp_metrics/web}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 gunicorn school_erp_backend.wsgi:application \
+--config gunicorn.conf.py \
 --bind 0.0.0.0:8000 \
 --workers 3 \
 --worker-class gthread \
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import ImportJob
+
+# Register your models here.
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'school', 'kind', 'status', 'processed_rows',
+                    'total_rows', 'error_count', 'created')
+    list_filter = ('kind', 'status')
+    readonly_fields = ('errors',)
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.user.is_superuser:
+            return qs
+        return qs.filter(school=request.user.school)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importjob',
+            name='kind',
+            field=models.CharField(choices=[('classrooms', 'Classrooms'), ('students', 'Students'), ('teachers', 'Teachers'), ('student_fees', 'Student fees'), ('exam_results', 'Exam results')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db import models
+from django_extensions.db.models import TimeStampedModel
+from schools.models import School
+
+# Create your models here.
+
+
+class ImportJob(TimeStampedModel):
+    """An uploaded file queued for background bulk import."""
+
+    KIND_CHOICES = [
+        ('classrooms', 'Classrooms'),
+        ('students', 'Students'),
+        ('teachers', 'Teachers'),
+        ('student_fees', 'Student fees'),
+        ('exam_results', 'Exam results'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    school = models.ForeignKey(
+        School, on_delete=models.CASCADE, related_name='import_jobs')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # Deleted once the job has completed or failed (see imports.tasks).
+    file = models.FileField(upload_to='imports/%Y/%m/')
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True,
+                              help_text="Per-row report: row number, values and reason")
+    message = models.TextField(blank=True)
+
+    @property
+    def progress(self):
+        if not self.total_rows:
+            return 100 if self.status == 'completed' else 0
+        return round(self.processed_rows * 100 / self.total_rows, 2)
+
+    def __str__(self):
+        return f"{self.kind} import #{self.pk} ({self.status})"
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from .models import ImportJob
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ImportJob
+        fields = ['id', 'kind', 'status', 'progress', 'total_rows',
+                  'processed_rows', 'created_count', 'skipped_count',
+                  'error_count', 'message', 'created', 'modified']
+        read_only_fields = fields
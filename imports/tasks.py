@@ -0,0 +1,38 @@
+from celery import shared_task
+from django.utils.module_loading import import_string
+from .models import ImportJob
+
+# Row processors per job kind: a function taking the ImportJob, or a
+# utils.importers.BaseImporter subclass. Both read job.file and keep the
+# progress counters up to date.
+PROCESSORS = {
+    'classrooms': 'classrooms.imports.process_classroom_import',
+    'students': 'students.importers.StudentImporter',
+    'teachers': 'teachers.importers.TeacherImporter',
+    'student_fees': 'fees.importers.StudentFeeImporter',
+    'exam_results': 'exams.importers.ExamResultImporter',
+}
+
+
+@shared_task
+def process_import_job(job_id):
+    job = ImportJob.objects.get(pk=job_id)
+    if job.status != 'pending':
+        return job.status
+
+    job.status = 'processing'
+    job.save(update_fields=['status', 'modified'])
+    try:
+        processor = import_string(PROCESSORS[job.kind])
+        getattr(processor, 'process_job', processor)(job)
+    except Exception as e:
+        job.status = 'failed'
+        job.message = str(e)
+    else:
+        job.status = 'completed'
+    # The upload is only read while the job runs. User sheets carry
+    # plaintext passwords, so it is not left in MEDIA_ROOT afterwards.
+    if job.file:
+        job.file.delete(save=False)
+    job.save()
+    return job.status
@@ -0,0 +1,82 @@
+import csv
+import io
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from imports.models import ImportJob
+from imports.tasks import process_import_job
+from students.models import Student
+from utils.testing import client_for, create_admin, create_classroom, create_school, url
+
+STUDENT_ROWS = [
+    # email, name, password, classroom, roll_no, gender, dob
+    ("a@school.test", "Asha", "secret-1", "{classroom}", "1", "F", "2012-01-01"),
+    ("b@school.test", "Bala", "secret-2", "{classroom}", "2", "M", "2012-02-01"),
+    ("not-an-email", "Chand", "secret-3", "{classroom}", "3", "M", "2012-03-01"),
+    ("d@school.test", "Devi", "secret-4", "{classroom}", "2", "F", "2012-04-01"),
+    ("e@school.test", "Esha", "secret-5", "{classroom}", "5", "F", "2012-05-01"),
+]
+
+
+@override_settings(IMPORT_BATCH_SIZE=2)
+class ImportJobTests(TestCase):
+    """Student imports processed in batches of two, as the worker runs them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = create_school()
+        cls.admin = create_admin(cls.school)
+        cls.classroom = create_classroom(cls.school)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def create_job(self):
+        content = io.StringIO()
+        writer = csv.writer(content)
+        writer.writerow(["email", "name", "password", "classroom_id", "roll_no", "gender", "dob"])
+        for row in STUDENT_ROWS:
+            writer.writerow([value.format(classroom=self.classroom.id) for value in row])
+        return ImportJob.objects.create(
+            school=self.school, created_by=self.admin, kind='students',
+            file=ContentFile(content.getvalue().encode(), name='students.csv'))
+
+    def test_valid_rows_are_created_and_rejected_rows_reported(self):
+        job = self.create_job()
+        path = job.file.name
+        self.assertEqual(process_import_job(job.id), 'completed')
+        job.refresh_from_db()
+
+        self.assertEqual(
+            (job.total_rows, job.processed_rows, job.created_count, job.error_count),
+            (5, 5, 3, 2))
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(
+            sorted(Student.objects.filter(classroom=self.classroom).values_list(
+                'user__email', 'roll_no')),
+            [("a@school.test", 1), ("b@school.test", 2), ("e@school.test", 5)])
+        # Row 5 repeats a roll number saved by the previous batch.
+        self.assertEqual([(error["row"], error["error"]) for error in job.errors], [
+            (4, "'not-an-email' is not a valid email."),
+            (5, "Roll number 2 is already used in this classroom."),
+        ])
+        self.assertNotIn("password", job.errors[0])
+        self.assertFalse(job.file)
+        self.assertFalse(job.file.storage.exists(path))
+
+    def test_error_report_is_a_csv_without_passwords(self):
+        job = self.create_job()
+        process_import_job(job.id)
+
+        response = client_for(self.admin).get(url('import-job-errors', pk=job.id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(response.content.decode())))
+        self.assertEqual([(row["row"], row["email"]) for row in rows],
+                         [("4", "not-an-email"), ("5", "d@school.test")])
+        self.assertNotIn("password", rows[0])
@@ -0,0 +1,122 @@
+import csv
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework import permissions, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from school_erp_backend.permissions import IsSchoolAdmin
+from utils.restful_response import send_response
+from utils.data_constants import ResponseMessages
+from utils.pagination import paginate_or_stream
+from .models import ImportJob
+from .serializers import ImportJobSerializer
+from .tasks import process_import_job
+
+# Create your views here.
+
+
+def queue_import_job(request, kind, uploaded_file):
+    """
+    Stores the uploaded file as an ImportJob and queues it for the worker
+    once the job row is committed. Returns a 202 response with the job.
+    """
+    job = ImportJob.objects.create(
+        school=request.user.school,
+        created_by=request.user,
+        kind=kind,
+        file=uploaded_file,
+    )
+    transaction.on_commit(lambda: process_import_job.delay(job.id))
+    return send_response(
+        data=ImportJobSerializer(job).data,
+        message="File accepted for processing.",
+        status_code=status.HTTP_202_ACCEPTED
+    )
+
+
+class ImportJobListCreateAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+    parser_classes = [MultiPartParser]
+
+    def get(self, request):
+        jobs = ImportJob.objects.filter(school=request.user.school)
+        return paginate_or_stream(request, jobs, ImportJobSerializer)
+
+    @swagger_auto_schema(
+        operation_description="Upload a .csv/.xlsx file to import in the background. "
+        "Columns per kind: students/teachers take email, name, password, phone, address "
+        "plus their profile fields; student_fees take student_id, fee_structure_id, month, "
+        "amount, discount; exam_results take exam_subject_id, student_id, marks_obtained, remarks.",
+        manual_parameters=[
+            openapi.Parameter(
+                name='kind',
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_STRING,
+                enum=[kind for kind, _ in ImportJob.KIND_CHOICES if kind != 'classrooms'],
+                required=True,
+            ),
+            openapi.Parameter(
+                name='file',
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_FILE,
+                required=True,
+                description="File (.csv or .xlsx) with a header row",
+            ),
+        ],
+        responses={202: "Upload queued; poll the returned import job", 400: "Bad Request"},
+    )
+    def post(self, request):
+        kind = request.data.get('kind')
+        uploaded_file = request.FILES.get('file')
+
+        if kind not in dict(ImportJob.KIND_CHOICES) or kind == 'classrooms':
+            return send_response(
+                message="Invalid import kind.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        if not uploaded_file or not uploaded_file.name.lower().endswith(('.csv', '.xlsx')):
+            return send_response(
+                message="Upload a .csv or .xlsx file.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        return queue_import_job(request, kind, uploaded_file)
+
+
+class ImportJobDetailAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    def get(self, request, pk):
+        job = ImportJob.objects.filter(
+            pk=pk, school=request.user.school).first()
+        if not job:
+            return send_response(
+                message=ResponseMessages.NOT_FOUND,
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        return send_response(data=ImportJobSerializer(job).data)
+
+
+class ImportJobErrorReportAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+
+    def get(self, request, pk):
+        errors = ImportJob.objects.filter(
+            pk=pk, school=request.user.school).values_list('errors', flat=True).first()
+        if errors is None:
+            return send_response(
+                message=ResponseMessages.NOT_FOUND,
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+
+        columns = []
+        for row in errors:
+            columns += [key for key in row if key not in columns]
+
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="import_{pk}_errors.csv"'
+        writer = csv.DictWriter(response, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(errors)
+        return response
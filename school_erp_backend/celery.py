@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from utils.metrics import register_celery_metrics
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'school_erp_backend.settings')
 
@@ -8,3 +9,5 @@ app = Celery('school_erp_backend')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
 app.autodiscover_tasks()
+
+register_celery_metrics()
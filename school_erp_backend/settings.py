@@ -50,12 +50,15 @@ INSTALLED_APPS = [
     'attendances',
     'fees',
     'exams',
+    'imports',
 ]
 
 AUTH_USER_MODEL = 'users.User'
 
 MIDDLEWARE = [
+    'utils.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'utils.query_budget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -137,6 +140,10 @@ import os
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# Uploaded files (bulk import sources). Workers must share this directory.
+MEDIA_URL = 'media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -146,6 +153,10 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'utils.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5
@@ -169,11 +180,143 @@ SWAGGER_SETTINGS = {
     },
 }
 
+# Cache config
+# Redis when CACHE_URL is set, otherwise a per-process local-memory cache.
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'school_erp',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'school-erp',
+        }
+    }
+
+# Per-school list caching and 304 answers (utils.tenant_cache,
+# utils.conditional) rely on version stamps that every web and Celery
+# process sees, so they are only on with a shared cache. On the local-memory
+# fallback a write in one process would leave the others serving stale data.
+TENANT_CACHE_ENABLED = bool(CACHE_URL)
+
+# Seconds a cached tenant list stays valid (writes invalidate it earlier)
+TENANT_CACHE_TTL = config('TENANT_CACHE_TTL', default=300, cast=int)
+
+# Rows validated and inserted per transaction by the bulk importers
+IMPORT_BATCH_SIZE = config('IMPORT_BATCH_SIZE', default=500, cast=int)
+
+# Query budgets (utils.query_budget.QueryBudgetMiddleware)
+# Maximum queries of a GET/HEAD by URL name, including the two queries that
+# load the JWT user and its school.
+# Writes and unlisted URLs use DEFAULT_QUERY_BUDGET.
+QUERY_BUDGETS = {
+    # school admin
+    'list-create-user': 4,
+    'classroom-create': 4,
+    'classroom-detail': 3,
+    'import-job-list-create': 3,
+    'import-job-detail': 3,
+    'import-job-errors': 3,
+    'subject-create': 4,
+    'subject-detail': 3,
+    'cs-create': 4,
+    'cs-detail': 3,
+    'teacher-list-create': 4,
+    'teacher-detail': 3,
+    'student-list-create': 5,
+    'student-detail': 3,
+    'exam-list-create': 4,
+    'exam-detail': 4,
+    'exam-subject-list-create': 3,
+    'exam-subject-detail': 5,
+    'exam-result-list-create': 3,
+    'exam-result-detail': 3,
+    'fee-category': 3,
+    'fee-category-update': 3,
+    'fee-structure': 3,
+    'fee-structure-update': 3,
+    'fee-student': 3,
+    'fee-student-update': 3,
+    'fee-dues': 3,
+    'fee-analytics-collections': 3,
+    'fee-analytics-outstanding': 3,
+    'fee-analytics-collection-rate': 4,
+    'fee-payment': 3,
+    'fee-payment-update': 3,
+    'student-attendance': 3,
+    'student-attendance-update': 6,
+    'student-attendance-percentage': 5,
+    'student-attendance-history': 5,
+    'student-attendance-low': 3,
+    'student-attendance-streaks': 5,
+    'teacher-attendance': 3,
+    'teacher-attendance-register': 3,
+    'teacher-attendance-update': 6,
+    # teacher
+    'teacher-profile': 3,
+    'teacher-classrooms-subjects': 4,
+    'teacher-students': 4,
+    'mark-attendance': 7,
+    'class-result-summary': 6,
+    # student
+    'student-profile': 3,
+    'student-exam-timetable': 4,
+    'student-attendance-own': 5,
+    'student-attendance-summary': 6,
+    'student-exam-results': 4,
+    'student-fees': 4,
+    'student-classroom-subjects': 5,
+    'student-report-card': 5,
+}
+DEFAULT_QUERY_BUDGET = config('DEFAULT_QUERY_BUDGET', default=30, cast=int)
+# One SQL shape run this many times in a request is reported as an N+1
+QUERY_REPEAT_THRESHOLD = config('QUERY_REPEAT_THRESHOLD', default=10, cast=int)
+# Raise instead of logging a warning; turn on in tests and CI
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=False, cast=bool)
+
+# Metrics (utils.metrics), scraped from /metrics
+# Bearer token required to read /metrics; when empty the endpoint answers 403
+# (open only with DEBUG on)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+# Port of the Celery worker's own metrics exporter; 0 disables it
+CELERY_METRICS_PORT = config('CELERY_METRICS_PORT', default=0, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # INFO logs every request's query count and timings, WARNING only
+        # the requests over budget or with an N+1
+        'utils.query_budget': {
+            'handlers': ['console'],
+            'level': config('QUERY_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
 # Celery config
 CELERY_BROKER_URL = config('CELERY_BROKER_URL')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
+CELERY_BEAT_SCHEDULE = {
+    'refresh-fee-collection-rollups': {
+        'task': 'fees.tasks.refresh_fee_collection_rollups_task',
+        'schedule': config('FEE_ROLLUP_INTERVAL', default=900, cast=int),
+        # Recompute from this many days back, besides the dirty days
+        'kwargs': {'trailing_days': config('FEE_ROLLUP_TRAILING_DAYS', default=2, cast=int)},
+    },
+}
 
 # Email backend config (you can use Gmail SMTP, SendGrid, etc.)
 EMAIL_BACKEND = config('EMAIL_BACKEND')
@@ -21,6 +21,7 @@ from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from django.conf import settings
 from django.conf.urls.static import static
+from utils.metrics import metrics_view
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -40,6 +41,7 @@ urlpatterns = [
     path('api/school-admin/', include('users.urls')),
     path('api/teacher/', include('teachers.urls')),
     path('api/student/', include('students.urls')),
+    path('metrics', metrics_view, name='metrics'),
 
     # Swagger
     re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), 
@@ -0,0 +1,35 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from schools.tenancy import BACKFILL_BATCH_SIZE, SchoolScopedModel, backfill_school
+
+
+def school_scoped_models():
+    """Models with a denormalised school; parents (fees) before children (payments)."""
+    models = [model for model in apps.get_models() if issubclass(model, SchoolScopedModel)]
+    return sorted(models, key=lambda model: issubclass(
+        model._meta.get_field(model.school_path.split('__')[0]).related_model,
+        SchoolScopedModel))
+
+
+class Command(BaseCommand):
+    help = ("Fill the denormalised school of rows that have none (written "
+            "before the column existed or by older code), in batches.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append',
+                            help="app_label.Model; repeatable (default: all).")
+        parser.add_argument('--batch-size', type=int, default=BACKFILL_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        models = school_scoped_models()
+        if options['model']:
+            labels = {label.lower() for label in options['model']}
+            unknown = labels - {model._meta.label_lower for model in models}
+            if unknown:
+                raise CommandError(f"Not school scoped: {', '.join(sorted(unknown))}.")
+            models = [model for model in models if model._meta.label_lower in labels]
+
+        for model in models:
+            updated = backfill_school(model, model.school_path, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.label}: filled the school of {updated} rows."))
@@ -0,0 +1,113 @@
+import datetime
+import os
+import time
+from multiprocessing import Pool
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from benchmarks.data import EMAIL_DOMAIN, PASSWORD, ScaleConfig, generate_school
+from fees.analytics import refresh_fee_collection_rollups
+from users.models import User
+
+
+def _seed_school(task):
+    number, config, seed, password, copy, rollups = task
+    started = time.perf_counter()
+    try:
+        result = generate_school(number, config, seed=seed, password=password,
+                                 rollups=rollups, copy=copy)
+    finally:
+        # Pool processes outlive the task; do not leave a session open per school.
+        connections.close_all()
+    return number, result["school"].id, result["counts"], time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = ("Generate synthetic schools (users, classrooms, attendance, exams, "
+            "fees, payments) for benchmarks and index tuning. Each school is "
+            "deterministic from --seed and its number and is generated in its "
+            "own process.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schools', type=int, default=1)
+        parser.add_argument('--start', type=int, default=1,
+                            help="Number of the first school, to add schools to "
+                                 "an already seeded database.")
+        parser.add_argument('--classrooms', type=int, default=ScaleConfig.classrooms)
+        parser.add_argument('--students', type=int, default=ScaleConfig.students_per_classroom,
+                            help="Students per classroom.")
+        parser.add_argument('--teachers', type=int, default=ScaleConfig.extra_teachers,
+                            help="Teachers besides the class teachers.")
+        parser.add_argument('--subjects', type=int, default=ScaleConfig.subjects)
+        parser.add_argument('--exams', type=int, default=ScaleConfig.exams)
+        parser.add_argument('--days', type=int, default=ScaleConfig.attendance_days,
+                            help="School days of attendance.")
+        parser.add_argument('--fee-months', type=int, default=ScaleConfig.fee_months)
+        parser.add_argument('--monthly-fee', type=int, default=ScaleConfig.monthly_fee)
+        parser.add_argument('--paid-ratio', type=float, default=ScaleConfig.paid_ratio,
+                            help="Share of monthly fees that are paid.")
+        parser.add_argument('--end-date', type=datetime.date.fromisoformat,
+                            help="Last attendance day, YYYY-MM-DD (default: today).")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--workers', type=int,
+                            help="Parallel processes (default: one per CPU).")
+        parser.add_argument('--copy', action='store_true',
+                            help="Write attendance, exam results and payments with "
+                                 "Postgres COPY.")
+        parser.add_argument('--no-rollups', action='store_true',
+                            help="Skip the attendance and fee collection rollups.")
+
+    def handle(self, *args, **options):
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError("--copy needs a PostgreSQL database.")
+        numbers = range(options['start'], options['start'] + options['schools'])
+        taken = User.objects.filter(
+            email__in=[f"s{number}-admin1@{EMAIL_DOMAIN}" for number in numbers]).count()
+        if taken:
+            raise CommandError(
+                f"{taken} of these schools already exist; pass a --start after them.")
+
+        config = ScaleConfig(
+            classrooms=options['classrooms'], students_per_classroom=options['students'],
+            subjects=options['subjects'], extra_teachers=options['teachers'],
+            exams=options['exams'], attendance_days=options['days'],
+            fee_months=options['fee_months'], monthly_fee=options['monthly_fee'],
+            paid_ratio=options['paid_ratio'], end_date=options['end_date'])
+        workers = min(options['workers'] or os.cpu_count() or 1, len(numbers))
+        if connection.vendor == 'sqlite' and workers > 1:
+            # SQLite allows one writer at a time; parallel schools would only
+            # wait on (and time out on) the database lock.
+            self.stdout.write("SQLite: generating schools one at a time.")
+            workers = 1
+
+        password = make_password(PASSWORD)
+        rollups = not options['no_rollups']
+        tasks = [(number, config, options['seed'], password, options['copy'], rollups)
+                 for number in numbers]
+        started = time.perf_counter()
+        totals = {}
+        if workers > 1:
+            # Forked processes must not share the parent's connection.
+            connections.close_all()
+            with Pool(workers, initializer=django.setup) as pool:
+                for result in pool.imap_unordered(_seed_school, tasks):
+                    self._report(result, totals)
+        else:
+            for task in tasks:
+                self._report(_seed_school(task), totals)
+
+        if rollups:
+            refresh_fee_collection_rollups()
+        summary = ', '.join(f"{count} {model}" for model, count in totals.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(numbers)} schools in {time.perf_counter() - started:.1f}s "
+            f"with {workers} workers: {summary}."))
+
+    def _report(self, result, totals):
+        number, school_id, counts, seconds = result
+        for model, count in counts.items():
+            totals[model] = totals.get(model, 0) + count
+        self.stdout.write(
+            f"School {number} (id {school_id}): {counts['students']} students, "
+            f"{counts['attendance']} attendance rows in {seconds:.1f}s.")
@@ -0,0 +1,142 @@
+from django.db import models
+from django.db.models import OuterRef, Subquery
+from schools.models import School
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def _spans_many(model, lookup):
+    for name in lookup.split('__')[:-1]:
+        field = model._meta.get_field(name)
+        if field.many_to_many or field.one_to_many:
+            return True
+        model = field.related_model
+    return False
+
+
+class TenantQuerySet(models.QuerySet):
+    """
+    Tenant scoping for models that name the lookup to their School in
+    `school_lookup`. The ownership check is part of the fetch query, so
+    views neither load a row and then walk its foreign keys, nor repeat
+    the lookup path.
+    """
+
+    def for_school(self, school):
+        """Rows of `school` (instance or id); none without a school."""
+        if school is None:
+            return self.none()
+        queryset = self.filter(**{self.model.school_lookup: school})
+        # Through a many-to-many (exam -> classrooms) a row matches once
+        # per classroom of the school.
+        if _spans_many(self.model, self.model.school_lookup):
+            return queryset.distinct()
+        return queryset
+
+    def for_user(self, user):
+        """Every row for superusers, the rows of the user's school otherwise."""
+        return self if user.is_superuser else self.for_school(user.school_id)
+
+    def get_for_user(self, user, pk):
+        """The row `pk` if `user` may see it, else None, in one query."""
+        return self.for_user(user).filter(pk=pk).first()
+
+
+class TenantManager(models.Manager.from_queryset(TenantQuerySet)):
+    pass
+
+
+class SchoolScopedQuerySet(TenantQuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self.model.fill_school(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class SchoolScopedModel(models.Model):
+    """
+    Base for rows that belong to a school through other rows (a classroom,
+    a student, a fee). The school is copied onto the row so that tenant
+    filters are `school=...` instead of joins up to the classroom.
+    It is derived along `school_path` on save and on bulk_create, unless
+    bulk rows already carry it; queryset.update() does not maintain it.
+    """
+    # Lookup from the model to its School, e.g. 'classroom__school'.
+    school_path = None
+    school_lookup = 'school'
+
+    school = models.ForeignKey(School, on_delete=models.CASCADE, null=True,
+                               blank=True, editable=False, db_index=False)
+
+    objects = SchoolScopedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def fill_school(cls, objs):
+        """Sets the school of the instances that have none, with one query."""
+        missing = [obj for obj in objs if obj.school_id is None]
+        if not missing:
+            return
+        source, _, rest = cls.school_path.partition('__')
+        field = cls._meta.get_field(source)
+        schools = dict(field.related_model._base_manager.filter(
+            pk__in={getattr(obj, field.attname) for obj in missing}
+        ).values_list('pk', rest))
+        for obj in missing:
+            obj.school_id = schools.get(getattr(obj, field.attname))
+
+    def derive_school_id(self):
+        """The school along school_path, from cached relations when loaded."""
+        target = self
+        *hops, last = self.school_path.split('__')
+        for hop in hops:
+            field = target._meta.get_field(hop)
+            if not field.is_cached(target):
+                break
+            target = getattr(target, hop)
+            if target is None:
+                # A nullable hop, e.g. a student without a classroom.
+                return None
+        else:
+            return getattr(target, f'{last}_id')
+
+        source, _, rest = self.school_path.partition('__')
+        field = self._meta.get_field(source)
+        return field.related_model._base_manager.filter(
+            pk=getattr(self, field.attname)).values_list(rest, flat=True).first()
+
+    def save(self, *args, **kwargs):
+        # Derived on every save, so moving a row to another classroom or
+        # fee moves it to that school as well.
+        update_fields = kwargs.get('update_fields')
+        source = self._meta.get_field(self.school_path.split('__')[0])
+        if update_fields is None or {source.name, source.attname} & set(update_fields):
+            self.school_id = self.derive_school_id()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'school'}
+        super().save(*args, **kwargs)
+
+
+def backfill_school(model, school_path, batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Fills the school of rows that have none, walking the primary key in
+    batches of one UPDATE each, so no statement locks the whole table.
+    Works on historical (migration) models too, hence the explicit path.
+    Returns:
+    The number of rows updated.
+    """
+    rows = model._base_manager.filter(school__isnull=True)
+    school = Subquery(model._base_manager.filter(
+        pk=OuterRef('pk')).values(school_path)[:1])
+    updated = 0
+    last_pk = None
+    while True:
+        batch = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        ids = list(batch.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return updated
+        updated += model._base_manager.filter(pk__in=ids).update(school_id=school)
+        last_pk = ids[-1]
@@ -1,3 +1,125 @@
-from django.test import TestCase
+import datetime
+from django.conf import settings
+from django.test import TestCase, override_settings
+from attendances.models import StudentAttendance, TeacherAttendance
+from fees.analytics import refresh_fee_collection_rollups
+from imports.models import ImportJob
+from utils.testing import (
+    client_for, create_admin, create_classroom, create_exam, create_fee,
+    create_fee_structure, create_payment, create_result, create_school, create_student,
+    create_subject, create_teacher, url
+)
 
-# Create your tests here.
+STUDENTS = 12
+ATTENDANCE_DAYS = 15
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class QueryBudgetTests(TestCase):
+    """
+    Requests every URL name in QUERY_BUDGETS with real JWTs, so the counts
+    include loading the user and school. Over budget or an N+1 raises
+    QueryBudgetExceeded from the middleware.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # More students than QUERY_REPEAT_THRESHOLD, so a per-student N+1
+        # shows up as one.
+        school = create_school()
+        cls.admin = create_admin(school)
+        cls.teacher = create_teacher(school)
+        create_teacher(school, username='teacher-2')
+        cls.classroom = create_classroom(school, class_teacher=cls.teacher)
+        students = [create_student(cls.classroom, roll_no) for roll_no in range(1, STUDENTS + 1)]
+        cls.student = students[0]
+        subject, classroom_subject = create_subject(cls.classroom)
+
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+        cls.exam, exam_subject = create_exam(cls.classroom, subject, exam_date=yesterday)
+        results = [create_result(exam_subject, student, marks=40 + index)
+                   for index, student in enumerate(students)]
+
+        structure = create_fee_structure(cls.classroom)
+        fees = [create_fee(student, structure, month=month)
+                for student in students for month in ('Apr', 'May')]
+        payments = [create_payment(fee, 1000, transaction_date=yesterday) for fee in fees[::3]]
+        refresh_fee_collection_rollups()
+
+        attendance = [
+            StudentAttendance.objects.create(
+                student=student, classroom=cls.classroom, status='P' if day % 4 else 'A',
+                date=yesterday - datetime.timedelta(days=day))
+            for day in range(ATTENDANCE_DAYS) for student in students
+        ]
+
+        cls.ids = {
+            'classroom-detail': cls.classroom.id,
+            'subject-detail': subject.id,
+            'cs-detail': classroom_subject.id,
+            'teacher-detail': cls.teacher.id,
+            'student-detail': cls.student.id,
+            'exam-detail': cls.exam.id,
+            'exam-subject-detail': exam_subject.id,
+            'exam-result-detail': results[0].id,
+            'fee-category-update': structure.category_id,
+            'fee-structure-update': structure.id,
+            'fee-student-update': fees[0].id,
+            'fee-payment-update': payments[0].id,
+            'student-attendance-update': attendance[0].id,
+            'teacher-attendance-update': TeacherAttendance.objects.create(
+                teacher=cls.teacher, date=datetime.date.today(), status='P').id,
+        }
+        job = ImportJob.objects.create(
+            school=school, created_by=cls.admin, kind='students', file='imports/students.csv',
+            status='completed', errors=[{"row": 2, "reason": "Duplicate roll number"}])
+        cls.ids['import-job-detail'] = cls.ids['import-job-errors'] = job.id
+
+    def steps(self):
+        """(url_name, client, path) of every GET the test makes."""
+        admin = client_for(self.admin)
+        teacher = client_for(self.teacher.user)
+        student = client_for(self.student.user)
+        in_classroom = f'?classroom={self.classroom.id}'
+
+        for url_name in settings.QUERY_BUDGETS:
+            if url_name in self.ids:
+                yield url_name, admin, url(url_name, pk=self.ids[url_name])
+        for url_name in [
+            'list-create-user', 'classroom-create', 'import-job-list-create',
+            'subject-create', 'cs-create', 'teacher-list-create', 'student-list-create',
+            'exam-list-create', 'exam-subject-list-create', 'exam-result-list-create',
+            'fee-category', 'fee-structure', 'fee-student', 'fee-analytics-collections',
+            'fee-analytics-outstanding', 'fee-analytics-collection-rate', 'fee-payment',
+            'student-attendance', 'student-attendance-low', 'teacher-attendance',
+            'teacher-attendance-register',
+        ]:
+            yield url_name, admin, url(url_name)
+        for url_name in ['fee-dues', 'student-attendance-percentage',
+                         'student-attendance-history', 'student-attendance-streaks']:
+            yield url_name, admin, url(url_name, in_classroom)
+
+        yield 'teacher-profile', teacher, url('teacher-profile')
+        yield 'teacher-classrooms-subjects', teacher, url('teacher-classrooms-subjects')
+        yield 'teacher-students', teacher, url('teacher-students')
+        yield 'mark-attendance', teacher, url('mark-attendance', classroom_id=self.classroom.id)
+        yield 'class-result-summary', teacher, url(
+            'class-result-summary', f'?exam_id={self.exam.id}', classroom_id=self.classroom.id)
+
+        for url_name in [
+            'student-profile', 'student-exam-timetable', 'student-attendance-own',
+            'student-attendance-summary', 'student-exam-results', 'student-fees',
+            'student-classroom-subjects', 'student-report-card',
+        ]:
+            yield url_name, student, url(url_name)
+
+    def test_reads_stay_within_their_budget(self):
+        requested = set()
+        for url_name, client, path in self.steps():
+            with self.subTest(url_name=url_name):
+                response = client.get(path)
+                self.assertEqual(response.status_code, 200, path)
+            requested.add(url_name)
+
+        self.assertEqual(set(settings.QUERY_BUDGETS) - requested, set(),
+                         "Budgeted URL names without a request in this test")
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
+
+    def ready(self):
+        from utils.tenant_cache import register_tenant_cache
+        from .models import Student
+
+        register_tenant_cache(Student, lambda obj: obj.user.school_id)
@@ -0,0 +1,55 @@
+from classrooms.models import Classroom
+from users.importers import USER_COLUMNS, create_users, validate_new_users
+from utils.importers import (
+    BaseImporter, Column, ForeignKeyColumn, choice_parser, parse_date_value, parse_int
+)
+from utils.tenant_cache import invalidate_tenant_cache
+from .models import Student
+
+
+class StudentImporter(BaseImporter):
+    """Creates a STUDENT user and its Student profile per row."""
+
+    columns = USER_COLUMNS + [
+        ForeignKeyColumn('classroom_id', field='classroom'),
+        Column('roll_no', parser=parse_int),
+        Column('gender', parser=choice_parser(
+            Student._meta.get_field('gender').choices)),
+        Column('dob', parser=parse_date_value),
+    ]
+
+    def get_classroom_queryset(self):
+        return Classroom.objects.filter(school=self.school)
+
+    def validate_batch(self, rows):
+        validate_new_users(rows)
+
+        keys = {(row.data['classroom'].id, row.data['roll_no'])
+                for row in rows if row.error is None}
+        taken = set(Student.objects.filter(
+            classroom_id__in={classroom_id for classroom_id, _ in keys},
+            roll_no__in={roll_no for _, roll_no in keys},
+        ).values_list('classroom_id', 'roll_no'))
+        for row in rows:
+            if row.error is not None:
+                continue
+            key = (row.data['classroom'].id, row.data['roll_no'])
+            if key in taken:
+                row.reject(
+                    f"Roll number {key[1]} is already used in this classroom.")
+            taken.add(key)
+
+    def save_batch(self, rows):
+        users = create_users(rows, 'STUDENT', self.school)
+        Student.objects.bulk_create([
+            Student(
+                user=user,
+                classroom=row.data['classroom'],
+                roll_no=row.data['roll_no'],
+                gender=row.data['gender'],
+                dob=row.data['dob'],
+            )
+            for row, user in zip(rows, users)
+        ])
+        invalidate_tenant_cache(self.school.id, Student)
+        self.created += len(rows)
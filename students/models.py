@@ -1,6 +1,7 @@
 from django.db import models
 from classrooms.models import Classroom
 from users.models import User
+from schools.tenancy import TenantManager
 
 # Create your models here.
 
@@ -16,6 +17,9 @@ class Student(models.Model):
     dob = models.DateField()
     enrollment_date = models.DateField(auto_now_add=True)
 
+    objects = TenantManager()
+    school_lookup = 'user__school'
+
     class Meta:
         unique_together = ['classroom', 'roll_no']
 
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Student
 from users.models import User
+from utils.serializers import ValuesSerializer
 
 
 class StudentSerializer(serializers.ModelSerializer):
@@ -22,10 +23,14 @@ class StudentSerializer(serializers.ModelSerializer):
             return data
         
         if request.user.role == 'SCHOOL_ADMIN':
-            if user and user.school != request.user.school:
+            if user and user.school_id != request.user.school_id:
                 raise serializers.ValidationError(
                     "student user must belong to your school.")
-            if classroom and classroom.school != request.user.school:
+            if classroom and classroom.school_id != request.user.school_id:
                 raise serializers.ValidationError(
                     "Classroom must belong to your school.")
         return data
+
+
+class StudentReadSerializer(ValuesSerializer):
+    model_serializer = StudentSerializer
@@ -3,6 +3,7 @@ from .views import (
     StudentProfileAPIView,
     ExamTimetableAPIView,
     StudentAttendanceAPIView,
+    StudentAttendanceSummaryAPIView,
     StudentExamResultsAPIView,
     StudentFeeDetailsAPIView,
     StudentClassroomSubjectsAPIView,
@@ -10,11 +11,20 @@ from .views import (
 )
 
 urlpatterns = [
-    path('profile/', StudentProfileAPIView.as_view()),
-    path('timetable/exams/', ExamTimetableAPIView.as_view()),
-    path('attendance/', StudentAttendanceAPIView.as_view()),
-    path('exam-results/', StudentExamResultsAPIView.as_view()),
-    path('fees/', StudentFeeDetailsAPIView.as_view()),
-    path('classroom-subjects/', StudentClassroomSubjectsAPIView.as_view()),
-    path('report-card/', StudentReportCardAPIView.as_view()),
+    path('profile/', StudentProfileAPIView.as_view(),
+         name='student-profile'),
+    path('timetable/exams/', ExamTimetableAPIView.as_view(),
+         name='student-exam-timetable'),
+    path('attendance/', StudentAttendanceAPIView.as_view(),
+         name='student-attendance-own'),
+    path('attendance/summary/', StudentAttendanceSummaryAPIView.as_view(),
+         name='student-attendance-summary'),
+    path('exam-results/', StudentExamResultsAPIView.as_view(),
+         name='student-exam-results'),
+    path('fees/', StudentFeeDetailsAPIView.as_view(),
+         name='student-fees'),
+    path('classroom-subjects/', StudentClassroomSubjectsAPIView.as_view(),
+         name='student-classroom-subjects'),
+    path('report-card/', StudentReportCardAPIView.as_view(),
+         name='student-report-card'),
 ]
@@ -2,13 +2,15 @@ from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from attendances.models import StudentAttendance
-from exams.models import ExamSubject, ExamResult
-from exams.serializers import ExamResultSerializer
+from attendances.analytics import attendance_streaks, student_attendance_summary
+from attendances.bitmaps import attendance_records
+from exams.models import Exam, ExamSubject, ExamResult
+from exams.serializers import ExamResultReadSerializer
+from exams.services import build_report_card
 from .models import Student
 from users.models import User
 from users.serializers import UserListSerializer
-from .serializers import StudentSerializer
+from .serializers import StudentSerializer, StudentReadSerializer
 from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
 from utils.restful_response import send_response
@@ -16,10 +18,11 @@ from utils.data_constants import ResponseMessages
 from rest_framework.pagination import PageNumberPagination
 from school_erp_backend.permissions import IsSchoolAdmin, IsStudent
 from rest_framework.permissions import IsAuthenticated
-from attendances.serializers import StudentAttendanceSerializer
 from fees.models import StudentFee
-from fees.serializers import StudentFeeSerializer
-from subjects.models import ClassroomSubject
+from fees.serializers import StudentFeeReadSerializer
+from subjects.models import ClassroomSubject, Subject
+from utils.conditional import conditional_get
+from utils.query_params import bounded_date_range, date_range_parameters, get_date_range
 from subjects.serializers import ClassroomSubjectSerializer
 # Create your views here.
 
@@ -28,12 +31,12 @@ class StudentListCreateAPIView(APIView):
     permission_classes = [IsAuthenticated, IsSchoolAdmin]
 
     def get(self, request):
-        school = request.user.school
-        students = Student.objects.filter(user__school=school)
+        school_id = request.user.school_id
+        students = Student.objects.for_school(school_id)
         student_users_ids = students.values_list('user_id', flat=True)
 
         users = User.objects.filter(
-            role='STUDENT', school=school
+            role='STUDENT', school_id=school_id
         ).exclude(id__in=student_users_ids)
 
         # pagination
@@ -42,10 +45,10 @@ class StudentListCreateAPIView(APIView):
         # paginator.page_size = 5
 
         student_results = student_paginator.paginate_queryset(
-            students, request)
+            StudentReadSerializer.values(students), request)
         user_results = user_paginator.paginate_queryset(users, request)
 
-        student_data = StudentSerializer(student_results, many=True).data
+        student_data = StudentReadSerializer(student_results, many=True).data
         user_data = UserListSerializer(user_results, many=True).data
 
         data = {
@@ -99,9 +102,11 @@ class StudentRetrieveUpdateDeleteAPIView(APIView):
     permission_classes = [IsAuthenticated, IsSchoolAdmin]
 
     def get_object(self, pk, user):
+        # The cache invalidation on save and delete reads user.school_id.
+        students = Student.objects.select_related('user')
         if user.role == 'SCHOOL_ADMIN':
-            return get_object_or_404(Student, pk=pk, user__school=user.school)
-        return get_object_or_404(Student, pk=pk)
+            students = students.for_school(user.school_id)
+        return get_object_or_404(students, pk=pk)
 
     def get(self, request, pk):
         student = self.get_object(pk, request.user)
@@ -162,9 +167,11 @@ class StudentProfileAPIView(APIView):
 class ExamTimetableAPIView(APIView):
     permission_classes = [IsAuthenticated, IsStudent]
 
+    @conditional_get(ExamSubject, Exam, Subject, Student)
     def get(self, request):
         student = Student.objects.get(user=request.user)
-        exam_subjects = ExamSubject.objects.filter(classroom=student.classroom)
+        exam_subjects = ExamSubject.objects.filter(
+            classroom_id=student.classroom_id).select_related('exam', 'subject')
         data = [{
             "exam": es.exam.title,
             "subject": es.subject.name,
@@ -176,12 +183,51 @@ class ExamTimetableAPIView(APIView):
 
 class StudentAttendanceAPIView(APIView):
     permission_classes = [IsAuthenticated, IsStudent]
+    max_history_days = 366
 
+    @swagger_auto_schema(
+        operation_description="Own attendance, including months moved to the bitmap "
+        "archive (their rows have a null id). Defaults to the last 366 days; a "
+        "range covers at most 366 days.",
+        manual_parameters=date_range_parameters
+    )
     def get(self, request):
+        try:
+            date_from, date_to = get_date_range(request)
+        except ValueError:
+            return send_response(
+                message="Dates must be in YYYY-MM-DD format.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        date_from, date_to = bounded_date_range(date_from, date_to, self.max_history_days)
+        if date_from is None:
+            return send_response(
+                message=f"from must be on or before to, at most {self.max_history_days} days apart.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
         student = Student.objects.get(user=request.user)
-        attendance = StudentAttendance.objects.filter(student=student)
-        serializer = StudentAttendanceSerializer(attendance, many=True)
-        return send_response(data=serializer.data)
+        data = [
+            {"id": row["id"], "student": row["student_id"], "classroom": row["classroom_id"],
+             "date": row["date"], "status": row["status"]}
+            for row in attendance_records(
+                student_ids=[student.id], date_from=date_from, date_to=date_to)
+        ]
+        return send_response(data=data)
+
+
+class StudentAttendanceSummaryAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsStudent]
+
+    @swagger_auto_schema(
+        operation_description="Own attendance percentage per month and current streaks."
+    )
+    def get(self, request):
+        student = get_object_or_404(Student, user=request.user)
+        data = student_attendance_summary(student.id)
+        streaks = attendance_streaks(student_ids=[student.id])
+        data["streaks"] = streaks[0] if streaks else None
+        return send_response(data=data)
 
 
 class StudentExamResultsAPIView(APIView):
@@ -190,7 +236,7 @@ class StudentExamResultsAPIView(APIView):
     def get(self, request):
         student = Student.objects.get(user=request.user)
         results = ExamResult.objects.filter(student=student)
-        serializer = ExamResultSerializer(results, many=True)
+        serializer = ExamResultReadSerializer(results, many=True)
         return send_response(data=serializer.data)
 
 
@@ -200,13 +246,14 @@ class StudentFeeDetailsAPIView(APIView):
     def get(self, request):
         student = Student.objects.get(user=request.user)
         fees = StudentFee.objects.filter(student=student)
-        serializer = StudentFeeSerializer(fees, many=True)
+        serializer = StudentFeeReadSerializer(fees, many=True)
         return send_response(data=serializer.data)
 
 
 class StudentClassroomSubjectsAPIView(APIView):
     permission_classes = [IsAuthenticated, IsStudent]
 
+    @conditional_get(ClassroomSubject, Student)
     def get(self, request):
         try:
             student = Student.objects.get(user=request.user)
@@ -227,18 +274,5 @@ class StudentReportCardAPIView(APIView):
 
     def get(self, request):
         student = Student.objects.get(user=request.user)
-        results = ExamResult.objects.filter(student=student)
-
-        report = {}
-        for result in results:
-            exam = result.exam_subject.exam.title
-            if exam not in report:
-                report[exam] = []
-            report[exam].append({
-                "subject": result.exam_subject.subject.name,
-                "marks": result.marks_obtained,
-                "total": result.exam_subject.total_marks,
-                "remarks": result.remarks
-            })
-
+        report = build_report_card(student)
         return send_response(data=report)
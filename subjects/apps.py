@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class SubjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'subjects'
+
+    def ready(self):
+        from utils.tenant_cache import register_tenant_cache
+        from .models import Subject, ClassroomSubject
+
+        register_tenant_cache(Subject, lambda obj: obj.school_id)
+        register_tenant_cache(
+            ClassroomSubject, lambda obj: obj.classroom.school_id)
@@ -2,11 +2,13 @@ from rest_framework import generics, permissions
 from ..models import ClassroomSubject
 from ..serializers.classroom_subject import ClassroomSubjectSerializer
 from school_erp_backend.permissions import IsSchoolAdmin
+from utils.tenant_cache import TenantCachedListMixin
 
 
-class ClassroomSubjectListCreateView(generics.ListCreateAPIView):
+class ClassroomSubjectListCreateView(TenantCachedListMixin, generics.ListCreateAPIView):
     serializer_class = ClassroomSubjectSerializer
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+    cache_model = ClassroomSubject
 
     def get_queryset(self):
         return ClassroomSubject.objects.filter(classroom__school=self.request.user.school)
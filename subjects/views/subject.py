@@ -9,11 +9,13 @@ import openpyxl
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from school_erp_backend.permissions import IsSchoolAdmin
+from utils.tenant_cache import TenantCachedListMixin, invalidate_tenant_cache
 
 
-class SubjectListCreateView(generics.ListCreateAPIView):
+class SubjectListCreateView(TenantCachedListMixin, generics.ListCreateAPIView):
     serializer_class = SubjectSerializer
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
+    cache_model = Subject
 
     def get_queryset(self):
         return Subject.objects.filter(school=self.request.user.school)
@@ -74,6 +76,7 @@ class SubjectBulkUploadView(APIView):
 
         if created:
             Subject.objects.bulk_create(created)
+            invalidate_tenant_cache(request.user.school_id, Subject)
             return send_response(
                 message=f"{len(created)} subjects uploaded successfully.",
                 status_code=status.HTTP_200_OK
@@ -0,0 +1,40 @@
+from users.importers import USER_COLUMNS, create_users, validate_new_users
+from utils.importers import (
+    BaseImporter, Column, choice_parser, parse_date_value, parse_int
+)
+from .models import Teacher
+
+
+class TeacherImporter(BaseImporter):
+    """Creates a TEACHER user and its Teacher profile per row."""
+
+    columns = USER_COLUMNS + [
+        Column('qualification', max_length=100),
+        Column('experience', parser=parse_int),
+        Column('gender', parser=choice_parser(Teacher.GENDER_CHOICES)),
+        Column('subject_spec', max_length=100),
+        Column('dob', parser=parse_date_value),
+        Column('join_date', parser=parse_date_value),
+    ]
+
+    def validate_batch(self, rows):
+        validate_new_users(rows)
+        for row in rows:
+            if row.error is None and row.data['experience'] < 0:
+                row.reject("'experience' cannot be negative.")
+
+    def save_batch(self, rows):
+        users = create_users(rows, 'TEACHER', self.school)
+        Teacher.objects.bulk_create([
+            Teacher(
+                user=user,
+                qualification=row.data['qualification'],
+                experience=row.data['experience'],
+                gender=row.data['gender'],
+                subject_spec=row.data['subject_spec'],
+                dob=row.data['dob'],
+                join_date=row.data['join_date'],
+            )
+            for row, user in zip(rows, users)
+        ])
+        self.created += len(rows)
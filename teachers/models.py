@@ -1,5 +1,6 @@
 from django.db import models
 from school_erp_backend import settings
+from schools.tenancy import TenantManager
 
 # Create your models here.
 
@@ -20,5 +21,8 @@ class Teacher(models.Model):
     dob = models.DateField(verbose_name='Date of Birth')
     join_date = models.DateField()
 
+    objects = TenantManager()
+    school_lookup = 'user__school'
+
     def __str__(self):
         return f"{self.user.name} ({self.subject_spec})"
@@ -6,19 +6,26 @@ from users.models import User
 from .serializers import TeacherSerializer, TeacherProfileSerializer
 from users.serializers import UserListSerializer
 from rest_framework.views import APIView
+from rest_framework.parsers import JSONParser, MultiPartParser
 from utils.restful_response import send_response
 from utils.data_constants import ResponseMessages
+from utils.file_readers import iter_uploaded_rows
 from django.shortcuts import get_object_or_404
 from subjects.models import ClassroomSubject
 from subjects.serializers import ClassroomSubjectSerializer
 from students.models import Student
-from students.serializers import StudentSerializer
+from students.serializers import StudentReadSerializer
 from school_erp_backend.permissions import IsSchoolAdmin, IsTeacher
 from classrooms.models import Classroom
 from attendances.models import StudentAttendance
-from attendances.serializers import StudentAttendanceSerializer
+from attendances.services import (
+    class_attendance_register, mark_class_attendance, parse_register_payload
+)
 from exams.serializers import ExamSerializer
-from exams.models import Exam, ExamSubject, ExamResult
+from exams.models import Exam, ExamSubject
+from exams.services import class_result_summary, upsert_exam_marks
+from utils.query_params import date_range_parameters, get_date_range, get_int_param
+from utils.conditional import conditional_get
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
@@ -28,13 +35,12 @@ class TeacherListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get_queryset(self):
-        return Teacher.objects.filter(user__school=self.request.user.school)
+        return Teacher.objects.for_school(self.request.user.school_id)
 
     def get_serializer_context(self):
         return {'request': self.request}
 
     def list(self, request, *args, **kwargs):
-        school = request.user.school
         teachers = self.get_queryset()
         teachers_data = TeacherSerializer(
             teachers,
@@ -45,7 +51,7 @@ class TeacherListCreateView(generics.ListCreateAPIView):
         teachers_users_id = teachers.values_list('user_id', flat=True)
         user_without_profile = User.objects.filter(
             role='TEACHER',
-            school=school
+            school_id=request.user.school_id
         ).exclude(id__in=teachers_users_id)
 
         user_data = UserListSerializer(
@@ -67,7 +73,7 @@ class TeacherRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, IsSchoolAdmin]
 
     def get_queryset(self):
-        return Teacher.objects.filter(user__school=self.request.user.school)
+        return Teacher.objects.for_school(self.request.user.school_id)
 
     def get_serializer_context(self):
         return {'request': self.request}
@@ -129,9 +135,8 @@ class StudentInClassSubjectAPIView(APIView):
         teacher = get_object_or_404(Teacher, user=request.user)
         classroom_ids = ClassroomSubject.objects.filter(
             teacher=teacher).values_list('classroom_id', flat=True).distinct()
-        students = Student.objects.filter(
-            classroom_id__in=classroom_ids).select_related('classroom')
-        serializer = StudentSerializer(students, many=True)
+        students = Student.objects.filter(classroom_id__in=classroom_ids)
+        serializer = StudentReadSerializer(students, many=True)
         return send_response(
             data=serializer.data,
             message=ResponseMessages.DATA_FETCH_SUCCESS,
@@ -141,7 +146,17 @@ class StudentInClassSubjectAPIView(APIView):
 
 class MarkAttendanceAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsTeacher]
+    max_register_days = 366
 
+    @swagger_auto_schema(
+        operation_description="Student x day register of the classroom. Each "
+        "student's range is one string with a character per day (P, A, or - when "
+        "unmarked). Defaults to the current month so far. Supports If-None-Match.",
+        manual_parameters=date_range_parameters
+    )
+    # The default range ends today, so the date is part of the ETag.
+    @conditional_get(StudentAttendance, Student,
+                     extra_key=lambda request, *args, **kwargs: date.today())
     def get(self, request, classroom_id):
         classroom = get_object_or_404(Classroom, id=classroom_id)
         teacher = get_object_or_404(Teacher, user=request.user)
@@ -149,29 +164,49 @@ class MarkAttendanceAPIView(APIView):
         if classroom.class_teacher != teacher:
             return Response({'error': 'You are not the class teacher of this classroom.'}, status=status.HTTP_403_FORBIDDEN)
 
-        records = StudentAttendance.objects.filter(
-            classroom=classroom).select_related('student')
-        serializer = StudentAttendanceSerializer(records, many=True)
+        try:
+            date_from, date_to = get_date_range(request)
+        except ValueError:
+            return send_response(
+                message="Dates must be in YYYY-MM-DD format.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        date_to = date_to or date.today()
+        date_from = date_from or date_to.replace(day=1)
+        if not 0 <= (date_to - date_from).days < self.max_register_days:
+            return send_response(
+                message=f"from must be on or before to, at most {self.max_register_days} days apart.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
         return send_response(
-            data=serializer.data,
+            data=class_attendance_register(classroom, date_from, date_to),
             status_code=status.HTTP_200_OK
         )
 
     attendance_schema = openapi.Schema(
-        type=openapi.TYPE_ARRAY,
-        items=openapi.Items(
-            type=openapi.TYPE_OBJECT,
-            properties={
-                'student_id': openapi.Schema(type=openapi.TYPE_INTEGER),
-                'status': openapi.Schema(type=openapi.TYPE_STRING, enum=['P', 'A']),
-            },
-            required=['student_id', 'status']
-        )
+        type=openapi.TYPE_OBJECT,
+        description="A bare list of records is also accepted and marks today's date.",
+        properties={
+            'date': openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+            'records': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Items(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'student_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'status': openapi.Schema(type=openapi.TYPE_STRING, enum=['P', 'A']),
+                    },
+                    required=['student_id', 'status']
+                )
+            ),
+        },
+        required=['records']
     )
 
     @swagger_auto_schema(
         request_body=attendance_schema,
-        responses={200: 'Attendance marked successfully.'}
+        responses={202: 'Attendance marked successfully.'}
     )
     def post(self, request, classroom_id):
         teacher = get_object_or_404(Teacher, user=request.user)
@@ -185,22 +220,22 @@ class MarkAttendanceAPIView(APIView):
                 status_code=status.HTTP_403_FORBIDDEN
             )
 
-        for entry in request.data:
-            student_id = entry.get('student_id')
-            status_val = entry.get('status')
-            try:
-                student = Student.objects.get(
-                    id=student_id, classroom=classroom)
-            except Student.DoesNotExist:
-                continue
-
-            StudentAttendance.objects.update_or_create(
-                student=student,
-                date=date.today(),
-                defaults={"status": status_val, "classroom": classroom}
+        try:
+            entries, on_date = parse_register_payload(request.data)
+        except ValueError as e:
+            return send_response(
+                message=str(e),
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except TypeError:
+            return send_response(
+                message=ResponseMessages.INVALID_PAYLOAD,
+                status_code=status.HTTP_400_BAD_REQUEST
             )
 
+        result = mark_class_attendance(classroom, entries, on_date)
         return send_response(
+            data=result,
             message="Attendance marked successfully.",
             status_code=status.HTTP_202_ACCEPTED
         )
@@ -208,6 +243,7 @@ class MarkAttendanceAPIView(APIView):
 
 class TeacherUpdateMarksAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsTeacher]
+    parser_classes = [JSONParser, MultiPartParser]
 
     marks_schema = openapi.Schema(
         type=openapi.TYPE_ARRAY,
@@ -216,14 +252,17 @@ class TeacherUpdateMarksAPIView(APIView):
             properties={
                 'student_id': openapi.Schema(type=openapi.TYPE_INTEGER),
                 'marks_obtained': openapi.Schema(type=openapi.TYPE_NUMBER),
+                'remarks': openapi.Schema(type=openapi.TYPE_STRING),
             },
             required=['student_id', 'marks_obtained']
         )
     )
 
     @swagger_auto_schema(
+        operation_description="Upsert marks for an exam subject. Send a JSON list, "
+        "or a multipart 'file' (.csv/.xlsx) with student_id, marks_obtained, remarks columns.",
         request_body=marks_schema,
-        responses={200: 'Marks updated successfully.'}
+        responses={201: 'Marks updated successfully.'}
     )
     def post(self, request, exam_subject_id):
         teacher = get_object_or_404(Teacher, user=request.user)
@@ -240,17 +279,26 @@ class TeacherUpdateMarksAPIView(APIView):
                 status_code=status.HTTP_403_FORBIDDEN
             )
 
-        for record in request.data:
-            student_id = record.get("student_id")
-            marks = record.get("marks_obtained")
-
-            ExamResult.objects.update_or_create(
-                exam_subject=exam_subject,
-                student_id=student_id,
-                defaults={"marks_obtained": marks}
+        upload = request.FILES.get('file')
+        if upload:
+            try:
+                entries = list(iter_uploaded_rows(upload))
+            except Exception as e:
+                return send_response(
+                    message=f"Invalid file: {str(e)}",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+        elif isinstance(request.data, list):
+            entries = request.data
+        else:
+            return send_response(
+                message=ResponseMessages.INVALID_PAYLOAD,
+                status_code=status.HTTP_400_BAD_REQUEST
             )
 
+        result = upsert_exam_marks(exam_subject, entries, from_file=bool(upload))
         return send_response(
+            data=result,
             message="Marks updated successfully.",
             status_code=status.HTTP_201_CREATED
         )
@@ -259,6 +307,17 @@ class TeacherUpdateMarksAPIView(APIView):
 class TeacherClassResultSummaryAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsTeacher]
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                name='exam_id',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                required=False,
+                description="Limit the summary to a single exam",
+            )
+        ]
+    )
     def get(self, request, classroom_id):
         teacher = get_object_or_404(Teacher, user=request.user)
 
@@ -268,27 +327,14 @@ class TeacherClassResultSummaryAPIView(APIView):
                 status_code=status.HTTP_403_FORBIDDEN
             )
 
-        students = Student.objects.filter(classroom_id=classroom_id)
-        data = []
-
-        for student in students:
-            results = ExamResult.objects.filter(
-                student=student).select_related('exam_subject__subject')
-            total_marks = sum(r.marks_obtained for r in results)
-
-            student_data = {
-                "student_id": student.id,
-                "student_name": student.user.name,
-                "total_marks": total_marks,
-                "subjects": [
-                    {
-                        "subject": r.exam_subject.subject.name,
-                        "marks": r.marks_obtained
-                    }
-                    for r in results
-                ]
-            }
-            data.append(student_data)
+        try:
+            exam_id = get_int_param(request, 'exam_id')
+        except ValueError:
+            return send_response(
+                message="exam_id must be a whole number.",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        data = class_result_summary(classroom_id, exam_id=exam_id)
 
         return send_response(
             data=data,
@@ -0,0 +1,75 @@
+import uuid
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.utils.crypto import get_random_string
+from utils.importers import Column, parse_email
+from .models import User
+from .tasks import send_welcome_email_task
+
+USER_COLUMNS = [
+    Column('email', parser=parse_email, max_length=254),
+    Column('name', max_length=100),
+    Column('password', required=False, sensitive=True),
+    Column('phone', required=False, max_length=15),
+    Column('address', required=False),
+]
+
+
+def validate_new_users(rows):
+    """
+    Rejects rows whose email is already registered (one query) or repeated
+    earlier in the same batch.
+    """
+    emails = {row.data['email'] for row in rows if row.error is None}
+    taken = set(User.objects.filter(
+        email__in=emails).values_list('email', flat=True))
+    for row in rows:
+        if row.error is not None:
+            continue
+        email = row.data['email']
+        if email in taken:
+            row.reject(f"A user with email '{email}' already exists.")
+        taken.add(email)
+
+
+def create_users(rows, role, school):
+    """
+    Bulk creates one User per row and queues the welcome emails once the
+    surrounding transaction commits. Returns users in row order.
+    """
+    users = []
+    passwords = []
+    for row in rows:
+        password = row.data['password'] or get_random_string(length=10)
+        passwords.append(password)
+        users.append(User(
+            email=row.data['email'],
+            username=f"user_{uuid.uuid4().hex[:12]}",
+            name=row.data['name'],
+            phone=row.data['phone'],
+            address=row.data['address'],
+            role=role,
+            school=school,
+            password=make_password(password),
+        ))
+    users = User.objects.bulk_create(users)
+
+    group = Group.objects.filter(name=role.lower()).first()
+    if group:
+        User.groups.through.objects.bulk_create([
+            User.groups.through(user_id=user.id, group_id=group.id)
+            for user in users
+        ])
+
+    def send_emails():
+        for user, password in zip(users, passwords):
+            send_welcome_email_task.delay(
+                email=user.email,
+                name=user.name,
+                password=password,
+                role=role,
+                school_name=school.name
+            )
+    transaction.on_commit(send_emails)
+    return users
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('schools', '0004_alter_school_options_alter_school_unique_together'),
+        ('users', '0002_alter_user_school'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['school', 'role'], name='users_school_role_idx'),
+        ),
+    ]
@@ -42,6 +42,11 @@ class User(AbstractUser):
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['school', 'role'], name='users_school_role_idx'),
+        ]
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['name', 'role']
 
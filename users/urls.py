@@ -7,6 +7,9 @@ from subjects.views import (
 )
 from teachers import views as teacher_views
 from .views import CustomTokenObtainPairView, CustomTokenRefreshView
+from imports.views import (
+    ImportJobListCreateAPIView, ImportJobDetailAPIView, ImportJobErrorReportAPIView
+)
 from students.views import StudentListCreateAPIView, StudentRetrieveUpdateDeleteAPIView
 from exams.views import (
     ExamListCreateAPIView, ExamSubjectListCreateAPIView,
@@ -16,13 +19,17 @@ from exams.views import (
 from attendances.views import (
     StudentAttendanceListCreateAPIView, TeacherAttendanceListCreateAPIView,
     StudentAttendanceRetrieveUpdateDeleteAPIView,
-    TeacherAttendanceRetrieveUpdateDeleteAPIView
+    TeacherAttendanceRetrieveUpdateDeleteAPIView, AttendancePercentageAPIView,
+    LowAttendanceAPIView, AttendanceStreakAPIView, AttendanceHistoryAPIView,
+    TeacherAttendanceRegisterAPIView
 )
 from fees.views import (
     FeeCategoryListCreateAPIView, FeeStructureListCreateAPIView,
     StudentFeeListCreateAPIView, PaymentListCreateAPIView,
     FeeCategoryRetrieveUpdateDeleteAPIView, FeeStructureRetrieveUpdateDeleteAPIView,
-    StudentFeeRetrieveUpdateDeleteAPIView, PaymentRetrieveUpdateDeleteAPIView
+    StudentFeeRetrieveUpdateDeleteAPIView, PaymentRetrieveUpdateDeleteAPIView,
+    FeeGenerationAPIView, FeeDuesAPIView, FeeCollectionAnalyticsAPIView,
+    FeeOutstandingAnalyticsAPIView, FeeCollectionRateAnalyticsAPIView
 )
 
 urlpatterns = [
@@ -44,6 +51,14 @@ urlpatterns = [
     path('classrooms/<int:pk>/',
          classroom_views.ClassroomDetailView.as_view(), name='classroom-detail'),
 
+    # Bulk import jobs
+    path('imports/', ImportJobListCreateAPIView.as_view(),
+         name='import-job-list-create'),
+    path('imports/<int:pk>/', ImportJobDetailAPIView.as_view(),
+         name='import-job-detail'),
+    path('imports/<int:pk>/errors/', ImportJobErrorReportAPIView.as_view(),
+         name='import-job-errors'),
+
     # Subjects
     path('subjects/', subject_views.SubjectListCreateView.as_view(),
          name='subject-create'),
@@ -101,6 +116,18 @@ urlpatterns = [
     path('fee/student/<int:pk>/', StudentFeeRetrieveUpdateDeleteAPIView.as_view(),
          name='fee-student-update'),
 
+    path('fee/dues/', FeeDuesAPIView.as_view(), name='fee-dues'),
+
+    path('fee/analytics/collections/', FeeCollectionAnalyticsAPIView.as_view(),
+         name='fee-analytics-collections'),
+    path('fee/analytics/outstanding/', FeeOutstandingAnalyticsAPIView.as_view(),
+         name='fee-analytics-outstanding'),
+    path('fee/analytics/collection-rate/', FeeCollectionRateAnalyticsAPIView.as_view(),
+         name='fee-analytics-collection-rate'),
+
+    path('fee/generate/', FeeGenerationAPIView.as_view(),
+         name='fee-generate'),
+
     path('fee/payment/', PaymentListCreateAPIView.as_view(),
          name='fee-payment'),
     path('fee/payment/<int:pk>/', PaymentRetrieveUpdateDeleteAPIView.as_view(),
@@ -112,8 +139,19 @@ urlpatterns = [
     path('student-attendance/<int:pk>/', StudentAttendanceRetrieveUpdateDeleteAPIView.as_view(),
          name='student-attendance-update'),
 
+    path('student-attendance/percentage/', AttendancePercentageAPIView.as_view(),
+         name='student-attendance-percentage'),
+    path('student-attendance/history/', AttendanceHistoryAPIView.as_view(),
+         name='student-attendance-history'),
+    path('student-attendance/low/', LowAttendanceAPIView.as_view(),
+         name='student-attendance-low'),
+    path('student-attendance/streaks/', AttendanceStreakAPIView.as_view(),
+         name='student-attendance-streaks'),
+
     path('teacher-attendance/', TeacherAttendanceListCreateAPIView.as_view(),
          name='teacher-attendance'),
+    path('teacher-attendance/register/', TeacherAttendanceRegisterAPIView.as_view(),
+         name='teacher-attendance-register'),
     path('teacher-attendance/<int:pk>/', TeacherAttendanceRetrieveUpdateDeleteAPIView.as_view(),
          name='teacher-attendance-update'),
 
@@ -0,0 +1,73 @@
+import hashlib
+from functools import wraps
+from django.conf import settings
+from django.utils.cache import (
+    get_conditional_response, patch_vary_headers, quote_etag
+)
+from django.utils.http import http_date
+from .metrics import cache_lookup
+from .tenant_cache import get_version_stamps
+
+
+def tenant_etag(request, school_id, models, extra=None):
+    """
+    Builds (etag, last_modified) for a GET from the version stamps of the
+    models it reads. The user and full path are part of the tag, so the
+    same stamps give different tags to different users and query strings.
+    """
+    versions, last_modified = get_version_stamps(school_id, models)
+    raw = f"{request.user.pk}:{request.get_full_path()}:{versions}:{extra}"
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest()), last_modified
+
+
+def conditional_response(request, models, render, extra=None):
+    """
+    Answers If-None-Match / If-Modified-Since with 304 before `render()`
+    runs, so an unchanged resource costs a cache lookup instead of its
+    queries; otherwise returns `render()` with ETag and Last-Modified set.
+    Arguments:
+    models: Models whose tenant version stamps the response depends on.
+        Their writes must bump the stamps (see utils.tenant_cache).
+    render: Callable building the full response.
+    extra: Inputs that are not in the URL, e.g. a default date.
+    Requests without a school (superusers), or without a shared cache
+    (settings.TENANT_CACHE_ENABLED), are served unconditionally.
+    """
+    school_id = getattr(request.user, 'school_id', None)
+    if school_id is None or not settings.TENANT_CACHE_ENABLED:
+        return render()
+
+    etag, last_modified = tenant_etag(request, school_id, models, extra)
+    # HTTP dates have whole-second precision; ETags are exact.
+    last_modified = int(last_modified)
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+    cache_lookup('conditional', not_modified is not None)
+    if not_modified is not None:
+        return not_modified
+
+    response = render()
+    if response.status_code == 200:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def conditional_get(*models, extra_key=None):
+    """
+    Decorator applying conditional_response to an APIView.get.
+    `extra_key(request, *args, **kwargs)` supplies the `extra` inputs.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            extra = extra_key(request, *args, **kwargs) if extra_key else None
+            return conditional_response(
+                request, models,
+                lambda: view_method(self, request, *args, **kwargs),
+                extra=extra,
+            )
+        return wrapper
+    return decorator
@@ -0,0 +1,68 @@
+import codecs
+import csv
+import openpyxl
+
+
+class UnsupportedFileError(ValueError):
+    pass
+
+
+def iter_numbered_rows(uploaded_file):
+    """
+    Yields (row_number, row) for every data row of an uploaded .csv or .xlsx
+    file, where row is a dict keyed by the lower-cased header of the first
+    row and row_number is the 1-based line in the file (header is row 1).
+    Rows are read one at a time (csv reader / openpyxl read_only mode), so
+    large files are never fully loaded into memory. Blank rows are skipped.
+    """
+    name = (uploaded_file.name or '').lower()
+    workbook = None
+    if name.endswith('.csv'):
+        rows = csv.reader(codecs.iterdecode(uploaded_file, 'utf-8-sig'))
+    elif name.endswith('.xlsx'):
+        workbook = openpyxl.load_workbook(
+            uploaded_file, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+    else:
+        raise UnsupportedFileError("Only .csv and .xlsx files are supported.")
+
+    header = None
+    try:
+        for number, row in enumerate(rows, start=1):
+            if header is None:
+                header = [str(cell).strip().lower() if cell is not None else ''
+                          for cell in row]
+                continue
+            if not any(cell not in (None, '') for cell in row):
+                continue
+            yield number, dict(zip(header, row))
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+
+def iter_uploaded_rows(uploaded_file):
+    """
+    Same as iter_numbered_rows, without the row numbers.
+    """
+    for _, row in iter_numbered_rows(uploaded_file):
+        yield row
+
+
+def count_uploaded_rows(uploaded_file):
+    """
+    Cheap upper bound of the number of data rows, used for job progress.
+    """
+    name = (uploaded_file.name or '').lower()
+    if name.endswith('.xlsx'):
+        workbook = openpyxl.load_workbook(uploaded_file, read_only=True)
+        try:
+            max_row = workbook.active.max_row or 0
+        finally:
+            workbook.close()
+        uploaded_file.seek(0)
+        return max(max_row - 1, 0)
+
+    lines = sum(1 for _ in uploaded_file)
+    uploaded_file.seek(0)
+    return max(lines - 1, 0)
@@ -0,0 +1,255 @@
+import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils.dateparse import parse_date
+from .file_readers import count_uploaded_rows, iter_numbered_rows
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+# Cell parsers. Each takes the raw cell (str from csv, typed from xlsx) and
+# returns the python value or raises ImportRowError.
+
+def parse_text(value):
+    return str(value).strip()
+
+
+def parse_email(value):
+    value = parse_text(value).lower()
+    try:
+        validate_email(value)
+    except ValidationError:
+        raise ImportRowError(f"'{value}' is not a valid email.")
+    return value
+
+
+def parse_int(value):
+    try:
+        number = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ImportRowError(f"'{value}' is not a whole number.")
+    if number != number.to_integral_value():
+        raise ImportRowError(f"'{value}' is not a whole number.")
+    return int(number)
+
+
+def parse_decimal(value):
+    try:
+        return Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ImportRowError(f"'{value}' is not a number.")
+
+
+def parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ImportRowError(f"'{value}' is not a number.")
+
+
+def parse_date_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        parsed = parse_date(str(value).strip())
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ImportRowError(f"'{value}' is not a date (YYYY-MM-DD).")
+    return parsed
+
+
+def choice_parser(choices):
+    allowed = {key for key, _ in choices}
+
+    def parse(value):
+        value = parse_text(value)
+        for candidate in (value, value.upper(), value.capitalize()):
+            if candidate in allowed:
+                return candidate
+        raise ImportRowError(
+            f"'{value}' must be one of: {', '.join(sorted(allowed))}.")
+    return parse
+
+
+class Column:
+    """
+    One spreadsheet column of an importer schema.
+    Arguments:
+    name: Header in the file (matched case-insensitively).
+    parser: Callable turning the raw cell into a python value.
+    required: Whether an empty cell rejects the row.
+    default: Value used when an optional cell is empty.
+    max_length: Maximum length of the parsed text value.
+    field: Key in the cleaned row; defaults to `name`.
+    sensitive: Never copy this cell into the error report.
+    """
+
+    def __init__(self, name, parser=parse_text, required=True, default=None,
+                 max_length=None, field=None, sensitive=False):
+        self.name = name
+        self.parser = parser
+        self.required = required
+        self.default = default
+        self.max_length = max_length
+        self.field = field or name
+        self.sensitive = sensitive
+
+    def clean(self, value):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            if self.required:
+                raise ImportRowError(f"'{self.name}' is required.")
+            return self.default
+        value = self.parser(value)
+        if self.max_length and len(value) > self.max_length:
+            raise ImportRowError(
+                f"'{self.name}' must be at most {self.max_length} characters.")
+        return value
+
+
+class ForeignKeyColumn(Column):
+    """
+    A column resolved to a model instance. Values of a whole batch are
+    looked up with one query against `importer.get_<field>_queryset()`,
+    which is where tenant scoping belongs.
+    """
+
+    def __init__(self, name, to_field='pk', parser=parse_int, **kwargs):
+        super().__init__(name, parser=parser, **kwargs)
+        self.to_field = to_field
+
+
+class ImportRow:
+    def __init__(self, number, raw):
+        self.number = number
+        self.raw = raw
+        self.data = {}
+        self.error = None
+
+    def reject(self, error):
+        if self.error is None:
+            self.error = str(error)
+
+
+class BaseImporter:
+    """
+    Streams rows from an uploaded file, validates them batch by batch and
+    hands the valid rows of each batch to `save_batch`.
+    Subclasses declare `columns`, optionally `validate_batch` for checks
+    that need the database (one query per batch), and `save_batch`.
+    """
+    columns = []
+    batch_size = None
+
+    def __init__(self, school, job=None, batch_size=None):
+        self.school = school
+        self.job = job
+        self.batch_size = batch_size or self.batch_size or settings.IMPORT_BATCH_SIZE
+        self.created = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.processed = 0
+        self.errors = []
+
+    @classmethod
+    def process_job(cls, job):
+        """Runs the importer over an ImportJob's file, updating the job."""
+        importer = cls(job.school, job=job)
+        with job.file.open('rb') as uploaded_file:
+            job.total_rows = count_uploaded_rows(uploaded_file)
+            job.save(update_fields=['total_rows', 'modified'])
+            importer.run(iter_numbered_rows(uploaded_file))
+
+        job.total_rows = importer.processed
+        job.processed_rows = importer.processed
+        job.created_count = importer.created
+        job.skipped_count = importer.skipped
+        job.error_count = importer.rejected
+        job.errors = importer.errors
+        return importer
+
+    def run(self, numbered_rows):
+        numbered_rows = iter(numbered_rows)
+        while True:
+            batch = [ImportRow(number, raw)
+                     for number, raw in islice(numbered_rows, self.batch_size)]
+            if not batch:
+                break
+            self.process_batch(batch)
+            self.processed += len(batch)
+            if self.job is not None:
+                self.job.processed_rows = self.processed
+                self.job.created_count = self.created
+                self.job.save(update_fields=[
+                    'processed_rows', 'created_count', 'modified'])
+        return self
+
+    def process_batch(self, batch):
+        for row in batch:
+            for column in self.columns:
+                try:
+                    row.data[column.field] = column.clean(
+                        row.raw.get(column.name))
+                except ImportRowError as e:
+                    row.reject(e)
+                    break
+
+        self.resolve_foreign_keys(batch)
+        self.validate_batch([row for row in batch if row.error is None])
+
+        valid = [row for row in batch if row.error is None]
+        for row in batch:
+            if row.error is not None:
+                self.rejected += 1
+                self.report(row)
+
+        if valid:
+            with transaction.atomic():
+                self.save_batch(valid)
+
+    def resolve_foreign_keys(self, batch):
+        for column in self.columns:
+            if not isinstance(column, ForeignKeyColumn):
+                continue
+            values = {row.data.get(column.field) for row in batch
+                      if row.error is None and row.data.get(column.field) is not None}
+            if not values:
+                continue
+            queryset = getattr(self, f'get_{column.field}_queryset')()
+            objects = queryset.in_bulk(values, field_name=column.to_field)
+            for row in batch:
+                value = row.data.get(column.field)
+                if row.error is not None or value is None:
+                    continue
+                if value not in objects:
+                    row.reject(f"Unknown {column.name} '{value}'.")
+                else:
+                    row.data[column.field] = objects[value]
+
+    def report(self, row, error=None):
+        entry = {"row": row.number}
+        sensitive = {column.name for column in self.columns if column.sensitive}
+        for key, value in row.raw.items():
+            if key and key not in sensitive:
+                entry[key] = None if value is None else str(value)
+        entry["error"] = error or row.error
+        self.errors.append(entry)
+
+    def skip(self, row, reason):
+        """Counts a valid but already imported row and reports why."""
+        self.skipped += 1
+        self.report(row, reason)
+
+    def validate_batch(self, rows):
+        """Hook for checks needing the database; call row.reject() on failures."""
+
+    def save_batch(self, rows):
+        raise NotImplementedError
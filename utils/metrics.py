@@ -0,0 +1,148 @@
+import hmac
+import os
+import time
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram,
+    generate_latest, multiprocess, start_http_server
+)
+
+# Label used for requests that did not resolve to a view (404 scans), so
+# random paths can not blow up the number of series.
+UNMATCHED = '<unmatched>'
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by URL name.',
+    ['method', 'url_name'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    'http_requests', 'Requests by URL name and status code.',
+    ['method', 'url_name', 'status'],
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Size of non-streaming response bodies.',
+    ['url_name'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries per request.',
+    ['url_name'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_TIME = Histogram(
+    'http_request_db_duration_seconds', 'Database time per request.',
+    ['url_name'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests', 'Cache lookups; hit ratio = hit / (hit + miss).',
+    ['cache', 'result'],
+)
+TASK_LATENCY = Histogram(
+    'celery_task_duration_seconds', 'Celery task run time.',
+    ['task'],
+    buckets=(0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900),
+)
+TASKS = Counter(
+    'celery_tasks', 'Finished Celery tasks by state.',
+    ['task', 'state'],
+)
+
+
+def cache_lookup(cache, hit):
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status, response size and database load per URL name.
+    Must come before QueryBudgetMiddleware, whose query counts it reuses.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        url_name = match.view_name if match else UNMATCHED
+        REQUEST_LATENCY.labels(request.method, url_name).observe(duration)
+        REQUESTS.labels(request.method, url_name, response.status_code).inc()
+        if not response.streaming:
+            RESPONSE_SIZE.labels(url_name).observe(len(response.content))
+
+        recorder = getattr(request, 'query_recorder', None)
+        if recorder is not None:
+            DB_QUERIES.labels(url_name).observe(recorder.count)
+            DB_TIME.labels(url_name).observe(recorder.duration)
+        return response
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view(request):
+    """
+    Prometheus exposition of this process, or of every gunicorn worker
+    sharing PROMETHEUS_MULTIPROC_DIR when it is set.
+    Requires `Authorization: Bearer <METRICS_TOKEN>`. Without a token it
+    is closed, except with DEBUG on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not hmac.compare_digest(
+            request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
+
+
+_task_started = {}
+
+
+def _task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    start = _task_started.pop(task_id, None)
+    if start is not None:
+        TASK_LATENCY.labels(task.name).observe(time.perf_counter() - start)
+    TASKS.labels(task.name, state or 'UNKNOWN').inc()
+
+
+def _start_worker_exporter(**kwargs):
+    if settings.CELERY_METRICS_PORT:
+        start_http_server(settings.CELERY_METRICS_PORT, registry=get_registry())
+
+
+def register_celery_metrics():
+    """
+    Times every task run by this worker, including ones added later, and
+    counts them by final state (SUCCESS, FAILURE, RETRY, ...).
+    The worker serves them on CELERY_METRICS_PORT; with prefork pools set
+    PROMETHEUS_MULTIPROC_DIR so the pool processes are aggregated.
+    """
+    from celery.signals import task_postrun, task_prerun, worker_ready
+    task_prerun.connect(_task_prerun, weak=False, dispatch_uid='metrics-task-prerun')
+    task_postrun.connect(_task_postrun, weak=False, dispatch_uid='metrics-task-postrun')
+    worker_ready.connect(_start_worker_exporter, weak=False,
+                         dispatch_uid='metrics-worker-exporter')
+
+
+def mark_process_dead(pid):
+    """gunicorn child_exit hook: drops the live files of a dead worker."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid)
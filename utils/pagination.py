@@ -0,0 +1,176 @@
+import base64
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+from .data_constants import ResponseMessages
+from .renderers import json_dumps
+from .restful_response import send_response
+from .serializers import ValuesSerializer
+
+STREAM_CHUNK_SIZE = 2000
+
+
+class KeysetPagination:
+    """
+    Keyset (seek) pagination over a fixed, unique ordering.
+    Instead of OFFSET, every page starts strictly after the last row of the
+    previous page, so the cost of a page does not grow with its depth.
+    Arguments:
+    ordering: Tuple of ascending, non-null field names. The last field must
+        be unique (normally 'id') so that the ordering is total. Fields must
+        be local to the model, not lookups across relations.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def __init__(self, ordering=('id',)):
+        self.ordering = tuple(ordering)
+        self.page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 50
+        self.next_position = None
+
+    def encode_cursor(self, position):
+        raw = json.dumps(position, cls=DjangoJSONEncoder).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (TypeError, ValueError):
+            raise NotFound("Invalid cursor.")
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound("Invalid cursor.")
+        return position
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def seek_filter(self, position, model):
+        """
+        Builds (a > x) OR (a = x AND b > y) OR ... for the current ordering.
+        Each cursor value is coerced with its model field's to_python(), so a
+        tampered cursor raises ValidationError instead of reaching the database.
+        """
+        position = [
+            self.to_python(model._meta.get_field(field), value)
+            for field, value in zip(self.ordering, position)
+        ]
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            term = Q(**{f'{field}__gt': position[index]})
+            for prev_field, prev_value in zip(self.ordering[:index], position[:index]):
+                term &= Q(**{prev_field: prev_value})
+            condition |= term
+        return condition
+
+    @staticmethod
+    def to_python(field, value):
+        if value is None or isinstance(value, (dict, list, bool)):
+            raise ValidationError("Invalid cursor value.")
+        return field.to_python(value)
+
+    def paginate_queryset(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            position = self.decode_cursor(cursor)
+            try:
+                queryset = queryset.filter(
+                    self.seek_filter(position, queryset.model))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound("Invalid cursor.")
+
+        # One extra row tells us whether a next page exists.
+        rows = list(queryset[:page_size + 1])
+        page = rows[:page_size]
+        if len(rows) > page_size:
+            last = page[-1]
+            if isinstance(last, dict):
+                self.next_position = [last[field] for field in self.ordering]
+            else:
+                self.next_position = [getattr(last, field)
+                                      for field in self.ordering]
+        return page
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_data(self, data):
+        return {
+            "results": data,
+            "next": self.get_next_link(),
+        }
+
+
+def stream_ndjson(queryset, serializer_class, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Streams a queryset as newline-delimited JSON, one object per line.
+    Rows are pulled through a server-side cursor in chunks of `chunk_size`,
+    so memory stays flat regardless of the table size.
+    """
+    if is_values_serializer(serializer_class):
+        queryset = serializer_class.values(queryset)
+        represent = serializer_class.to_representation
+    else:
+        def represent(obj):
+            return serializer_class(obj).data
+
+    def rows():
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            yield json_dumps(represent(obj)) + b'\n'
+
+    return StreamingHttpResponse(rows(), content_type='application/x-ndjson')
+
+
+def paginated_data(request, queryset, serializer_class, ordering=('id',)):
+    """
+    Returns one keyset page as {"results": [...], "next": url}.
+    """
+    paginator = KeysetPagination(ordering=ordering)
+    if is_values_serializer(serializer_class):
+        queryset = serializer_class.values(queryset, *ordering)
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = serializer_class(page, many=True)
+    return paginator.get_paginated_data(serializer.data)
+
+
+def is_values_serializer(serializer_class):
+    return isinstance(serializer_class, type) and issubclass(
+        serializer_class, ValuesSerializer)
+
+
+def wants_stream(request):
+    return request.query_params.get('stream') == 'ndjson'
+
+
+def paginate_or_stream(request, queryset, serializer_class, ordering=('id',)):
+    """
+    Shared GET path for list endpoints.
+    `?stream=ndjson` streams every row; otherwise a keyset page is returned
+    inside the standard response envelope as {"results": [...], "next": url}.
+    """
+    if wants_stream(request):
+        return stream_ndjson(queryset.order_by(*ordering), serializer_class)
+
+    return send_response(
+        data=paginated_data(request, queryset, serializer_class, ordering),
+        message=ResponseMessages.DATA_FETCH_SUCCESS,
+        status_code=status.HTTP_200_OK
+    )
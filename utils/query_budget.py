@@ -0,0 +1,115 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# `IN (%s, %s, %s)` lists differ only by length, so they count as one shape.
+_PLACEHOLDER_LIST = re.compile(r'%s(?:\s*,\s*%s)+')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def sql_shape(sql):
+    return _PLACEHOLDER_LIST.sub('%s', sql)
+
+
+class QueryRecorder:
+    """
+    `connection.execute_wrapper` that counts queries, their total time and
+    how often each SQL shape (the statement without its parameters) ran.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def repeated(self, threshold):
+        """SQL shapes run at least `threshold` times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common()
+                if count >= threshold]
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts the queries and database time of every request and reports them
+    in a `Server-Timing` header and a log line. Reads over the budget of
+    their URL name (QUERY_BUDGETS), writes over DEFAULT_QUERY_BUDGET and
+    requests running one SQL shape QUERY_REPEAT_THRESHOLD times or more
+    (an N+1) are logged as warnings, and raise QueryBudgetExceeded when
+    QUERY_BUDGET_STRICT is on (tests, CI).
+    Queries run while a streaming response is consumed are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request.query_recorder = recorder
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        timing = (f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries", '
+                  f'app;dur={total * 1000:.1f}')
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+
+        self.report(request, response, recorder, total)
+        return response
+
+    def report(self, request, response, recorder, total):
+        match = request.resolver_match
+        url_name = match.view_name if match else None
+        budget = settings.DEFAULT_QUERY_BUDGET
+        if request.method in ('GET', 'HEAD'):
+            budget = settings.QUERY_BUDGETS.get(url_name, budget)
+        repeated = recorder.repeated(settings.QUERY_REPEAT_THRESHOLD)
+
+        problems = []
+        if budget is not None and recorder.count > budget:
+            problems.append(f"{recorder.count} queries, budget {budget}")
+        if repeated:
+            shape, count = repeated[0]
+            problems.append(f"N+1: {count}x {shape[:200]}")
+
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "url_name": url_name,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "db_ms": round(recorder.duration * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+            "repeated_shapes": len(repeated),
+        }
+        line = ' '.join(f'{key}={value}' for key, value in fields.items())
+        if not problems:
+            logger.info(line, extra=fields)
+            return
+
+        logger.warning(f"{line} problems={'; '.join(problems)!r}", extra=fields)
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} ({url_name}): {'; '.join(problems)}")
@@ -0,0 +1,45 @@
+import datetime
+from django.utils.dateparse import parse_date
+from drf_yasg import openapi
+
+date_range_parameters = [
+    openapi.Parameter('from', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                      format=openapi.FORMAT_DATE),
+    openapi.Parameter('to', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                      format=openapi.FORMAT_DATE),
+]
+
+
+def get_date_range(request):
+    """Parses ?from=&to= (YYYY-MM-DD); raises ValueError on bad input."""
+    dates = []
+    for param in ('from', 'to'):
+        raw = request.query_params.get(param)
+        value = parse_date(raw) if raw else None
+        if raw and value is None:
+            raise ValueError(raw)
+        dates.append(value)
+    return dates
+
+
+def bounded_date_range(date_from, date_to, max_days):
+    """
+    Defaults an open range to the last `max_days` days up to `to` (today
+    when missing).
+    Returns:
+    (date_from, date_to), or (None, None) when from is after to or the
+    range covers more than max_days.
+    """
+    date_to = date_to or datetime.date.today()
+    date_from = date_from or date_to - datetime.timedelta(days=max_days - 1)
+    if not 0 <= (date_to - date_from).days < max_days:
+        return None, None
+    return date_from, date_to
+
+
+def get_int_param(request, name, default=None):
+    """Reads an integer query param; raises ValueError on bad input."""
+    raw = request.query_params.get(name)
+    if raw in (None, ''):
+        return default
+    return int(raw)
@@ -0,0 +1,43 @@
+import orjson
+from django.utils.http import parse_header_parameters
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # orjson already handles str/int/float/dict/list (and their subclasses,
+    # e.g. ReturnDict and ErrorDetail), date, datetime, time and UUID.
+    # Everything else (Decimal, lazy strings, querysets, ...) is encoded the
+    # way DRF's JSONRenderer does, so switching renderers keeps the output.
+    return _encoder.default(obj)
+
+
+def json_dumps(data, option=0):
+    """Serializes `data` to compact UTF-8 JSON bytes."""
+    return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS | option)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Drop-in replacement of DRF's JSONRenderer built on orjson.
+    Output is the same compact, unescaped UTF-8 JSON, except that datetimes
+    keep their microseconds instead of being cut to milliseconds.
+    `Accept: application/json; indent=N` pretty-prints with two spaces.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        option = 0
+        if accepted_media_type:
+            _, params = parse_header_parameters(accepted_media_type)
+            if params.get('indent'):
+                option = orjson.OPT_INDENT_2
+        return json_dumps(data, option)
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from rest_framework import status
 from rest_framework.response import Response
 from .data_constants import ResponseMessages
@@ -11,6 +12,21 @@ class DisplayMessage:
     message: str
 
 
+@lru_cache(maxsize=256)
+def display_message(show_to_user: bool, level: str, message: str) -> dict:
+    """
+    The display_message part of the envelope, built once per distinct
+    (show_to_user, level, message) and shared by every response using it.
+    The common messages are constants, so nearly all calls are cache hits.
+    The returned dict is shared: read it, never mutate it.
+    """
+    return DisplayMessage(
+        show_to_user=show_to_user,
+        level=level,
+        message=message,
+    ).__dict__
+
+
 def send_response(
         data: dict = {},
         show_to_user: bool = False,
@@ -35,24 +51,21 @@ def send_response(
     Returns:
     A response object that can be returned to the client.
     """
-    display_message = DisplayMessage(
-        show_to_user=show_to_user,
-        level=level,
-        message=message or ResponseMessages.DATA_FETCH_SUCCESS,
-    )
+    display = display_message(
+        show_to_user, level, message or ResponseMessages.DATA_FETCH_SUCCESS)
     if level == ErrorMessageInfoLevels.error.value:
         error_data = data
         response = {
             "error": error_data,
             "data": None,
-            "display_message": display_message.__dict__,
+            "display_message": display,
             "error_code": error_code,
         }
     else:
         response = {
             "error": None,
             "data": data,
-            "display_message": display_message.__dict__,
+            "display_message": display,
             "error_code": error_code,
         }
     return Response(response, status=status_code)
@@ -0,0 +1,100 @@
+import datetime
+from functools import lru_cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import QuerySet
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Fields whose database value differs from the JSON value DRF emits.
+# All other supported fields (char, choice, integer, float, boolean and
+# primary key relations) are passed through as read from .values().
+CONVERTED_FIELDS = (
+    serializers.DecimalField,
+    serializers.DateTimeField,
+    serializers.DateField,
+    serializers.TimeField,
+    serializers.DurationField,
+    serializers.UUIDField,
+)
+
+
+def _decimal_to_string(value):
+    return format(value, 'f')
+
+
+def _converter(field):
+    if not isinstance(field, CONVERTED_FIELDS):
+        return None
+    # Fast paths for the default formats. Decimal columns come back from the
+    # database already quantized to the field's decimal places.
+    if (isinstance(field, serializers.DecimalField)
+            and getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+            and not field.localize and not field.normalize_output
+            and field.decimal_places is not None):
+        return _decimal_to_string
+    if (type(field) is serializers.DateField
+            and getattr(field, 'format', api_settings.DATE_FORMAT) == ISO_8601):
+        return datetime.date.isoformat
+    return field.to_representation
+
+
+@lru_cache(maxsize=None)
+def _columns(model_serializer):
+    """(output key, values() lookup, converter or None) per readable field."""
+    columns = []
+    for name, field in model_serializer().fields.items():
+        if field.write_only:
+            continue
+        if (isinstance(field, (serializers.ManyRelatedField,
+                               serializers.SerializerMethodField,
+                               serializers.BaseSerializer))
+                or field.source == '*'):
+            raise ImproperlyConfigured(
+                f"{model_serializer.__name__}.{name} can not be read from .values().")
+        columns.append((name, '__'.join(field.source_attrs), _converter(field)))
+    return tuple(columns)
+
+
+class ValuesSerializer:
+    """
+    Read-only stand-in of a ModelSerializer for list GETs.
+    Rows are fetched with .values() and turned into dicts by a fixed list
+    of per-column converters, so no model instances or serializer fields
+    are built per row. The output is the same as `model_serializer`'s.
+    Accepts a queryset, or rows already read with `values()` (e.g. a page).
+    Lists of model instances fall back to `model_serializer`.
+    """
+    model_serializer = None
+
+    def __init__(self, instance=None, many=False):
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def values(cls, queryset, *extra):
+        """`queryset.values()` with the columns read by this serializer and `extra`."""
+        lookups = [lookup for _, lookup, _ in _columns(cls.model_serializer)]
+        return queryset.values(*lookups, *(name for name in extra if name not in lookups))
+
+    @classmethod
+    def to_representation(cls, row):
+        data = {}
+        for name, lookup, converter in _columns(cls.model_serializer):
+            value = row[lookup]
+            if converter is not None and value is not None:
+                value = converter(value)
+            data[name] = value
+        return data
+
+    @property
+    def data(self):
+        rows = self.instance
+        if isinstance(rows, QuerySet):
+            rows = self.values(rows)
+        elif not self.many:
+            rows = [rows]
+        rows = list(rows)
+        if rows and not isinstance(rows[0], dict):
+            return self.model_serializer(self.instance, many=self.many).data
+        data = [self.to_representation(row) for row in rows]
+        return data if self.many else data[0]
@@ -0,0 +1,192 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from rest_framework.response import Response
+from .metrics import cache_lookup
+
+KEY_PREFIX = 'tenant-cache'
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _namespace_key(school_id, model):
+    return f"{KEY_PREFIX}:{school_id}:{_label(model)}:version"
+
+
+def _modified_key(school_id, model):
+    return f"{KEY_PREFIX}:{school_id}:{_label(model)}:modified"
+
+
+def get_namespace_version(school_id, model):
+    """
+    Current version of a (school, model) namespace. Bumping the version
+    orphans every cached entry of that namespace at once; orphans simply
+    expire with their TTL.
+    """
+    key = _namespace_key(school_id, model)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a namespace key that was evicted never
+        # resurrects entries written under an older, reused version.
+        cache.add(key, int(time.time()), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_tenant_cache(school_id, model):
+    key = _namespace_key(school_id, model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time()), timeout=None)
+    cache.set(_modified_key(school_id, model), time.time(), timeout=None)
+
+
+def get_version_stamps(school_id, models):
+    """
+    Returns (versions, last_modified) of several (school, model) namespaces
+    in one cache round trip. `last_modified` is the latest write time (a
+    unix timestamp) of any of them.
+    """
+    keys = {}
+    for model in models:
+        keys[_namespace_key(school_id, model)] = model
+        keys[_modified_key(school_id, model)] = model
+    found = cache.get_many(list(keys))
+
+    versions = []
+    modified = []
+    for model in models:
+        version = found.get(_namespace_key(school_id, model))
+        if version is None:
+            version = get_namespace_version(school_id, model)
+        versions.append(version)
+        stamp = found.get(_modified_key(school_id, model))
+        if stamp is None:
+            # Unknown (never written or evicted): assume it changed now so
+            # that If-Modified-Since can never be answered too optimistically.
+            stamp = time.time()
+            cache.add(_modified_key(school_id, model), stamp, timeout=None)
+        modified.append(stamp)
+    return tuple(versions), max(modified)
+
+
+def tenant_cache_key(school_id, model, params=None):
+    """
+    Builds a cache key from (school_id, model, query params). Params are
+    sorted so that the same query in a different order hits the same entry.
+    """
+    version = get_namespace_version(school_id, model)
+    if hasattr(params, 'lists'):
+        items = sorted(params.lists())
+    else:
+        items = sorted((params or {}).items())
+    digest = hashlib.md5(repr(items).encode()).hexdigest()
+    return f"{KEY_PREFIX}:{school_id}:{_label(model)}:v{version}:{digest}"
+
+
+def get_or_set_tenant_cache(school_id, model, params, builder, timeout=None):
+    """
+    Returns the cached value for (school_id, model, params), calling
+    `builder()` and caching its result on a miss. Nothing is cached when
+    there is no school (superusers see every tenant) or no shared cache
+    (settings.TENANT_CACHE_ENABLED).
+    """
+    if school_id is None or not settings.TENANT_CACHE_ENABLED:
+        return builder()
+
+    key = tenant_cache_key(school_id, model, params)
+    data = cache.get(key)
+    cache_lookup('tenant', data is not None)
+    if data is None:
+        data = builder()
+        cache.set(key, data, timeout or settings.TENANT_CACHE_TTL)
+    return data
+
+
+class TenantCachedListMixin:
+    """
+    Caches `list()` of a generic ListAPIView per school and query params,
+    and answers conditional GETs for it with 304 (see utils.conditional).
+    Set `cache_model` to the model whose writes should invalidate the cache.
+    """
+    cache_model = None
+
+    def list(self, request, *args, **kwargs):
+        from .conditional import conditional_response
+
+        def render():
+            data = get_or_set_tenant_cache(
+                getattr(request.user, 'school_id', None),
+                self.cache_model,
+                request.query_params,
+                lambda: super(TenantCachedListMixin, self).list(
+                    request, *args, **kwargs).data,
+            )
+            return Response(data)
+
+        return conditional_response(request, [self.cache_model], render)
+
+
+def register_tenant_cache(model, get_school_id):
+    """
+    Invalidates the cache namespace of `model` whenever an instance is saved
+    or deleted. `get_school_id(instance)` returns the owning school id, or
+    an iterable of ids for models shared between schools.
+    Bulk operations do not send signals; call invalidate_tenant_cache there.
+    """
+    def _invalidate(sender, instance, **kwargs):
+        school_ids = get_school_id(instance)
+        if school_ids is None or isinstance(school_ids, int):
+            school_ids = [school_ids]
+        for school_id in school_ids:
+            if school_id is not None:
+                invalidate_tenant_cache(school_id, model)
+
+    uid = f"tenant-cache-{_label(model)}"
+    post_save.connect(_invalidate, sender=model, weak=False,
+                      dispatch_uid=uid)
+    post_delete.connect(_invalidate, sender=model, weak=False,
+                        dispatch_uid=uid)
+
+
+def register_tenant_cache_m2m(model, field_name):
+    """
+    Invalidates the cache namespace of `model` for the schools of the rows
+    linked through its many-to-many `field_name` (a model with a school).
+    register_tenant_cache cannot see those links: on create they are set
+    after post_save, and on delete they are gone before post_delete.
+    So this acts on added, removed and cleared links, and before delete.
+    """
+    field = model._meta.get_field(field_name)
+
+    def _linked_school_ids(instance):
+        return set(getattr(instance, field_name).values_list('school_id', flat=True))
+
+    def _invalidate(school_ids):
+        for school_id in school_ids:
+            if school_id is not None:
+                invalidate_tenant_cache(school_id, model)
+
+    def _links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+        if reverse:
+            # `instance` is the linked row; its own school is affected.
+            if action in ('post_add', 'post_remove', 'pre_clear'):
+                _invalidate([instance.school_id])
+        elif action in ('post_add', 'post_remove') and pk_set:
+            _invalidate(field.related_model._base_manager.filter(
+                pk__in=pk_set).values_list('school_id', flat=True))
+        elif action == 'pre_clear':
+            _invalidate(_linked_school_ids(instance))
+
+    def _deleting(sender, instance, **kwargs):
+        _invalidate(_linked_school_ids(instance))
+
+    uid = f"tenant-cache-{_label(model)}-{field_name}"
+    m2m_changed.connect(_links_changed, sender=field.remote_field.through,
+                        weak=False, dispatch_uid=uid)
+    pre_delete.connect(_deleting, sender=model, weak=False, dispatch_uid=uid)
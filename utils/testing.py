@@ -0,0 +1,111 @@
+"""
+Fixture builders shared by the app test suites.
+Rows are created through the ORM, so model signals (ledger, cache
+invalidation, denormalised school) run as they do in production.
+"""
+import datetime
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from classrooms.models import Classroom
+from exams.models import Exam, ExamResult, ExamSubject
+from fees.models import FeeCategory, FeeStructure, Payment, StudentFee
+from schools.models import School
+from students.models import Student
+from subjects.models import ClassroomSubject, Subject
+from teachers.models import Teacher
+from users.models import User
+
+PASSWORD = make_password('test-password')
+
+
+def client_for(user):
+    """An API client authenticated with a real JWT, as the apps send it."""
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client
+
+
+def url(name, query='', **kwargs):
+    return reverse(name, kwargs=kwargs or None) + query
+
+
+def create_school(name='Test School'):
+    return School.objects.create(
+        name=name, address='1 Test Road', contact_email='office@school.test',
+        contact_number='9000000000', established_year=1990)
+
+
+def create_user(school, role, username):
+    return User.objects.create(
+        email=f"{username}@school.test", username=username, name=username.title(),
+        role=role, school=school, password=PASSWORD)
+
+
+def create_admin(school, username='admin'):
+    return create_user(school, 'SCHOOL_ADMIN', f"{school.id}-{username}")
+
+
+def create_teacher(school, username='teacher'):
+    user = create_user(school, 'TEACHER', f"{school.id}-{username}")
+    return Teacher.objects.create(
+        user=user, qualification='M.Ed', experience=5, gender='F', subject_spec='Science',
+        dob=datetime.date(1985, 1, 1), join_date=datetime.date(2015, 6, 1))
+
+
+def create_classroom(school, class_name='1', section='A', class_teacher=None):
+    return Classroom.objects.create(school=school, class_name=class_name, section=section,
+                                    class_teacher=class_teacher)
+
+
+def create_student(classroom, roll_no, school=None):
+    school = school or classroom.school
+    user = create_user(school, 'STUDENT',
+                       f"{school.id}-student-{classroom.id if classroom else 0}-{roll_no}")
+    return Student.objects.create(user=user, classroom=classroom, roll_no=roll_no,
+                                  gender='M', dob=datetime.date(2012, 1, 1))
+
+
+def create_subject(classroom, name='Science', teacher=None):
+    subject = Subject.objects.create(school=classroom.school, name=name)
+    classroom_subject = ClassroomSubject.objects.create(
+        classroom=classroom, subject=subject, teacher=teacher or classroom.class_teacher)
+    return subject, classroom_subject
+
+
+def create_exam(classroom, subject, title='Term 1', exam_date=None):
+    exam = Exam.objects.create(title=title)
+    exam.classrooms.add(classroom)
+    exam_subject = ExamSubject.objects.create(
+        exam=exam, classroom=classroom, subject=subject, total_marks=100,
+        exam_date=exam_date)
+    return exam, exam_subject
+
+
+def create_result(exam_subject, student, marks=75):
+    return ExamResult.objects.create(exam_subject=exam_subject, student=student,
+                                     marks_obtained=marks)
+
+
+def create_fee_structure(classroom, amount=1000, fee_type='monthly', academic_year='2025-26',
+                         category=None):
+    category = category or FeeCategory.objects.get_or_create(
+        school=classroom.school, name='Tuition')[0]
+    return FeeStructure.objects.create(
+        classroom=classroom, category=category, academic_year=academic_year,
+        amount=amount, fee_type=fee_type, due_date=datetime.date(2025, 4, 10))
+
+
+def create_fee(student, fee_structure, month='Apr', amount=1000, discount=0):
+    amount = Decimal(amount)
+    return StudentFee.objects.create(
+        student=student, fee_structure=fee_structure, month=month, amount=amount,
+        discount=Decimal(discount), final_amount=amount - Decimal(discount))
+
+
+def create_payment(fee, amount, transaction_date=None, payment_mode='cash'):
+    return Payment.objects.create(
+        fee=fee, amount_paid=Decimal(amount), payment_mode=payment_mode,
+        transaction_date=transaction_date or datetime.date.today())